@@ -1,8 +1,9 @@
 from fastapi import APIRouter
-from app.api.endpoints import patient, assessment, result
+from app.api.endpoints import patient, assessment, result, events, sync
+from app.api.responses import TimedRoute
 
 # APIルーターの作成
-api_router = APIRouter()
+api_router = APIRouter(route_class=TimedRoute)
 
 # ルートエンドポイントの追加
 @api_router.get("/")
@@ -26,4 +27,16 @@ api_router.include_router(
     result.router,
     prefix="/results",
     tags=["results"]
-)
\ No newline at end of file
+)
+
+api_router.include_router(
+    events.router,
+    prefix="/events",
+    tags=["events"]
+)
+
+api_router.include_router(
+    sync.router,
+    prefix="/sync",
+    tags=["sync"]
+)
@@ -1,59 +1,72 @@
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from typing import AsyncGenerator, FrozenSet, Optional
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status, Query
 
-DATABASE_URL = "sqlite+aiosqlite:///./test.db"  # 例としてSQLiteを使用
-
-engine = create_async_engine(DATABASE_URL, echo=True)
-AsyncSessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
-
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as session:
-        yield session
+from app.database import get_db
+from app.models import Patient, Assessment, AssessmentResult
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """
     データベースセッションの依存関係
+
+    プロセス共通のエンジン・セッションファクトリ（app.database）を使用する
     """
     async for session in get_db():
         yield session
 
-async def validate_patient_exists(patient_id: int, db: AsyncSession):
+async def validate_patient_exists(patient_id: UUID, db: AsyncSession):
     """
     患者が存在するか確認する
     """
-    patient = await db.execute(select(Patient).where(Patient.id == patient_id))
-    if patient is None:
+    patient = await db.execute(select(Patient.id).where(Patient.id == patient_id))
+    if patient.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Patient not found"
         )
 
-async def validate_assessment_exists(assessment_id: int, db: AsyncSession):
+async def validate_assessment_exists(assessment_id: UUID, db: AsyncSession):
     """
     評価が存在するか確認する
     """
-    assessment = await db.execute(select(Assessment).where(Assessment.id == assessment_id))
-    if assessment is None:
+    assessment = await db.execute(select(Assessment.id).where(Assessment.id == assessment_id))
+    if assessment.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Assessment not found"
         )
 
-async def validate_result_exists(result_id: int, db: AsyncSession):
+async def validate_result_exists(result_id: UUID, db: AsyncSession):
     """
     結果が存在するか確認する
     """
-    result = await db.execute(select(Result).where(Result.id == result_id))
-    if result is None:
+    result = await db.execute(select(AssessmentResult.id).where(AssessmentResult.id == result_id))
+    if result.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Result not found"
         )
 
+# 1ページで取得できるアイテムの上限
+MAX_PAGE_LIMIT = 100
+
 def get_pagination_params(
-    skip: int = Query(0, description="スキップするアイテムの数"),
-    limit: int = Query(10, description="取得するアイテムの最大数"),
+    skip: int = Query(0, ge=0, description="スキップするアイテムの数"),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_LIMIT, description="取得するアイテムの最大数"),
 ):
-    return {"skip": skip, "limit": limit}
\ No newline at end of file
+    return {"skip": skip, "limit": limit}
+
+def get_response_fields(
+    fields: Optional[str] = Query(
+        None,
+        description="返却する項目（カンマ区切り、例: id,status,total_score）。未指定の場合は全項目"
+    )
+) -> Optional[FrozenSet[str]]:
+    """
+    レスポンスに含める項目の指定
+    """
+    if fields is None:
+        return None
+    return frozenset(name.strip() for name in fields.split(",") if name.strip())
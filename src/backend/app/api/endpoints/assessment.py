@@ -1,25 +1,29 @@
 from typing import List, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
+from app.api.responses import TimedRoute, not_modified, validator_headers
 from app.api.deps import (
     get_db_session,
     get_pagination_params,
     validate_assessment_exists
 )
 from app.crud.assessment import assessment
+from app.crud.result import assessment_result
 from app.schemas.assessment import (
     AssessmentCreate,
     AssessmentUpdate,
     AssessmentResponse,
+    AssessmentListItem,
+    AssessmentStatistics,
     QuestionCreate,
     OptionCreate
 )
 from app.schemas.base import PaginatedResponse
 from app.models import Question, Option
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 @router.post(
     "/",
@@ -53,21 +57,31 @@ async def create_assessment(
 async def get_assessment(
     *,
     db: AsyncSession = Depends(get_db_session),
+    request: Request,
+    response: Response,
     assessment_id: UUID
 ) -> AssessmentResponse:
     """
     指定されたIDの検査情報を取得します。
 
+    `ETag`・`Last-Modified` ヘッダーを返します。`If-None-Match` が一致する場合は本文なしの304を返します。
+
     - **assessment_id**: 検査のID（必須）
     """
-    await validate_assessment_exists(assessment_id, db)
-    result = await assessment.get_with_questions(db, assessment_id)
-    if not result:
+    # 検査定義はキャッシュから返すため存在確認のクエリは行わない
+    entry = await assessment.get_definition_entry(db, assessment_id)
+    if not entry:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="指定された検査が見つかりません"
         )
-    return result
+    etag = f'"{entry.etag}"'
+    last_modified = entry.definition.updated_at
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
+    response.headers.update(validator_headers(etag, last_modified))
+    return entry.definition
 
 @router.put(
     "/{assessment_id}",
@@ -97,7 +111,8 @@ async def update_assessment(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="指定された検査が見つかりません"
         )
-    return await assessment.update(db, db_obj=db_obj, obj_in=assessment_in)
+    await assessment.update(db, db_obj=db_obj, obj_in=assessment_in)
+    return await assessment.get_definition(db, assessment_id)
 
 @router.delete(
     "/{assessment_id}",
@@ -125,7 +140,7 @@ async def delete_assessment(
 async def list_assessments(
     *,
     db: AsyncSession = Depends(get_db_session),
-    pagination: tuple[int, int] = Depends(get_pagination_params)
+    pagination: dict[str, int] = Depends(get_pagination_params)
 ) -> PaginatedResponse:
     """
     検査の一覧を取得します。
@@ -133,16 +148,18 @@ async def list_assessments(
     - **skip**: スキップする件数
     - **limit**: 取得する最大件数
     """
-    skip, limit = pagination
-    assessments = await assessment.get_multi(db, skip=skip, limit=limit)
-    total = len(assessments)  # 本来はcount queryを使用すべき
-    return PaginatedResponse(
+    skip, limit = pagination["skip"], pagination["limit"]
+    assessments, total, estimated = await assessment.get_multi_with_count(
+        db,
+        skip=skip,
+        limit=limit
+    )
+    return PaginatedResponse.build(
+        items=[AssessmentListItem.model_validate(a) for a in assessments],
         total=total,
-        page=skip // limit + 1,
-        per_page=limit,
-        items=assessments,
-        has_next=total == limit,
-        has_prev=skip > 0
+        skip=skip,
+        limit=limit,
+        total_estimated=estimated
     )
 
 @router.post(
@@ -166,7 +183,7 @@ async def add_question(
     await validate_assessment_exists(assessment_id, db)
     question = Question(**question_in.model_dump())
     await assessment.add_question(db, assessment_id, question)
-    return await assessment.get_with_questions(db, assessment_id)
+    return await assessment.get_definition(db, assessment_id)
 
 @router.post(
     "/{assessment_id}/options",
@@ -190,27 +207,43 @@ async def add_option(
     await validate_assessment_exists(assessment_id, db)
     option = Option(**option_in.model_dump())
     await assessment.add_option(db, assessment_id, option)
-    return await assessment.get_with_questions(db, assessment_id)
+    return await assessment.get_definition(db, assessment_id)
 
 @router.get(
     "/{assessment_id}/statistics",
-    response_model=Dict[str, Any],
+    response_model=AssessmentStatistics,
     summary="検査の統計情報取得"
 )
 async def get_assessment_statistics(
     *,
     db: AsyncSession = Depends(get_db_session),
     assessment_id: UUID
-) -> Dict[str, Any]:
+) -> AssessmentStatistics:
     """
     指定された検査の統計情報を取得します。
 
+    完了件数・平均・最小・最大・中央値・標準偏差・完了率（%）と、スコアごとの完了件数（ヒストグラム）を返します。
+
+    - **assessment_id**: 検査のID（必須）
+    """
+    await validate_assessment_exists(assessment_id, db)
+    return await assessment.get_statistics(db, assessment_id)
+
+@router.post(
+    "/{assessment_id}/rescore",
+    response_model=Dict[str, int],
+    summary="完了済み結果の一括再採点"
+)
+async def rescore_assessment(
+    *,
+    db: AsyncSession = Depends(get_db_session),
+    assessment_id: UUID
+) -> Dict[str, int]:
+    """
+    指定された検査の完了済み結果を、現在の採点設定（逆転項目・重み・下位尺度）で再採点します。
+
     - **assessment_id**: 検査のID（必須）
     """
     await validate_assessment_exists(assessment_id, db)
-    stats = await assessment.get_statistics(db, assessment_id)
-    completion_rate = await assessment.get_completion_rate(db, assessment_id)
-    return {
-        **stats,
-        "completion_rate": completion_rate
-    }
\ No newline at end of file
+    rescored = await assessment_result.rescore_assessment(db, assessment_id)
+    return {"rescored": rescored}
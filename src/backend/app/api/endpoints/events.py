@@ -0,0 +1,94 @@
+import asyncio
+import os
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, Query, WebSocket
+from fastapi.responses import StreamingResponse
+from uuid import UUID
+
+from app.api.responses import TimedRoute
+from app.services.events import (
+    ALL_RESULTS_CHANNEL,
+    event_broker,
+    patient_channel,
+    result_channel
+)
+
+# SSE接続を維持するためのコメント行の送信間隔（秒）
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+
+router = APIRouter(route_class=TimedRoute)
+
+def _channel(patient_id: Optional[UUID], result_id: Optional[UUID]) -> str:
+    """
+    購読するチャネル（検査結果 > 患者 > 全体 の順に絞り込む）
+    """
+    if result_id is not None:
+        return result_channel(result_id)
+    if patient_id is not None:
+        return patient_channel(patient_id)
+    return ALL_RESULTS_CHANNEL
+
+async def _sse_stream(channel: str) -> AsyncIterator[str]:
+    async with event_broker.subscribe(channel) as queue:
+        yield ": connected\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), EVENTS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield f"data: {message}\n\n"
+
+# 接続中はデータベースセッションを保持しないよう、これらのエンドポイントはDBに依存しない
+@router.get(
+    "/stream",
+    summary="検査結果の通知の購読（Server-Sent Events）",
+    response_class=StreamingResponse
+)
+async def stream_events(
+    patient_id: Optional[UUID] = Query(None, description="患者のID"),
+    result_id: Optional[UUID] = Query(None, description="検査結果のID")
+) -> StreamingResponse:
+    """
+    検査の開始・回答の進捗・検査の完了をServer-Sent Eventsで通知します。
+
+    各イベントの data は ResultEvent のJSONです（event: start_assessment / answer_progress / complete_assessment）。
+
+    - **patient_id**: 指定した患者のイベントのみ購読
+    - **result_id**: 指定した検査結果のイベントのみ購読（patient_idより優先）
+    """
+    return StreamingResponse(
+        _sse_stream(_channel(patient_id, result_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/ws")
+async def websocket_events(
+    websocket: WebSocket,
+    patient_id: Optional[UUID] = None,
+    result_id: Optional[UUID] = None
+) -> None:
+    """
+    検査結果の通知の購読（WebSocket）。ResultEvent のJSONをテキストメッセージで送信する
+    """
+    await websocket.accept()
+    async with event_broker.subscribe(_channel(patient_id, result_id)) as queue:
+        # クライアントからの切断を検知するため受信を並行して待つ
+        receiver = asyncio.ensure_future(websocket.receive())
+        try:
+            while True:
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait(
+                    {getter, receiver},
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if receiver in done:
+                    getter.cancel()
+                    if receiver.result()["type"] == "websocket.disconnect":
+                        break
+                    receiver = asyncio.ensure_future(websocket.receive())
+                    continue
+                await websocket.send_text(getter.result())
+        finally:
+            receiver.cancel()
@@ -1,14 +1,23 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query  # Queryをインポート
+from typing import FrozenSet, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response  # Queryをインポート
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
+from app.api.responses import (
+    TimedRoute,
+    make_etag,
+    not_modified,
+    select_fields,
+    validator_headers
+)
 from app.api.deps import (
     get_db_session,
     get_pagination_params,
+    get_response_fields,
     validate_patient_exists
 )
 from app.crud.patient import patient
+from app.crud.result import assessment_result
 from app.schemas.assessment import (
     PatientCreate,
     PatientUpdate,
@@ -16,11 +25,14 @@ from app.schemas.assessment import (
 )
 from app.schemas.result import (
     AssessmentResultResponse,
-    PatientAssessmentSummary
+    AssessmentGraphData,
+    PatientAssessmentSummary,
+    PatientDashboard,
+    ResultProgress
 )
 from app.schemas.base import PaginatedResponse
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 @router.post(
     "/",
@@ -48,20 +60,36 @@ async def create_patient(
 async def get_patient(
     *,
     db: AsyncSession = Depends(get_db_session),
+    request: Request,
+    response: Response,
     patient_id: UUID
 ) -> PatientResponse:
     """
     指定されたIDの患者情報を取得します。
 
+    `ETag`・`Last-Modified` ヘッダーを返します。`If-None-Match` が一致する場合は
+    更新日時のみの確認で本文なしの304を返します。
+
     - **patient_id**: 患者のID（必須）
     """
-    await validate_patient_exists(patient_id, db)
+    # 更新日時のみを取得して存在確認と条件付きGETの判定を行う
+    updated_at = await patient.get_updated_at(db, patient_id)
+    if updated_at is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="指定された患者が見つかりません"
+        )
+    etag = make_etag("patient", patient_id, updated_at.isoformat())
+    cached = not_modified(request, etag, updated_at)
+    if cached is not None:
+        return cached
     result = await patient.get(db, patient_id)
     if not result:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="指定された患者が見つかりません"
         )
+    response.headers.update(validator_headers(etag, updated_at))
     return result
 
 @router.put(
@@ -116,24 +144,52 @@ async def delete_patient(
 async def list_patients(
     *,
     db: AsyncSession = Depends(get_db_session),
-    pagination: dict[str, int] = Depends(get_pagination_params)  # 整数として取得
+    pagination: dict[str, int] = Depends(get_pagination_params),  # 整数として取得
+    cursor: Optional[str] = Query(None, description="次ページのカーソル（指定時はskipを無視）")
 ) -> PaginatedResponse:
     """
     患者の一覧を取得します。
 
     - **skip**: スキップする件数
     - **limit**: 取得する最大件数
+    - **cursor**: 前回のレスポンスの`next_cursor`（作成日時の新しい順）
     """
     skip, limit = pagination["skip"], pagination["limit"]
-    patients = await patient.get_multi(db, skip=skip, limit=limit)  # 引数を正しく渡す
-    total = len(patients)  # 本来はcount queryを使用すべき
-    return PaginatedResponse(
+    if cursor is not None:
+        try:
+            patients, next_cursor = await patient.get_multi_by_cursor(
+                db,
+                cursor=cursor or None,
+                limit=limit
+            )
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="不正なカーソルです"
+            )
+        total, estimated = await patient.count(db)
+        return PaginatedResponse(
+            total=total,
+            page=1,
+            per_page=limit,
+            items=[PatientResponse.model_validate(p) for p in patients],
+            has_next=next_cursor is not None,
+            has_prev=bool(cursor),
+            total_estimated=estimated,
+            next_cursor=next_cursor
+        )
+
+    patients, total, estimated = await patient.get_multi_with_count(
+        db,
+        skip=skip,
+        limit=limit
+    )
+    return PaginatedResponse.build(
+        items=[PatientResponse.model_validate(p) for p in patients],
         total=total,
-        page=skip // limit + 1,
-        per_page=limit,
-        items=patients,
-        has_next=total == limit,
-        has_prev=skip > 0
+        skip=skip,
+        limit=limit,
+        total_estimated=estimated
     )
 
 @router.get(
@@ -145,7 +201,10 @@ async def get_patient_assessments(
     *,
     db: AsyncSession = Depends(get_db_session),
     patient_id: UUID,
-    pagination: tuple[int, int] = Depends(get_pagination_params)
+    response: Response,
+    pagination: dict[str, int] = Depends(get_pagination_params),
+    cursor: Optional[str] = Query(None, description="次ページのカーソル（指定時はskipを無視）"),
+    fields: Optional[FrozenSet[str]] = Depends(get_response_fields)
 ) -> List[AssessmentResultResponse]:
     """
     指定された患者の検査結果一覧を取得します。
@@ -153,14 +212,44 @@ async def get_patient_assessments(
     - **patient_id**: 患者のID（必須）
     - **skip**: スキップする件数
     - **limit**: 取得する最大件数
+    - **cursor**: 前回のレスポンスの`X-Next-Cursor`ヘッダーの値（完了日時の新しい順）
+    - **fields**: 返却する項目（例: `fields=id,total_score,severity_level`。`answer_details`を含めない場合は回答を読み込まない）
     """
     await validate_patient_exists(patient_id, db)
-    skip, limit = pagination
-    return await patient.get_completed_assessments(
-        db,
-        patient_id,
-        skip=skip,
-        limit=limit
+    skip, limit = pagination["skip"], pagination["limit"]
+    include_answers = fields is None or "answer_details" in fields
+    if cursor is not None:
+        try:
+            results, next_cursor = await patient.get_completed_assessments_by_cursor(
+                db,
+                patient_id,
+                cursor=cursor or None,
+                limit=limit,
+                include_answers=include_answers
+            )
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="不正なカーソルです"
+            )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+    else:
+        results = await patient.get_completed_assessments(
+            db,
+            patient_id,
+            skip=skip,
+            limit=limit,
+            include_answers=include_answers
+        )
+    # 重症度レベルは一括で判定して付与する
+    levels = await assessment_result.get_severity_levels(db, results)
+    return select_fields(
+        AssessmentResultResponse,
+        results,
+        fields,
+        updates=[{"severity_level": level} for level in levels],
+        headers=response.headers
     )
 
 @router.get(
@@ -174,30 +263,74 @@ async def get_patient_summary(
     patient_id: UUID
 ) -> PatientAssessmentSummary:
     """
-    指定された患者の検査サマリーを取得します。
+    指定された患者の検査サマリー（検査タイプごとの件数・完了率・平均スコア・最終検査日）を取得します。
 
     - **patient_id**: 患者のID（必須）
     """
-    await validate_patient_exists(patient_id, db)
-    db_patient = await patient.get_with_results(db, patient_id)
-    if not db_patient:
+    summary = await patient.get_assessment_summary(db, patient_id)
+    if not summary:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="指定された患者が見つかりません"
         )
-    
-    # サマリー情報の集計処理は実際にはより複雑になる
-    return PatientAssessmentSummary(
-        patient_id=db_patient.id,
-        patient_name=db_patient.name,
-        assessments=[],  # 実際には検査タイプごとの集計を行う
-        total_completed=len([
-            r for r in db_patient.assessment_results
-            if r.status == "completed"
-        ]),
-        last_assessment_date=max(
-            (r.completed_at for r in db_patient.assessment_results
-             if r.completed_at),
-            default=None
-        )
-    )
\ No newline at end of file
+    return summary
+
+@router.get(
+    "/{patient_id}/trends",
+    response_model=List[AssessmentGraphData],
+    summary="患者の検査トレンドの取得"
+)
+async def get_patient_trends(
+    *,
+    db: AsyncSession = Depends(get_db_session),
+    patient_id: UUID,
+    types: Optional[List[str]] = Query(None, description="検査タイプ（複数指定可、未指定の場合は全タイプ）"),
+    days: int = Query(30, ge=1, description="取得する日数")
+) -> List[AssessmentGraphData]:
+    """
+    患者の複数の検査タイプのトレンドを1回の呼び出しで取得します。
+
+    - **patient_id**: 患者のID（必須）
+    - **types**: 検査タイプ（例: types=PHQ-9&types=GAD-7）
+    - **days**: 取得する日数（デフォルト: 30日）
+    """
+    await validate_patient_exists(patient_id, db)
+    return await assessment_result.get_trends(db, patient_id, types, days=days)
+
+@router.get(
+    "/{patient_id}/dashboard",
+    response_model=PatientDashboard,
+    summary="患者の全検査ダッシュボードの取得"
+)
+async def get_patient_dashboard(
+    *,
+    db: AsyncSession = Depends(get_db_session),
+    patient_id: UUID,
+    days: Optional[int] = Query(None, ge=1, description="取得する日数（未指定の場合は全期間）")
+) -> PatientDashboard:
+    """
+    患者の全検査（12種類）の時系列・最新スコア・カットオフ判定・重症度を1回の呼び出しで取得します。
+
+    - **patient_id**: 患者のID（必須）
+    - **days**: 取得する日数（未指定の場合は全期間）
+    """
+    await validate_patient_exists(patient_id, db)
+    return await assessment_result.get_dashboard(db, patient_id, days=days)
+
+@router.get(
+    "/{patient_id}/progress",
+    response_model=List[ResultProgress],
+    summary="患者の未完了の検査の回答進捗の取得"
+)
+async def get_patient_progress(
+    *,
+    db: AsyncSession = Depends(get_db_session),
+    patient_id: UUID
+) -> List[ResultProgress]:
+    """
+    患者の未完了（未開始・進行中）の検査すべての回答進捗を1回の呼び出しで取得します。
+
+    - **patient_id**: 患者のID（必須）
+    """
+    await validate_patient_exists(patient_id, db)
+    return await assessment_result.get_active_progress(db, patient_id)
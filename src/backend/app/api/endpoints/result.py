@@ -1,11 +1,13 @@
-from typing import List, Dict, Any
+from typing import Any, Dict, FrozenSet, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
+from app.api.responses import TimedRoute, select_fields
 from app.api.deps import (
     get_db_session,
     get_pagination_params,
+    get_response_fields,
     validate_result_exists,
     validate_assessment_exists,
     validate_patient_exists
@@ -16,12 +18,16 @@ from app.schemas.result import (
     AssessmentResultUpdate,
     AssessmentResultResponse,
     AnswerDetailCreate,
+    AnswerBatchCreate,
+    AnswerBatchAck,
     DetailedAssessmentResult,
-    AssessmentGraphData
+    AssessmentGraphData,
+    ResultProgress
 )
+from app.models import AnswerDetail
 from app.models.base import AssessmentStatus
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 @router.post(
     "/",
@@ -32,17 +38,20 @@ router = APIRouter()
 async def create_assessment_result(
     *,
     db: AsyncSession = Depends(get_db_session),
-    result_in: AssessmentResultCreate
+    result_in: AssessmentResultCreate,
+    fields: Optional[FrozenSet[str]] = Depends(get_response_fields)
 ) -> AssessmentResultResponse:
     """
     新しい検査結果を作成します。
 
     - **patient_id**: 患者のID（必須）
     - **assessment_id**: 検査のID（必須）
+    - **fields**: 返却する項目（カンマ区切り、未指定の場合は全項目）
     """
     await validate_patient_exists(result_in.patient_id, db)
     await validate_assessment_exists(result_in.assessment_id, db)
-    return await assessment_result.create(db, obj_in=result_in)
+    result = await assessment_result.create(db, obj_in=result_in)
+    return select_fields(AssessmentResultResponse, result, fields)
 
 @router.get(
     "/{result_id}",
@@ -52,33 +61,49 @@ async def create_assessment_result(
 async def get_assessment_result(
     *,
     db: AsyncSession = Depends(get_db_session),
-    result_id: UUID
+    result_id: UUID,
+    include_answers: bool = True
 ) -> DetailedAssessmentResult:
     """
     指定されたIDの検査結果詳細を取得します。
 
     - **result_id**: 検査結果のID（必須）
+    - **include_answers**: 回答詳細を含めるか（falseの場合はヘッダー情報のみ）
     """
-    await validate_result_exists(result_id, db)
-    result = await assessment_result.get_with_details(db, result_id)
+    result = await assessment_result.get_detailed(
+        db,
+        result_id,
+        include_answers=include_answers
+    )
     if not result:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="指定された検査結果が見つかりません"
         )
-    
-    # 重症度レベルの判定
-    severity = await assessment_result.get_severity_level(db, result_id)
-    
-    return DetailedAssessmentResult(
-        **result.model_dump(),
-        severity_level=severity,
-        is_above_cutoff=result.total_score > result.assessment.cutoff if result.total_score else False,
-        completion_time=(
-            (result.completed_at - result.started_at).total_seconds() / 60
-            if result.completed_at and result.started_at else None
+    return result
+
+@router.get(
+    "/{result_id}/progress",
+    response_model=ResultProgress,
+    summary="回答進捗の取得"
+)
+async def get_result_progress(
+    *,
+    db: AsyncSession = Depends(get_db_session),
+    result_id: UUID
+) -> ResultProgress:
+    """
+    検査の回答進捗（回答済みの質問数 / 全質問数）と状態を取得します。
+
+    - **result_id**: 検査結果のID（必須）
+    """
+    progress = await assessment_result.get_progress(db, result_id)
+    if not progress:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="指定された検査結果が見つかりません"
         )
-    )
+    return progress
 
 @router.post(
     "/{result_id}/start",
@@ -88,12 +113,14 @@ async def get_assessment_result(
 async def start_assessment(
     *,
     db: AsyncSession = Depends(get_db_session),
-    result_id: UUID
+    result_id: UUID,
+    fields: Optional[FrozenSet[str]] = Depends(get_response_fields)
 ) -> AssessmentResultResponse:
     """
     検査を開始状態にします。
 
     - **result_id**: 検査結果のID（必須）
+    - **fields**: 返却する項目（カンマ区切り、未指定の場合は全項目）
     """
     await validate_result_exists(result_id, db)
     result = await assessment_result.start_assessment(db, result_id)
@@ -102,7 +129,7 @@ async def start_assessment(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="指定された検査結果が見つかりません"
         )
-    return result
+    return select_fields(AssessmentResultResponse, result, fields)
 
 @router.post(
     "/{result_id}/complete",
@@ -112,12 +139,14 @@ async def start_assessment(
 async def complete_assessment(
     *,
     db: AsyncSession = Depends(get_db_session),
-    result_id: UUID
+    result_id: UUID,
+    fields: Optional[FrozenSet[str]] = Depends(get_response_fields)
 ) -> AssessmentResultResponse:
     """
     検査を完了状態にします。
 
     - **result_id**: 検査結果のID（必須）
+    - **fields**: 返却する項目（カンマ区切り、未指定の場合は全項目）
     """
     await validate_result_exists(result_id, db)
     result = await assessment_result.complete_assessment(db, result_id)
@@ -126,7 +155,7 @@ async def complete_assessment(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="指定された検査結果が見つかりません"
         )
-    return result
+    return select_fields(AssessmentResultResponse, result, fields)
 
 @router.post(
     "/{result_id}/answers",
@@ -137,7 +166,8 @@ async def add_answer(
     *,
     db: AsyncSession = Depends(get_db_session),
     result_id: UUID,
-    answer_in: AnswerDetailCreate
+    answer_in: AnswerDetailCreate,
+    fields: Optional[FrozenSet[str]] = Depends(get_response_fields)
 ) -> AssessmentResultResponse:
     """
     検査結果に回答を追加します。
@@ -146,6 +176,7 @@ async def add_answer(
     - **question_id**: 質問のID（必須）
     - **selected_option_id**: 選択された選択肢のID（必須）
     - **value**: 回答の値（必須）
+    - **fields**: 返却する項目（`answer_details`を含めない場合は回答詳細を読み込まない）
     """
     await validate_result_exists(result_id, db)
     result = await assessment_result.get(db, result_id)
@@ -160,9 +191,70 @@ async def add_answer(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="進行中の検査でのみ回答を追加できます"
         )
-    
-    await assessment_result.add_answer(db, result_id, answer_in)
-    return await assessment_result.get_with_details(db, result_id)
+
+    try:
+        await assessment_result.validate_answers(db, result.assessment_id, [answer_in])
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    answer = AnswerDetail(**answer_in.model_dump(exclude={"result_id"}))
+    await assessment_result.add_answer(db, result_id, answer)
+    if fields is not None and "answer_details" not in fields:
+        return select_fields(AssessmentResultResponse, result, fields)
+    return select_fields(
+        AssessmentResultResponse,
+        await assessment_result.get_with_details(db, result_id),
+        fields
+    )
+
+@router.post(
+    "/{result_id}/answers/batch",
+    response_model=AnswerBatchAck,
+    status_code=status.HTTP_201_CREATED,
+    summary="回答の一括追加"
+)
+async def add_answers_batch(
+    *,
+    db: AsyncSession = Depends(get_db_session),
+    result_id: UUID,
+    batch_in: AnswerBatchCreate
+) -> AnswerBatchAck:
+    """
+    検査結果に複数の回答を1回のトランザクションで追加します。
+
+    - **result_id**: 検査結果のID（必須）
+    - **answers**: 回答のリスト（質問ID・選択肢ID・回答の値）
+    """
+    result = await assessment_result.get(db, result_id)
+    if not result:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="指定された検査結果が見つかりません"
+        )
+
+    if result.status != AssessmentStatus.IN_PROGRESS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="進行中の検査でのみ回答を追加できます"
+        )
+
+    try:
+        await assessment_result.validate_answers(db, result.assessment_id, batch_in.answers)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    accepted, answered_at = await assessment_result.add_answers(db, result_id, batch_in.answers)
+    return AnswerBatchAck(
+        result_id=result_id,
+        accepted=accepted,
+        answered_at=answered_at
+    )
 
 @router.get(
     "/{result_id}/trend",
@@ -178,28 +270,16 @@ async def get_trend_data(
     """
     検査結果のトレンドデータを取得します。
 
+    同じ患者・同じ検査タイプの完了済み結果から、回帰直線・移動平均・
+    Reliable Change Index を計算して返します。
+
     - **result_id**: 検査結果のID（必須）
     - **days**: 取得する日数（デフォルト: 30日）
     """
-    await validate_result_exists(result_id, db)
-    result = await assessment_result.get_with_details(db, result_id)
-    if not result:
+    graph = await assessment_result.get_trend_for_result(db, result_id, days=days)
+    if graph is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="指定された検査結果が見つかりません"
         )
-    
-    trend_data = await assessment_result.get_trend_data(
-        db,
-        result.patient_id,
-        result.assessment.type,
-        days=days
-    )
-    
-    return AssessmentGraphData(
-        assessment_type=result.assessment.type,
-        data_points=trend_data,
-        trend_line=[],  # トレンドライン計算は別途実装
-        cutoff_line=result.assessment.cutoff,
-        average_line=sum(d["score"] for d in trend_data) / len(trend_data) if trend_data else 0
-    )
\ No newline at end of file
+    return graph
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.responses import TimedRoute
+from app.api.deps import get_db_session
+from app.crud.sync import sync
+from app.schemas.sync import SyncRequest, SyncResponse
+
+router = APIRouter(route_class=TimedRoute)
+
+@router.post(
+    "",
+    response_model=SyncResponse,
+    summary="オフライン中の操作の一括同期"
+)
+async def sync_operations(
+    *,
+    db: AsyncSession = Depends(get_db_session),
+    sync_in: SyncRequest
+) -> SyncResponse:
+    """
+    iPadがオフライン中にキューに積んだ操作（開始・回答・完了）を、複数の検査結果分まとめて1回で同期します。
+
+    操作は送信された順に1つのトランザクションで適用します。適用できない操作は操作ごとに取り消して
+    `rejected` を返し、他の操作の適用は続けます。適用済みの `op_id` を再送した場合は適用せずに
+    `duplicate` を返すため、接続の回復後はキュー全体をそのまま再送できます。
+
+    - **device_id**: 端末の識別子（任意）
+    - **operations**: 操作のリスト（`op_id`・`type`・`result_id`・`client_timestamp`、回答の場合は`answers`）
+    """
+    return await sync.apply(db, sync_in)
@@ -0,0 +1,239 @@
+import asyncio
+import hmac
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.metrics import end_request, metrics_registry, start_request
+from app.services.profiling import (
+    PROFILERS,
+    PROFILING_PROFILER,
+    ProfileResult,
+    RequestProfiler,
+    create_profiler,
+    new_profile_id,
+    save_profile
+)
+
+logger = logging.getLogger(__name__)
+
+# プロファイリングの要求に必要なトークン（空の場合はヘッダーのみで計測する）
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+
+# ルートに一致しないリクエスト（404など）のラベル（パスをそのまま使うとラベルが無制限に増えるため）
+UNMATCHED_ROUTE = "unmatched"
+
+class MetricsMiddleware:
+    """
+    リクエストごとの処理時間とSQLの実行回数・時間の計測
+
+    ルートのラベルはパステンプレート（/api/v1/patients/{patient_id} など）を使う。
+    レスポンスには Server-Timing（db）と X-DB-Query-Count ヘッダーを付与する。
+
+    ヘッダーの値はレスポンスの開始までに実行したSQLのみを含む。セッションの依存関係（get_db）の
+    終了時のコミットはレスポンスの送信後に実行されるためヘッダーには含まれないが、
+    メトリクス（/metrics）の実行回数・時間には含まれる。
+    SSE（text/event-stream）とWebSocketの接続は長時間続くため、処理時間のヒストグラムには含めず
+    接続数と接続時間（stream_*）として集計する。
+    """
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._route_paths: Dict[Callable[..., Any], str] = {}
+
+    def _route_path(self, scope: Scope) -> str:
+        # ルーティング時に scope に設定されたエンドポイントからパステンプレートを求める
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            for route in scope["app"].routes:
+                if getattr(route, "endpoint", None) is endpoint:
+                    path = route.path
+                    break
+            else:
+                path = self._match_path(scope)
+            self._route_paths[endpoint] = path
+        return path
+
+    @staticmethod
+    def _match_path(scope: Scope) -> str:
+        for route in scope["app"].routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", UNMATCHED_ROUTE)
+        return UNMATCHED_ROUTE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "websocket":
+            started = time.perf_counter()
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                metrics_registry.record_stream(
+                    "websocket",
+                    self._route_path(scope),
+                    time.perf_counter() - started
+                )
+            return
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics, token = start_request()
+        started = time.perf_counter()
+        status_code: Optional[int] = None
+        streaming = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                content_type = Headers(raw=headers).get("content-type", "")
+                streaming = content_type.startswith("text/event-stream")
+                headers.append((
+                    b"server-timing",
+                    f"db;dur={metrics.db_seconds * 1000:.2f}".encode()
+                ))
+                headers.append((b"x-db-query-count", str(metrics.queries).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end_request(token)
+            if streaming:
+                metrics_registry.record_stream(
+                    "sse",
+                    self._route_path(scope),
+                    time.perf_counter() - started
+                )
+            else:
+                metrics_registry.record_request(
+                    scope["method"],
+                    self._route_path(scope),
+                    status_code if status_code is not None else 500,
+                    time.perf_counter() - started,
+                    metrics
+                )
+
+class ProfilingMiddleware:
+    """
+    リクエスト単位のプロファイリング（PROFILING_ENABLED の場合のみ登録する）
+
+    X-Profile ヘッダー（1 / cprofile / pyinstrument）を付けたリクエストのみ計測し、
+    プロファイルを PROFILING_DIR に保存して X-Profile-Id・X-Profile-Files ヘッダーで返す。
+    PROFILING_TOKEN を設定した場合は X-Profile-Token ヘッダーが一致するリクエストに限る。
+    ヘッダーの無いリクエストはヘッダーの確認のみで素通りする。
+    """
+    def __init__(self, app: ASGIApp, token: str = PROFILING_TOKEN) -> None:
+        self.app = app
+        self.token = token
+        # 同時に有効にできるプロファイラは1つのため計測は1リクエストずつ行う
+        self._lock = asyncio.Lock()
+
+    def _requested_profiler(self, scope: Scope) -> Optional[str]:
+        headers = Headers(scope=scope)
+        value = headers.get("x-profile")
+        if not value or value.lower() in ("0", "false", "off"):
+            return None
+        if self.token and not hmac.compare_digest(headers.get("x-profile-token", ""), self.token):
+            return None
+        value = value.lower()
+        return value if value in PROFILERS else PROFILING_PROFILER
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        profiler_name = self._requested_profiler(scope)
+        if profiler_name is None:
+            await self.app(scope, receive, send)
+            return
+        if self._lock.locked():
+            # 他のリクエストを計測中の場合は計測せずに処理する
+            await self.app(scope, receive, send_with_headers(send, {"x-profile-status": "busy"}))
+            return
+
+        async with self._lock:
+            try:
+                profiler = create_profiler(profiler_name)
+            except (RuntimeError, ValueError) as e:
+                logger.warning("プロファイラを作成できません: %s", e)
+                await self.app(scope, receive, send_with_headers(send, {"x-profile-status": "unavailable"}))
+                return
+
+            profile_id = new_profile_id(scope["method"], scope["path"])
+            pending: List[Message] = []
+            streaming = False
+
+            async def buffered_send(message: Message) -> None:
+                # 保存先をヘッダーで返すため、計測の終了までレスポンスを保留する
+                # （ストリーミングのレスポンスは保留せずに送信し、保存先はログにのみ出力する）
+                nonlocal streaming
+                if not streaming:
+                    if message["type"] == "http.response.start" or not message.get("more_body", False):
+                        pending.append(message)
+                        return
+                    streaming = True
+                    for buffered in pending:
+                        await send(buffered)
+                    pending.clear()
+                await send(message)
+
+            started = time.perf_counter()
+            profiler.start()
+            try:
+                await self.app(scope, receive, buffered_send)
+            finally:
+                profiler.stop()
+                duration = time.perf_counter() - started
+                result = await self._save(scope, profiler, profile_id, duration)
+
+            headers = {"x-profile-id": profile_id} if result is not None else {"x-profile-status": "failed"}
+            if result is not None:
+                headers["x-profile-files"] = ",".join(os.path.basename(f) for f in result.files)
+            profiled_send = send_with_headers(send, headers)
+            for message in pending:
+                await profiled_send(message)
+
+    @staticmethod
+    async def _save(
+        scope: Scope,
+        profiler: RequestProfiler,
+        profile_id: str,
+        duration: float
+    ) -> Optional[ProfileResult]:
+        try:
+            result = await run_in_threadpool(save_profile, profiler, profile_id, duration)
+        except OSError:
+            logger.exception("プロファイルを保存できません: %s", profile_id)
+            return None
+        logger.info(
+            "プロファイルを保存しました: %s %s %.1fms %s",
+            scope["method"],
+            scope["path"],
+            duration * 1000,
+            ", ".join(result.files)
+        )
+        return result
+
+def send_with_headers(send: Send, extra: Dict[str, str]) -> Send:
+    """
+    レスポンスの開始メッセージにヘッダーを追加する send
+    """
+    async def wrapper(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = list(message.get("headers", []))
+            headers.extend((name.encode(), value.encode()) for name, value in extra.items())
+            message = {**message, "headers": headers}
+        await send(message)
+    return wrapper
@@ -0,0 +1,235 @@
+import functools
+import hashlib
+import inspect
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Sequence, Type
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, ConfigDict, create_model
+
+# エンドポイント関数の終了時刻（以降がレスポンスモデルの検証とJSONへの変換）
+# 同期関数のエンドポイントはコンテキストをコピーしたスレッドで実行されるため、値を書き込む入れ物を共有する
+_endpoint_finished: ContextVar[Optional[List[Optional[float]]]] = ContextVar(
+    "endpoint_finished",
+    default=None
+)
+
+def _mark_endpoint_finished() -> None:
+    finished = _endpoint_finished.get()
+    if finished is not None:
+        finished[0] = time.perf_counter()
+
+class SerializationStats:
+    """
+    エンドポイントごとのシリアライズ時間の集計
+    """
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, route: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(route, {"count": 0, "total": 0.0, "max": 0.0})
+            stats["count"] += 1
+            stats["total"] += seconds
+            stats["max"] = max(stats["max"], seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                route: {
+                    "count": int(stats["count"]),
+                    "total_ms": round(stats["total"] * 1000, 3),
+                    "avg_ms": round(stats["total"] / stats["count"] * 1000, 3),
+                    "max_ms": round(stats["max"] * 1000, 3),
+                }
+                for route, stats in self._stats.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+# プロセス共通のシリアライズ時間の集計
+serialization_stats = SerializationStats()
+
+def _timed_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    エンドポイント関数の終了時刻を記録するラッパー（引数の定義は元の関数のものが使われる）
+
+    同期関数は同期関数のまま包み、FastAPIがスレッドプールで実行できるようにする
+    """
+    if getattr(endpoint, "__timed__", False):
+        return endpoint
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                _mark_endpoint_finished()
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                _mark_endpoint_finished()
+
+    wrapper.__timed__ = True
+    return wrapper
+
+class TimedRoute(APIRoute):
+    """
+    シリアライズ時間を計測するルート
+
+    エンドポイント関数の終了からレスポンス作成完了まで（レスポンスモデルの検証とJSON変換）を
+    シリアライズ時間として集計し、Server-Timing ヘッダーで返す
+    """
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route = f"{','.join(sorted(self.methods))} {self.path_format}"
+
+        async def timed_handler(request: Request) -> Response:
+            marker: List[Optional[float]] = [None]
+            token = _endpoint_finished.set(marker)
+            started = time.perf_counter()
+            try:
+                response = await handler(request)
+                finished = marker[0]
+            finally:
+                _endpoint_finished.reset(token)
+            ended = time.perf_counter()
+            if finished is not None:
+                serialize = ended - finished
+                serialization_stats.record(route, serialize)
+                response.headers.append(
+                    "Server-Timing",
+                    f"app;dur={(ended - started) * 1000:.2f}, serialize;dur={serialize * 1000:.2f}"
+                )
+            return response
+
+        return timed_handler
+
+@lru_cache(maxsize=None)
+def _partial_model(model: Type[BaseModel], fields: FrozenSet[str]) -> Type[BaseModel]:
+    """
+    指定した項目のみを持つレスポンスモデル（ORMから選択した属性だけを読む）
+    """
+    return create_model(
+        f"{model.__name__}Partial",
+        __config__=ConfigDict(from_attributes=True),
+        **{
+            name: (field.annotation, field)
+            for name, field in model.model_fields.items()
+            if name in fields
+        }
+    )
+
+def select_fields(
+    model: Type[BaseModel],
+    data: Any,
+    fields: Optional[FrozenSet[str]],
+    *,
+    updates: Optional[Sequence[Mapping[str, Any]]] = None,
+    headers: Optional[Mapping[str, str]] = None
+) -> Any:
+    """
+    fields 指定時に選択した項目のみのレスポンスを作成する
+
+    未指定の場合は data（updates があれば適用したモデル）をそのまま返し、レスポンスモデルで検証する。
+    指定時は部分モデルで検証してORJSONResponseを返すため、answer_details などの
+    重いコレクションは読み込み・検証・変換のいずれも行わない。
+    data がリストの場合、updates は要素ごとの追加の値。
+    """
+    many = isinstance(data, (list, tuple))
+    items: List[Any] = list(data) if many else [data]
+    updates = list(updates) if updates is not None else [{}] * len(items)
+
+    if fields is None:
+        if not any(updates):
+            return data
+        models = [
+            model.model_validate(item).model_copy(update=dict(update))
+            for item, update in zip(items, updates)
+        ]
+        return models if many else models[0]
+
+    unknown = fields - model.model_fields.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"指定できない項目です: {', '.join(sorted(unknown))}"
+        )
+    partial = _partial_model(model, fields)
+    content = [
+        partial.model_validate(item).model_copy(
+            update={k: v for k, v in update.items() if k in fields}
+        ).model_dump(mode="json")
+        for item, update in zip(items, updates)
+    ]
+    return ORJSONResponse(content if many else content[0], headers=dict(headers or {}))
+
+def make_etag(*parts: Any) -> str:
+    """
+    ID・更新日時などから強いETagを作成する
+    """
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLiteではタイムゾーンなしで返るためUTCとして扱う
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    """
+    条件付きGET用のレスポンスヘッダー（キャッシュは毎回再検証させる）
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+def not_modified(
+    request: Request,
+    etag: str,
+    last_modified: Optional[datetime] = None
+) -> Optional[Response]:
+    """
+    If-None-Match / If-Modified-Since の判定
+
+    クライアントのキャッシュが最新であれば本文なしの304レスポンスを返す（それ以外はNone）
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        matched = "*" in tags or etag in tags
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None or last_modified is None:
+            return None
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return None
+        # HTTP日付は秒単位のため切り捨てて比較する
+        matched = _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+    if not matched:
+        return None
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=validator_headers(etag, last_modified)
+    )
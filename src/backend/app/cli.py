@@ -0,0 +1,166 @@
+"""
+管理用コマンド
+
+使い方:
+    python -m app.cli explain-indexes
+    python -m app.cli rebuild-statistics [--assessment-id ID]
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+import app.models  # noqa: F401  モデルをメタデータに登録する
+from app.crud import assessment, assessment_result, assessment_statistics, patient
+from app.crud.base import encode_cursor
+from app.database import AsyncSessionLocal, close_db, engine
+
+_SAMPLE_ID = UUID(int=0)
+_SAMPLE_CURSOR = encode_cursor(datetime(2000, 1, 1), _SAMPLE_ID)
+
+def _primary_key(table: str) -> List[str]:
+    """
+    主キーのインデックス名（SQLite / PostgreSQL）
+    """
+    return [f"sqlite_autoindex_{table}_1", f"{table}_pkey"]
+
+def _hot_queries() -> Dict[str, Tuple[Select, List[str]]]:
+    """
+    主要なクエリ（CRUDが実行するクエリそのもの）と、使用されるべきインデックス
+    """
+    return {
+        "get_trend_data": (
+            assessment_result.trend_series_query(_SAMPLE_ID, ["PHQ-9"], days=30),
+            ["ix_assessment_results_patient_status_completed"]
+        ),
+        "get_dashboard": (
+            assessment_result.dashboard_query(_SAMPLE_ID),
+            ["ix_assessment_results_patient_status_completed"]
+        ),
+        "get_completed_assessments": (
+            patient.completed_assessments_query(_SAMPLE_ID),
+            ["ix_assessment_results_patient_status_completed"]
+        ),
+        "get_completed_assessments_by_cursor": (
+            patient.completed_assessments_cursor_query(_SAMPLE_ID, cursor=_SAMPLE_CURSOR),
+            ["ix_assessment_results_patient_status_completed"]
+        ),
+        "get_active_assessments": (
+            patient.active_assessments_query(_SAMPLE_ID),
+            [
+                "ix_assessment_results_patient_created",
+                "ix_assessment_results_patient_status_completed"
+            ]
+        ),
+        "get_statistics_rollup": (
+            assessment_statistics.rollup_query(_SAMPLE_ID),
+            _primary_key("assessment_statistics")
+        ),
+        "get_statistics_buckets": (
+            assessment_statistics.buckets_query(_SAMPLE_ID),
+            _primary_key("assessment_score_buckets")
+        ),
+        "get_statistics_fallback": (
+            assessment.distribution_query(_SAMPLE_ID),
+            ["ix_assessment_results_assessment_status_score"]
+        ),
+        "score_result": (
+            assessment_result.scoring_answers_query(_SAMPLE_ID),
+            ["uq_answer_details_result_question"]
+        ),
+        "get_by_type": (
+            assessment.by_type_query("PHQ-9"),
+            ["ix_assessments_type"]
+        ),
+        "patients_by_cursor": (
+            patient.multi_by_cursor_query(cursor=_SAMPLE_CURSOR, limit=10),
+            ["ix_patients_created_at_id"]
+        ),
+    }
+
+async def _explain(conn: AsyncConnection, query: Select) -> str:
+    """
+    クエリの実行計画を文字列で取得する
+    """
+    dialect = conn.dialect
+    sql = str(query.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == "sqlite":
+        rows = await conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+        return "\n".join(row[-1] for row in rows)
+    rows = await conn.execute(text(f"EXPLAIN {sql}"))
+    return "\n".join(row[0] for row in rows)
+
+async def explain_indexes(verbose: bool = False) -> int:
+    """
+    主要なクエリが想定したインデックスを使用しているか実行計画で確認する
+    """
+    failures = 0
+    async with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            # 少量データでもインデックスを使った計画を確認できるようにする
+            await conn.execute(text("SET enable_seqscan = off"))
+        for name, (query, expected) in _hot_queries().items():
+            plan = await _explain(conn, query)
+            used = [index for index in expected if index in plan]
+            status = "OK  " if used else "FAIL"
+            if not used:
+                failures += 1
+            print(f"[{status}] {name}: {', '.join(used) or 'expected ' + ' / '.join(expected)}")
+            if verbose or not used:
+                for line in plan.splitlines():
+                    print(f"        {line}")
+    return failures
+
+async def rebuild_statistics(assessment_id: Optional[UUID] = None) -> int:
+    """
+    検査結果から統計情報の集計テーブルを再構築する
+    """
+    async with AsyncSessionLocal() as db:
+        rebuilt = await assessment_statistics.rebuild(db, assessment_id)
+        await db.commit()
+    print(f"rebuilt statistics for {rebuilt} assessment(s)")
+    return 0
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Scale App 管理コマンド")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    explain_parser = subparsers.add_parser(
+        "explain-indexes",
+        help="主要クエリの実行計画でインデックスの使用を確認する"
+    )
+    explain_parser.add_argument("-v", "--verbose", action="store_true", help="実行計画を表示する")
+
+    rebuild_parser = subparsers.add_parser(
+        "rebuild-statistics",
+        help="検査結果から統計情報の集計テーブルを再構築する"
+    )
+    rebuild_parser.add_argument(
+        "--assessment-id",
+        type=UUID,
+        default=None,
+        help="対象の検査ID（未指定の場合は全検査）"
+    )
+
+    args = parser.parse_args(argv)
+
+    commands: Dict[str, Callable[[], "asyncio.Future"]] = {
+        "explain-indexes": lambda: explain_indexes(verbose=args.verbose),
+        "rebuild-statistics": lambda: rebuild_statistics(args.assessment_id),
+    }
+
+    async def run() -> int:
+        try:
+            return await commands[args.command]()
+        finally:
+            await close_db()
+
+    return 1 if asyncio.run(run()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
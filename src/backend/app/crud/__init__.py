@@ -2,6 +2,8 @@ from app.crud.base import CRUDBase
 from app.crud.patient import CRUDPatient, patient
 from app.crud.assessment import CRUDAssessment, assessment
 from app.crud.result import CRUDAssessmentResult, assessment_result
+from app.crud.statistics import CRUDAssessmentStatistics, assessment_statistics
+from app.crud.sync import CRUDSync, sync
 
 __all__ = [
     "CRUDBase",
@@ -10,5 +12,9 @@ __all__ = [
     "CRUDAssessment",
     "assessment",
     "CRUDAssessmentResult",
-    "assessment_result"
+    "assessment_result",
+    "CRUDAssessmentStatistics",
+    "assessment_statistics",
+    "CRUDSync",
+    "sync"
 ]
\ No newline at end of file
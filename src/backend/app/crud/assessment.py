@@ -1,12 +1,21 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from uuid import UUID
-from sqlalchemy import select, func
+from sqlalchemy import Select, case, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from app.crud.base import CRUDBase
+from app.crud.cache import CachedAssessment, assessment_definition_cache
+from app.crud.statistics import assessment_statistics
 from app.models import Assessment, Question, Option, AssessmentResult
-from app.schemas.assessment import AssessmentCreate, AssessmentUpdate
+from app.models.base import AssessmentStatus
+from app.schemas.assessment import (
+    AssessmentCreate,
+    AssessmentUpdate,
+    AssessmentResponse,
+    AssessmentStatistics
+)
+from app.services.statistics import ScoreDistribution, statistics_cache
 
 class CRUDAssessment(CRUDBase[Assessment, AssessmentCreate, AssessmentUpdate]):
     """
@@ -31,6 +40,66 @@ class CRUDAssessment(CRUDBase[Assessment, AssessmentCreate, AssessmentUpdate]):
         result = await db.execute(query)
         return result.unique().scalar_one_or_none()
 
+    async def get_definition(
+        self,
+        db: AsyncSession,
+        assessment_id: UUID
+    ) -> Optional[AssessmentResponse]:
+        """
+        検査定義の取得（キャッシュ優先）
+        """
+        entry = await self.get_definition_entry(db, assessment_id)
+        return entry.definition if entry is not None else None
+
+    async def get_definition_entry(
+        self,
+        db: AsyncSession,
+        assessment_id: UUID
+    ) -> Optional[CachedAssessment]:
+        """
+        キャッシュエントリ（検査定義とETag）の取得
+        """
+        cached = assessment_definition_cache.get(assessment_id)
+        if cached is not None:
+            return cached
+        db_obj = await self.get_with_questions(db, assessment_id)
+        if db_obj is None:
+            return None
+        return assessment_definition_cache.put(assessment_definition_cache.build(db_obj))
+
+    async def get_definitions_by_type(
+        self,
+        db: AsyncSession,
+        assessment_type: str
+    ) -> List[AssessmentResponse]:
+        """
+        タイプによる検査定義の取得（キャッシュ優先）
+        """
+        cached = assessment_definition_cache.get_by_type(assessment_type)
+        if cached is not None:
+            return cached
+        query = (
+            select(Assessment)
+            .options(
+                joinedload(Assessment.questions),
+                joinedload(Assessment.options)
+            )
+            .where(Assessment.type == assessment_type)
+        )
+        result = await db.execute(query)
+        definitions = [
+            assessment_definition_cache.build(db_obj)
+            for db_obj in result.unique().scalars().all()
+        ]
+        assessment_definition_cache.put_type(assessment_type, definitions)
+        return definitions
+
+    def by_type_query(self, assessment_type: str) -> Select:
+        """
+        タイプによる検査のクエリ
+        """
+        return select(Assessment).where(Assessment.type == assessment_type)
+
     async def get_by_type(
         self,
         db: AsyncSession,
@@ -39,39 +108,109 @@ class CRUDAssessment(CRUDBase[Assessment, AssessmentCreate, AssessmentUpdate]):
         """
         タイプによる検査の取得
         """
-        query = select(Assessment).where(Assessment.type == assessment_type)
-        result = await db.execute(query)
+        result = await db.execute(self.by_type_query(assessment_type))
         return result.scalars().all()
 
+    def distribution_query(self, assessment_id: UUID) -> Select:
+        """
+        検査結果からスコアごとの件数と完了件数を集計するクエリ
+        """
+        is_completed = AssessmentResult.status == AssessmentStatus.COMPLETED
+        return (
+            select(
+                AssessmentResult.total_score,
+                func.count(AssessmentResult.id).label("results"),
+                func.sum(case((is_completed, 1), else_=0)).label("completed")
+            )
+            .where(AssessmentResult.assessment_id == assessment_id)
+            .group_by(AssessmentResult.total_score)
+        )
+
+    async def _aggregate_distribution(
+        self,
+        db: AsyncSession,
+        assessment_id: UUID
+    ) -> ScoreDistribution:
+        """
+        検査結果からの度数分布の集計（スコアごとの件数と完了件数を1回のクエリで取得する）
+        """
+        query = self.distribution_query(assessment_id)
+        distribution = ScoreDistribution()
+        for row in await db.execute(query):
+            distribution.total_results += row.results
+            distribution.completed += row.completed or 0
+            if row.total_score is not None and row.completed:
+                distribution.frequencies[row.total_score] = row.completed
+        return distribution
+
     async def get_statistics(
         self,
         db: AsyncSession,
         assessment_id: UUID
-    ) -> Dict[str, Any]:
+    ) -> AssessmentStatistics:
         """
         検査結果の統計情報の取得
+
+        集計テーブル（検査結果の作成・完了時に更新）の度数分布から平均・中央値・標準偏差・
+        ヒストグラムを求める。結果はキャッシュし、検査の完了時に差分更新する。
         """
-        query = (
-            select(
-                func.count(AssessmentResult.id).label("total_attempts"),
-                func.avg(AssessmentResult.total_score).label("average_score"),
-                func.min(AssessmentResult.total_score).label("min_score"),
-                func.max(AssessmentResult.total_score).label("max_score")
-            )
-            .where(
-                AssessmentResult.assessment_id == assessment_id,
-                AssessmentResult.status == "completed"
-            )
+        cached = statistics_cache.get(assessment_id)
+        if cached is not None:
+            return cached
+
+        # 集計テーブルから取得する（未構築の場合のみ検査結果を集計する）
+        distribution = await assessment_statistics.get_distribution(db, assessment_id)
+        if distribution is None:
+            distribution = await self._aggregate_distribution(db, assessment_id)
+        return statistics_cache.put(assessment_id, distribution)
+
+    async def create(
+        self,
+        db: AsyncSession,
+        *,
+        obj_in: AssessmentCreate
+    ) -> Assessment:
+        """
+        質問・選択肢を含む検査の作成（タイプ別キャッシュを無効化）
+        """
+        obj_in_data = obj_in.model_dump(exclude={"questions", "options"})
+        db_obj = Assessment(
+            **obj_in_data,
+            questions=[Question(**q.model_dump()) for q in obj_in.questions],
+            options=[Option(**o.model_dump()) for o in obj_in.options]
         )
-        result = await db.execute(query)
-        stats = result.one()
-        
-        return {
-            "total_attempts": stats.total_attempts,
-            "average_score": float(stats.average_score) if stats.average_score else 0.0,
-            "min_score": stats.min_score,
-            "max_score": stats.max_score
-        }
+        db.add(db_obj)
+        await db.commit()
+        self.invalidate_count()
+        assessment_definition_cache.invalidate(db_obj.id)
+        return await self.get_with_questions(db, db_obj.id)
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Assessment,
+        obj_in: Union[AssessmentUpdate, Dict[str, Any]]
+    ) -> Assessment:
+        """
+        検査の更新（キャッシュを無効化）
+        """
+        updated = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        assessment_definition_cache.invalidate(updated.id)
+        return updated
+
+    async def remove(
+        self,
+        db: AsyncSession,
+        *,
+        id: UUID
+    ) -> Optional[Assessment]:
+        """
+        検査の削除（キャッシュを無効化）
+        """
+        obj = await super().remove(db, id=id)
+        assessment_definition_cache.invalidate(id)
+        return obj
 
     async def add_question(
         self,
@@ -85,6 +224,7 @@ class CRUDAssessment(CRUDBase[Assessment, AssessmentCreate, AssessmentUpdate]):
         question.assessment_id = assessment_id
         db.add(question)
         await db.commit()
+        assessment_definition_cache.invalidate(assessment_id)
         await db.refresh(question)
         return question
 
@@ -100,6 +240,7 @@ class CRUDAssessment(CRUDBase[Assessment, AssessmentCreate, AssessmentUpdate]):
         option.assessment_id = assessment_id
         db.add(option)
         await db.commit()
+        assessment_definition_cache.invalidate(assessment_id)
         await db.refresh(option)
         return option
 
@@ -109,23 +250,9 @@ class CRUDAssessment(CRUDBase[Assessment, AssessmentCreate, AssessmentUpdate]):
         assessment_id: UUID
     ) -> float:
         """
-        検査の完了率の取得
+        検査の完了率の取得（統計情報と同じ集計を利用する）
         """
-        total_query = select(func.count(AssessmentResult.id)).where(
-            AssessmentResult.assessment_id == assessment_id
-        )
-        completed_query = select(func.count(AssessmentResult.id)).where(
-            AssessmentResult.assessment_id == assessment_id,
-            AssessmentResult.status == "completed"
-        )
-        
-        total = await db.execute(total_query)
-        completed = await db.execute(completed_query)
-        
-        total_count = total.scalar()
-        completed_count = completed.scalar()
-        
-        return (completed_count / total_count * 100) if total_count > 0 else 0.0
+        return (await self.get_statistics(db, assessment_id)).completion_rate
 
 # CRUDAssessmentのインスタンスを作成
 assessment = CRUDAssessment(Assessment)
\ No newline at end of file
@@ -1,8 +1,13 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, ClassVar, Dict, Generic, List, Optional, Tuple, Type, TypeVar, Union
+from datetime import datetime
 from uuid import UUID
+import base64
+import json
+import os
+import time
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import Select, select, func, text, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import Base
@@ -11,10 +16,37 @@ ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# 件数キャッシュの有効期間（秒）と、推定値に切り替える件数のしきい値
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "30"))
+COUNT_ESTIMATE_THRESHOLD = int(os.getenv("COUNT_ESTIMATE_THRESHOLD", "100000"))
+
+def encode_cursor(sort_value: datetime, id: UUID) -> str:
+    """
+    (並び順の値, ID) から不透明なカーソル文字列を作成する
+    """
+    payload = json.dumps([sort_value.isoformat(), str(id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    カーソル文字列を (並び順の値, ID) に復元する
+
+    不正なカーソルの場合はValueErrorを送出する
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(sort_value), UUID(id)
+    except (TypeError, ValueError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
     CRUD操作の基本クラス
     """
+    # テーブル名ごとの件数キャッシュ: (有効期限, 件数, 推定値かどうか)
+    _count_cache: ClassVar[Dict[str, Tuple[float, int, bool]]] = {}
+
     def __init__(self, model: Type[ModelType]):
         """
         CRUD操作のモデルクラスを設定
@@ -43,6 +75,139 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         result = await db.execute(query)
         return result.scalars().all()
 
+    def keyset_query(
+        self,
+        query: Select,
+        sort_column: Any,
+        id_column: Any,
+        *,
+        cursor: Optional[str],
+        limit: int
+    ) -> Select:
+        """
+        (sort_column, id_column) の降順によるキーセットページネーションのクエリ
+
+        次ページの有無を判定するためlimit+1件を取得する。不正なカーソルの場合はValueErrorを送出する
+        """
+        if cursor:
+            sort_value, last_id = decode_cursor(cursor)
+            query = query.where(
+                or_(
+                    sort_column < sort_value,
+                    and_(sort_column == sort_value, id_column < last_id)
+                )
+            )
+        return query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1)
+
+    async def _keyset_page(
+        self,
+        db: AsyncSession,
+        query: Select,
+        sort_column: Any,
+        *,
+        limit: int
+    ) -> Tuple[List[Any], Optional[str]]:
+        """
+        キーセットページネーションのクエリ（keyset_query）の実行
+
+        OFFSETを使わないため、ページの深さに関わらず一定のコストで取得できる
+        """
+        result = await db.execute(query)
+        items = result.scalars().all()
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            # limitが0以下の場合はページが空になるためカーソルを作らない
+            if items:
+                last = items[-1]
+                next_cursor = encode_cursor(getattr(last, sort_column.key), last.id)
+        return items, next_cursor
+
+    def multi_by_cursor_query(self, *, cursor: Optional[str] = None, limit: int = 100) -> Select:
+        """
+        作成日時の新しい順のカーソルページネーションのクエリ
+        """
+        return self.keyset_query(
+            select(self.model),
+            self.model.created_at,
+            self.model.id,
+            cursor=cursor,
+            limit=limit
+        )
+
+    async def get_multi_by_cursor(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """
+        複数レコードの取得（作成日時の新しい順、カーソルページネーション）
+
+        戻り値は (レコード, 次ページのカーソル)
+        """
+        return await self._keyset_page(
+            db,
+            self.multi_by_cursor_query(cursor=cursor, limit=limit),
+            self.model.created_at,
+            limit=limit
+        )
+
+    async def count(self, db: AsyncSession) -> Tuple[int, bool]:
+        """
+        レコード件数の取得（キャッシュ付き、大規模テーブルでは推定値）
+
+        戻り値は (件数, 推定値かどうか)
+        """
+        table_name = self.model.__tablename__
+        cached = self._count_cache.get(table_name)
+        now = time.monotonic()
+        if cached and cached[0] > now:
+            return cached[1], cached[2]
+
+        total, estimated = None, False
+        if db.get_bind().dialect.name == "postgresql":
+            # 統計情報による推定件数（COUNT(*)の全件走査を回避）
+            estimate = await db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE relname = :name"),
+                {"name": table_name}
+            )
+            estimate_value = estimate.scalar()
+            if estimate_value is not None and estimate_value >= COUNT_ESTIMATE_THRESHOLD:
+                total, estimated = int(estimate_value), True
+        if total is None:
+            result = await db.execute(select(func.count()).select_from(self.model))
+            total = result.scalar() or 0
+
+        self._count_cache[table_name] = (now + COUNT_CACHE_TTL, total, estimated)
+        return total, estimated
+
+    def invalidate_count(self) -> None:
+        """
+        件数キャッシュの無効化
+        """
+        self._count_cache.pop(self.model.__tablename__, None)
+
+    async def get_multi_with_count(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100
+    ) -> Tuple[List[ModelType], int, bool]:
+        """
+        ページのレコードと総件数の取得
+
+        戻り値は (レコード, 総件数, 総件数が推定値かどうか)
+        """
+        items = await self.get_multi(db, skip=skip, limit=limit)
+        total, estimated = await self.count(db)
+        # キャッシュが古くても取得済みの件数より少なくはならない
+        total = max(total, skip + len(items))
+        return items, total, estimated
+
     async def create(
         self,
         db: AsyncSession,
@@ -56,6 +221,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
         await db.commit()
+        self.invalidate_count()
         await db.refresh(db_obj)
         return db_obj
 
@@ -97,8 +263,20 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         if obj:
             await db.delete(obj)
             await db.commit()
+            self.invalidate_count()
         return obj
 
+    async def get_updated_at(
+        self,
+        db: AsyncSession,
+        id: UUID
+    ) -> Optional[datetime]:
+        """
+        更新日時のみの取得（条件付きGETの判定用、レコードが無い場合はNone）
+        """
+        query = select(self.model.updated_at).where(self.model.id == id)
+        return (await db.execute(query)).scalar_one_or_none()
+
     async def exists(
         self,
         db: AsyncSession,
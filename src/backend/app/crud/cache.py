@@ -0,0 +1,89 @@
+import hashlib
+from dataclasses import dataclass
+from threading import RLock
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from app.models import Assessment
+from app.schemas.assessment import AssessmentResponse
+
+@dataclass(frozen=True)
+class CachedAssessment:
+    """キャッシュされた検査定義"""
+    definition: AssessmentResponse
+    version: int
+    etag: str  # 定義の内容のハッシュ（条件付きGETに使う）
+
+class AssessmentDefinitionCache:
+    """
+    検査定義（質問・選択肢を含む）のプロセス内キャッシュ
+
+    検査マスターはほとんど変更されないため、組み立て済みの定義をIDとタイプで保持する。
+    更新系の操作でバージョンを進め、該当エントリを破棄する。
+    """
+    def __init__(self) -> None:
+        self._lock = RLock()
+        self._by_id: Dict[UUID, CachedAssessment] = {}
+        self._by_type: Dict[str, List[UUID]] = {}
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @staticmethod
+    def build(db_obj: Assessment) -> AssessmentResponse:
+        """
+        ORMオブジェクトから表示順に並べた検査定義を組み立てる
+        """
+        definition = AssessmentResponse.model_validate(db_obj)
+        definition.questions.sort(key=lambda q: q.order)
+        definition.options.sort(key=lambda o: o.order)
+        return definition
+
+    def get(self, assessment_id: UUID) -> Optional[CachedAssessment]:
+        return self._by_id.get(assessment_id)
+
+    def get_by_type(self, assessment_type: str) -> Optional[List[AssessmentResponse]]:
+        with self._lock:
+            ids = self._by_type.get(assessment_type)
+            if ids is None:
+                return None
+            entries = [self._by_id.get(i) for i in ids]
+            if any(entry is None for entry in entries):
+                return None
+            return [entry.definition for entry in entries]
+
+    def put(self, definition: AssessmentResponse) -> CachedAssessment:
+        etag = hashlib.sha1(definition.model_dump_json().encode()).hexdigest()
+        with self._lock:
+            entry = CachedAssessment(definition=definition, version=self._version, etag=etag)
+            self._by_id[definition.id] = entry
+            return entry
+
+    def put_type(
+        self,
+        assessment_type: str,
+        definitions: List[AssessmentResponse]
+    ) -> None:
+        with self._lock:
+            for definition in definitions:
+                self.put(definition)
+            self._by_type[assessment_type] = [d.id for d in definitions]
+
+    def invalidate(self, assessment_id: Optional[UUID] = None) -> None:
+        """
+        キャッシュの無効化（ID未指定の場合は全件）
+
+        タイプの変更や追加に備え、タイプ別の索引は常に破棄する
+        """
+        with self._lock:
+            self._version += 1
+            if assessment_id is None:
+                self._by_id.clear()
+            else:
+                self._by_id.pop(assessment_id, None)
+            self._by_type.clear()
+
+# プロセス共通のキャッシュインスタンス
+assessment_definition_cache = AssessmentDefinitionCache()
@@ -1,12 +1,14 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
-from sqlalchemy import select
+from sqlalchemy import Select, case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, noload, selectinload
 
 from app.crud.base import CRUDBase
-from app.models import Patient, AssessmentResult
+from app.models import Assessment, Patient, AssessmentResult
+from app.models.base import AssessmentStatus
 from app.schemas.assessment import PatientCreate, PatientUpdate
+from app.schemas.result import AssessmentSummary, PatientAssessmentSummary
 
 class CRUDPatient(CRUDBase[Patient, PatientCreate, PatientUpdate]):
     """
@@ -28,6 +30,19 @@ class CRUDPatient(CRUDBase[Patient, PatientCreate, PatientUpdate]):
         result = await db.execute(query)
         return result.unique().scalar_one_or_none()
 
+    def active_assessments_query(self, patient_id: UUID) -> Select:
+        """
+        進行中の検査のクエリ
+        """
+        return (
+            select(AssessmentResult)
+            .where(
+                AssessmentResult.patient_id == patient_id,
+                AssessmentResult.status != AssessmentStatus.COMPLETED
+            )
+            .order_by(AssessmentResult.created_at.desc())
+        )
+
     async def get_active_assessments(
         self,
         db: AsyncSession,
@@ -36,17 +51,42 @@ class CRUDPatient(CRUDBase[Patient, PatientCreate, PatientUpdate]):
         """
         進行中の検査の取得
         """
-        query = (
+        result = await db.execute(self.active_assessments_query(patient_id))
+        return result.scalars().all()
+
+    def _completed_results_query(self, patient_id: UUID, include_answers: bool) -> Select:
+        """
+        完了した検査の絞り込み（include_answers がFalseの場合は回答詳細を読み込まない）
+        """
+        return (
             select(AssessmentResult)
-            .join(Patient)
+            .options(
+                selectinload(AssessmentResult.answer_details) if include_answers
+                else noload(AssessmentResult.answer_details)
+            )
             .where(
-                Patient.id == patient_id,
-                AssessmentResult.status != "completed"
+                AssessmentResult.patient_id == patient_id,
+                AssessmentResult.status == AssessmentStatus.COMPLETED
             )
-            .order_by(AssessmentResult.created_at.desc())
         )
-        result = await db.execute(query)
-        return result.scalars().all()
+
+    def completed_assessments_query(
+        self,
+        patient_id: UUID,
+        *,
+        skip: int = 0,
+        limit: int = 10,
+        include_answers: bool = True
+    ) -> Select:
+        """
+        完了した検査のクエリ（完了日時の新しい順、OFFSETによるページネーション）
+        """
+        return (
+            self._completed_results_query(patient_id, include_answers)
+            .order_by(AssessmentResult.completed_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
 
     async def get_completed_assessments(
         self,
@@ -54,25 +94,69 @@ class CRUDPatient(CRUDBase[Patient, PatientCreate, PatientUpdate]):
         patient_id: UUID,
         *,
         skip: int = 0,
-        limit: int = 10
+        limit: int = 10,
+        include_answers: bool = True
     ) -> List[AssessmentResult]:
         """
         完了した検査の取得（ページネーション対応）
+
+        include_answers がFalseの場合は回答詳細を読み込まない
         """
-        query = (
-            select(AssessmentResult)
-            .join(Patient)
-            .where(
-                Patient.id == patient_id,
-                AssessmentResult.status == "completed"
-            )
-            .order_by(AssessmentResult.completed_at.desc())
-            .offset(skip)
-            .limit(limit)
+        query = self.completed_assessments_query(
+            patient_id,
+            skip=skip,
+            limit=limit,
+            include_answers=include_answers
         )
         result = await db.execute(query)
         return result.scalars().all()
 
+    def completed_assessments_cursor_query(
+        self,
+        patient_id: UUID,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        include_answers: bool = True
+    ) -> Select:
+        """
+        完了した検査のクエリ（完了日時の新しい順、カーソルページネーション）
+        """
+        return self.keyset_query(
+            self._completed_results_query(patient_id, include_answers),
+            AssessmentResult.completed_at,
+            AssessmentResult.id,
+            cursor=cursor,
+            limit=limit
+        )
+
+    async def get_completed_assessments_by_cursor(
+        self,
+        db: AsyncSession,
+        patient_id: UUID,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        include_answers: bool = True
+    ) -> Tuple[List[AssessmentResult], Optional[str]]:
+        """
+        完了した検査の取得（完了日時の新しい順、カーソルページネーション）
+
+        戻り値は (検査結果, 次ページのカーソル)
+        """
+        query = self.completed_assessments_cursor_query(
+            patient_id,
+            cursor=cursor,
+            limit=limit,
+            include_answers=include_answers
+        )
+        return await self._keyset_page(
+            db,
+            query,
+            AssessmentResult.completed_at,
+            limit=limit
+        )
+
     async def get_assessment_history(
         self,
         db: AsyncSession,
@@ -87,13 +171,64 @@ class CRUDPatient(CRUDBase[Patient, PatientCreate, PatientUpdate]):
             .join(Patient)
             .where(
                 Patient.id == patient_id,
-                AssessmentResult.status == "completed"
+                AssessmentResult.status == AssessmentStatus.COMPLETED
             )
             .order_by(AssessmentResult.completed_at.desc())
         )
         result = await db.execute(query)
         return result.scalars().all()
 
+    async def get_assessment_summary(
+        self,
+        db: AsyncSession,
+        patient_id: UUID
+    ) -> Optional[PatientAssessmentSummary]:
+        """
+        検査タイプごとのサマリーの取得
+
+        件数・完了率・平均スコア・最終検査日を1回のGROUP BYクエリで集計するため、
+        履歴の件数に関わらず結果の行を読み込まない
+        """
+        patient_name = (await db.execute(
+            select(Patient.name).where(Patient.id == patient_id)
+        )).scalar_one_or_none()
+        if patient_name is None:
+            return None
+
+        is_completed = AssessmentResult.status == AssessmentStatus.COMPLETED
+        query = (
+            select(
+                Assessment.type,
+                func.count(AssessmentResult.id).label("total"),
+                func.sum(case((is_completed, 1), else_=0)).label("completed"),
+                func.avg(case((is_completed, AssessmentResult.total_score))).label("average_score"),
+                func.max(AssessmentResult.completed_at).label("last_date")
+            )
+            .join(Assessment)
+            .where(AssessmentResult.patient_id == patient_id)
+            .group_by(Assessment.type)
+            .order_by(Assessment.type)
+        )
+        summaries = [
+            AssessmentSummary(
+                assessment_type=row.type,
+                total_assessments=row.total,
+                completed_assessments=row.completed or 0,
+                average_score=float(row.average_score or 0),
+                completion_rate=(row.completed or 0) / row.total if row.total else 0.0,
+                last_assessment_date=row.last_date
+            )
+            for row in await db.execute(query)
+        ]
+        dates = [s.last_assessment_date for s in summaries if s.last_assessment_date]
+        return PatientAssessmentSummary(
+            patient_id=patient_id,
+            patient_name=patient_name,
+            assessments=summaries,
+            total_completed=sum(s.completed_assessments for s in summaries),
+            last_assessment_date=max(dates) if dates else None
+        )
+
     async def search_by_name(
         self,
         db: AsyncSession,
@@ -1,19 +1,62 @@
-from typing import List, Optional, Dict, Any
+import math
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 from datetime import datetime, timedelta
-from sqlalchemy import select, func, and_
+from sqlalchemy import Select, select, func, and_, insert, delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
+from app.crud.assessment import assessment as assessment_crud
 from app.crud.base import CRUDBase
+from app.crud.statistics import assessment_statistics
 from app.models import AssessmentResult, AnswerDetail, Assessment
-from app.models.base import AssessmentStatus
-from app.schemas.result import AssessmentResultCreate, AssessmentResultUpdate
+from app.models.base import AssessmentStatus, generate_uuid, utc_now
+from app.services.scoring import scoring_engine
+from app.services.events import event_broker
+from app.services.severity import severity_classifier
+from app.services.statistics import statistics_cache
+from app.services.trend import compute_trend, trend_cache
+from app.schemas.result import (
+    AssessmentResultCreate,
+    AssessmentResultUpdate,
+    AssessmentResultResponse,
+    AnswerDetailResponse,
+    AnswerItem,
+    AssessmentGraphData,
+    DashboardInstrument,
+    DetailedAssessmentResult,
+    GraphDataPoint,
+    PatientDashboard,
+    ResultEvent,
+    ResultProgress
+)
 
 class CRUDAssessmentResult(CRUDBase[AssessmentResult, AssessmentResultCreate, AssessmentResultUpdate]):
     """
     検査結果モデルに対するCRUD操作
     """
+    async def create(
+        self,
+        db: AsyncSession,
+        *,
+        obj_in: AssessmentResultCreate
+    ) -> AssessmentResult:
+        """
+        検査結果の作成
+        """
+        # IDはUUIDのまま渡す（統計情報キャッシュのキーと型を揃える）
+        db_obj = AssessmentResult(**obj_in.model_dump())
+        db.add(db_obj)
+        # 統計情報の集計テーブルも同じトランザクションで更新する
+        await assessment_statistics.record_result(db, obj_in.assessment_id)
+        await db.commit()
+        self.invalidate_count()
+        statistics_cache.record_result(obj_in.assessment_id)
+        await db.refresh(db_obj)
+        # レスポンスで参照する回答リストを非同期コンテキスト内で読み込んでおく
+        await db.refresh(db_obj, attribute_names=["answer_details"])
+        return db_obj
+
     async def get_with_details(
         self,
         db: AsyncSession,
@@ -34,6 +77,240 @@ class CRUDAssessmentResult(CRUDBase[AssessmentResult, AssessmentResultCreate, As
         result = await db.execute(query)
         return result.unique().scalar_one_or_none()
 
+    async def get_detailed(
+        self,
+        db: AsyncSession,
+        result_id: UUID,
+        *,
+        include_answers: bool = True
+    ) -> Optional[DetailedAssessmentResult]:
+        """
+        詳細表示用の検査結果の取得
+
+        患者・検査（・回答と質問）を1回のクエリで読み込み、
+        重症度・カットオフ判定・所要時間はメモリ上で算出する
+        """
+        options = [
+            joinedload(AssessmentResult.patient),
+            joinedload(AssessmentResult.assessment)
+        ]
+        if include_answers:
+            options.append(
+                joinedload(AssessmentResult.answer_details)
+                .joinedload(AnswerDetail.question)
+            )
+        query = (
+            select(AssessmentResult)
+            .options(*options)
+            .where(AssessmentResult.id == result_id)
+        )
+        result = (await db.execute(query)).unique().scalar_one_or_none()
+        if result is None:
+            return None
+
+        db_assessment = result.assessment
+        fields = {
+            name: getattr(result, name)
+            for name in AssessmentResultResponse.model_fields
+            if name not in ("answer_details", "severity_level")
+        }
+        answers = (
+            [AnswerDetailResponse.model_validate(a) for a in result.answer_details]
+            if include_answers else []
+        )
+        return DetailedAssessmentResult(
+            **fields,
+            answer_details=answers,
+            patient_name=result.patient.name,
+            assessment_name=db_assessment.name,
+            assessment_type=db_assessment.type,
+            cutoff_value=db_assessment.cutoff,
+            severity_level=severity_classifier.classify(db_assessment, result.total_score),
+            is_above_cutoff=(
+                result.total_score is not None
+                and result.total_score >= db_assessment.cutoff
+            ),
+            completion_time=(
+                (result.completed_at - result.started_at).total_seconds() / 60
+                if result.completed_at and result.started_at else None
+            )
+        )
+
+    def _upsert_answers_statement(self, db: AsyncSession, rows: List[Dict[str, Any]]):
+        """
+        (result_id, question_id) の一意インデックスに基づく回答のUPSERT文の作成
+        """
+        dialect_name = db.get_bind().dialect.name
+        if dialect_name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            return None
+        stmt = dialect_insert(AnswerDetail).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=[AnswerDetail.result_id, AnswerDetail.question_id],
+            set_={
+                "selected_option_id": stmt.excluded.selected_option_id,
+                "value": stmt.excluded.value,
+                "answered_at": stmt.excluded.answered_at,
+                "updated_at": stmt.excluded.updated_at
+            }
+        )
+
+    async def _upsert_answers(
+        self,
+        db: AsyncSession,
+        result_id: UUID,
+        answers: List[Dict[str, Any]],
+        answered_at: datetime
+    ) -> int:
+        """
+        回答の書き込み（既存の回答は置き換える。answered_at はUTCで渡す）
+        """
+        # 同一リクエスト内で同じ質問が複数回ある場合は最後の回答を採用する
+        latest = {answer["question_id"]: answer for answer in answers}
+        # 作成・更新日時は挿入・更新（ON CONFLICT）ともアプリ側の同じUTCの時刻にする
+        now = utc_now()
+        rows = [
+            {
+                "id": generate_uuid(),
+                "result_id": result_id,
+                "question_id": answer["question_id"],
+                "selected_option_id": answer["selected_option_id"],
+                "value": answer["value"],
+                "answered_at": answered_at,
+                "created_at": now,
+                "updated_at": now
+            }
+            for answer in latest.values()
+        ]
+        stmt = self._upsert_answers_statement(db, rows)
+        if stmt is not None:
+            await db.execute(stmt)
+        else:
+            # ON CONFLICT 非対応のDBでは削除してから挿入する
+            await db.execute(
+                delete(AnswerDetail).where(
+                    AnswerDetail.result_id == result_id,
+                    AnswerDetail.question_id.in_(list(latest.keys()))
+                )
+            )
+            await db.execute(insert(AnswerDetail), rows)
+        return len(rows)
+
+    async def _publish(self, result: Any, event: str, **fields: Any) -> None:
+        """
+        検査結果の通知イベントの発行
+        """
+        await event_broker.publish(ResultEvent(
+            event=event,
+            result_id=result.id,
+            patient_id=result.patient_id,
+            assessment_id=result.assessment_id,
+            status=result.status,
+            occurred_at=utc_now(),
+            **fields
+        ))
+
+    def _progress_query(self):
+        """
+        回答数（一意インデックスでのCOUNT）を含む検査結果の進捗の取得クエリ
+        """
+        answered = (
+            select(func.count(AnswerDetail.id))
+            .where(AnswerDetail.result_id == AssessmentResult.id)
+            .correlate(AssessmentResult)
+            .scalar_subquery()
+        )
+        return select(
+            AssessmentResult.id,
+            AssessmentResult.patient_id,
+            AssessmentResult.assessment_id,
+            AssessmentResult.status,
+            AssessmentResult.started_at,
+            answered.label("answered_count")
+        )
+
+    async def _to_progress(self, db: AsyncSession, row: Any) -> ResultProgress:
+        """
+        質問数はキャッシュ済みの検査定義から取得する
+        """
+        definition = await assessment_crud.get_definition(db, row.assessment_id)
+        return ResultProgress(
+            result_id=row.id,
+            assessment_id=row.assessment_id,
+            status=row.status,
+            answered_count=row.answered_count,
+            question_count=len(definition.questions) if definition else 0,
+            started_at=row.started_at
+        )
+
+    async def get_progress(
+        self,
+        db: AsyncSession,
+        result_id: UUID
+    ) -> Optional[ResultProgress]:
+        """
+        検査結果の回答進捗の取得（回答の行は読み込まない）
+        """
+        query = self._progress_query().where(AssessmentResult.id == result_id)
+        row = (await db.execute(query)).one_or_none()
+        if row is None:
+            return None
+        return await self._to_progress(db, row)
+
+    async def get_active_progress(
+        self,
+        db: AsyncSession,
+        patient_id: UUID
+    ) -> List[ResultProgress]:
+        """
+        患者の未完了の検査結果すべての回答進捗を1回のクエリで取得する
+        """
+        query = (
+            self._progress_query()
+            .where(
+                AssessmentResult.patient_id == patient_id,
+                AssessmentResult.status != AssessmentStatus.COMPLETED
+            )
+            .order_by(AssessmentResult.created_at.desc())
+        )
+        return [await self._to_progress(db, row) for row in await db.execute(query)]
+
+    async def _publish_progress(self, db: AsyncSession, result_id: UUID) -> None:
+        """
+        回答の進捗イベントの発行（購読者がいない場合はクエリを発行しない）
+        """
+        if not event_broker.has_subscribers:
+            return
+        query = self._progress_query().where(AssessmentResult.id == result_id)
+        row = (await db.execute(query)).one_or_none()
+        if row is not None:
+            await self._publish(row, "answer_progress", answered_count=row.answered_count)
+
+    async def validate_answers(
+        self,
+        db: AsyncSession,
+        assessment_id: UUID,
+        answers: List[Any]
+    ) -> None:
+        """
+        回答の質問・選択肢・値の検証（不正な場合はValueErrorを送出する）
+
+        検証はキャッシュ済みの検査定義で行う。回答の値は選択した選択肢の値と一致する必要がある
+        """
+        definition = await assessment_crud.get_definition(db, assessment_id)
+        question_ids = {q.id for q in definition.questions} if definition else set()
+        option_values = {o.id: o.value for o in definition.options} if definition else {}
+        for answer in answers:
+            if answer.question_id not in question_ids:
+                raise ValueError("検査に含まれない質問が指定されています")
+            if answer.selected_option_id not in option_values:
+                raise ValueError("検査に含まれない選択肢が指定されています")
+            if option_values[answer.selected_option_id] != answer.value:
+                raise ValueError("回答の値が選択肢の値と一致しません")
+
     async def add_answer(
         self,
         db: AsyncSession,
@@ -41,14 +318,87 @@ class CRUDAssessmentResult(CRUDBase[AssessmentResult, AssessmentResultCreate, As
         answer: AnswerDetail
     ) -> AnswerDetail:
         """
-        回答の追加
+        回答の追加（同じ質問への回答は置き換える）
+        """
+        await self._upsert_answers(
+            db,
+            result_id,
+            [{
+                "question_id": answer.question_id,
+                "selected_option_id": answer.selected_option_id,
+                "value": answer.value
+            }],
+            utc_now()
+        )
+        await db.commit()
+        await self._publish_progress(db, result_id)
+        query = select(AnswerDetail).where(
+            AnswerDetail.result_id == result_id,
+            AnswerDetail.question_id == answer.question_id
+        )
+        result = await db.execute(query)
+        return result.scalar_one()
+
+    async def add_answers(
+        self,
+        db: AsyncSession,
+        result_id: UUID,
+        answers: List[AnswerItem]
+    ) -> Tuple[int, datetime]:
+        """
+        回答の一括追加（単一トランザクション・単一UPSERT）
+
+        戻り値は (書き込んだ回答数（同じ質問への重複を除く）, 回答日時)
         """
-        answer.result_id = result_id
-        answer.answered_at = datetime.now()
-        db.add(answer)
+        answered_at = utc_now()
+        accepted = await self._upsert_answers(
+            db,
+            result_id,
+            [answer.model_dump() for answer in answers],
+            answered_at
+        )
         await db.commit()
-        await db.refresh(answer)
-        return answer
+        await self._publish_progress(db, result_id)
+        return accepted, answered_at
+
+    def _apply_start(self, result: AssessmentResult, started_at: datetime) -> bool:
+        """
+        開始状態への変更（コミットしない。変更した場合はTrue）
+        """
+        if result.status != AssessmentStatus.NOT_STARTED:
+            return False
+        result.status = AssessmentStatus.IN_PROGRESS
+        result.started_at = started_at
+        return True
+
+    async def _apply_complete(
+        self,
+        db: AsyncSession,
+        result: AssessmentResult,
+        completed_at: datetime
+    ) -> bool:
+        """
+        完了状態への変更と採点・統計情報の集計テーブルの更新（コミットしない。変更した場合はTrue）
+        """
+        if result.status != AssessmentStatus.IN_PROGRESS:
+            return False
+        result.status = AssessmentStatus.COMPLETED
+        result.completed_at = completed_at
+        # 合計スコア・下位尺度スコアの計算
+        total, subscales = await self.score_result(db, result.id, result.assessment_id)
+        result.total_score = total
+        result.subscale_scores = subscales or None
+        await assessment_statistics.record_completion(db, result.assessment_id, total)
+        return True
+
+    async def _after_complete(self, result: AssessmentResult) -> None:
+        """
+        完了のコミット後の処理
+        """
+        # 患者のトレンドが変わるためキャッシュを破棄し、統計情報は差分更新する
+        trend_cache.invalidate(result.patient_id)
+        statistics_cache.record_completion(result.assessment_id, result.total_score)
+        await self._publish(result, "complete_assessment", total_score=result.total_score)
 
     async def start_assessment(
         self,
@@ -59,11 +409,12 @@ class CRUDAssessmentResult(CRUDBase[AssessmentResult, AssessmentResultCreate, As
         検査の開始
         """
         result = await self.get(db, result_id)
-        if result and result.status == AssessmentStatus.NOT_STARTED:
-            result.status = AssessmentStatus.IN_PROGRESS
-            result.started_at = datetime.now()
+        if result and self._apply_start(result, utc_now()):
             await db.commit()
             await db.refresh(result)
+            await self._publish(result, "start_assessment", answered_count=0)
+        if result:
+            await db.refresh(result, attribute_names=["answer_details"])
         return result
 
     async def complete_assessment(
@@ -75,14 +426,12 @@ class CRUDAssessmentResult(CRUDBase[AssessmentResult, AssessmentResultCreate, As
         検査の完了
         """
         result = await self.get(db, result_id)
-        if result and result.status == AssessmentStatus.IN_PROGRESS:
-            result.status = AssessmentStatus.COMPLETED
-            result.completed_at = datetime.now()
-            # 合計スコアの計算
-            total = await self.calculate_total_score(db, result_id)
-            result.total_score = total
+        if result and await self._apply_complete(db, result, utc_now()):
             await db.commit()
             await db.refresh(result)
+            await self._after_complete(result)
+        if result:
+            await db.refresh(result, attribute_names=["answer_details"])
         return result
 
     async def calculate_total_score(
@@ -93,12 +442,79 @@ class CRUDAssessmentResult(CRUDBase[AssessmentResult, AssessmentResultCreate, As
         """
         合計スコアの計算
         """
-        query = (
-            select(func.sum(AnswerDetail.value))
+        total, _ = await self.score_result(db, result_id)
+        return total
+
+    def scoring_answers_query(self, result_id: UUID) -> Select:
+        """
+        採点に使う回答（質問IDと値）のクエリ
+        """
+        return (
+            select(AnswerDetail.question_id, AnswerDetail.value)
             .where(AnswerDetail.result_id == result_id)
         )
-        result = await db.execute(query)
-        return result.scalar() or 0
+
+    async def score_result(
+        self,
+        db: AsyncSession,
+        result_id: UUID,
+        assessment_id: Optional[UUID] = None
+    ) -> Tuple[int, Dict[str, float]]:
+        """
+        検査ごとの採点設定（逆転項目・重み・下位尺度）による採点
+
+        戻り値は (合計スコア, 下位尺度ごとのスコア)
+        """
+        if assessment_id is None:
+            assessment_id = (await db.execute(
+                select(AssessmentResult.assessment_id).where(AssessmentResult.id == result_id)
+            )).scalar_one_or_none()
+        definition = (
+            await assessment_crud.get_definition(db, assessment_id)
+            if assessment_id is not None else None
+        )
+        answers = (await db.execute(self.scoring_answers_query(result_id))).all()
+        if definition is None:
+            return sum(value for _, value in answers), {}
+        return scoring_engine.get(definition).score_answers(answers)
+
+    async def rescore_assessment(
+        self,
+        db: AsyncSession,
+        assessment_id: UUID
+    ) -> int:
+        """
+        検査の完了済み結果を現在の採点設定で一括再採点する
+
+        回答を1回のクエリで取得し、行列演算でまとめて採点する
+        """
+        definition = await assessment_crud.get_definition(db, assessment_id)
+        if definition is None:
+            return 0
+        query = (
+            select(AnswerDetail.result_id, AnswerDetail.question_id, AnswerDetail.value)
+            .join(AssessmentResult)
+            .where(
+                AssessmentResult.assessment_id == assessment_id,
+                AssessmentResult.status == AssessmentStatus.COMPLETED
+            )
+        )
+        rows = (await db.execute(query)).all()
+        scores = scoring_engine.score_results(definition, rows)
+        if not scores:
+            return 0
+        await db.execute(
+            update(AssessmentResult),
+            [
+                {"id": result_id, "total_score": total, "subscale_scores": subscales}
+                for result_id, (total, subscales) in scores.items()
+            ]
+        )
+        await assessment_statistics.rebuild(db, assessment_id)
+        await db.commit()
+        trend_cache.invalidate()
+        statistics_cache.invalidate(assessment_id)
+        return len(scores)
 
     async def get_trend_data(
         self,
@@ -110,33 +526,275 @@ class CRUDAssessmentResult(CRUDBase[AssessmentResult, AssessmentResultCreate, As
         """
         トレンドデータの取得
         """
-        start_date = datetime.now() - timedelta(days=days)
-        query = (
+        series = await self._get_trend_series(db, patient_id, [assessment_type], days)
+        return [
+            {
+                "date": row.completed_at,
+                "score": row.total_score,
+                "value": row.total_score or 0,
+                "type": row.type
+            }
+            for row in series.get(assessment_type, [])
+        ]
+
+    def trend_series_query(
+        self,
+        patient_id: UUID,
+        assessment_types: Optional[List[str]],
+        days: int
+    ) -> Select:
+        """
+        患者の完了済み結果の時系列のクエリ（タイプ未指定の場合は全タイプ）
+        """
+        start_date = utc_now() - timedelta(days=days)
+        conditions = [
+            AssessmentResult.patient_id == patient_id,
+            AssessmentResult.status == AssessmentStatus.COMPLETED,
+            AssessmentResult.completed_at >= start_date
+        ]
+        if assessment_types is not None:
+            conditions.append(Assessment.type.in_(assessment_types))
+        return (
             select(
                 AssessmentResult.completed_at,
                 AssessmentResult.total_score,
-                Assessment.type
+                Assessment.type,
+                Assessment.cutoff
+            )
+            .join(Assessment)
+            .where(and_(*conditions))
+            .order_by(AssessmentResult.completed_at)
+        )
+
+    async def _get_trend_series(
+        self,
+        db: AsyncSession,
+        patient_id: UUID,
+        assessment_types: Optional[List[str]],
+        days: int
+    ) -> Dict[str, List[Any]]:
+        """
+        複数の検査タイプの時系列を1回のクエリで取得する（タイプ未指定の場合は全タイプ）
+        """
+        query = self.trend_series_query(patient_id, assessment_types, days)
+        series: Dict[str, List[Any]] = {}
+        for row in await db.execute(query):
+            series.setdefault(row.type, []).append(row)
+        return series
+
+    async def _get_reference_sds(
+        self,
+        db: AsyncSession,
+        assessment_types: List[str]
+    ) -> Dict[str, Optional[float]]:
+        """
+        検査タイプごとの完了結果全体の標準偏差（RCIの基準値）
+
+        キャッシュに無いタイプのみ1回の集計クエリで求める
+        """
+        sds: Dict[str, Optional[float]] = {}
+        missing: List[str] = []
+        for assessment_type in assessment_types:
+            cached, sd = trend_cache.get_reference_sd(assessment_type)
+            if cached:
+                sds[assessment_type] = sd
+            else:
+                missing.append(assessment_type)
+        if not missing:
+            return sds
+
+        score = AssessmentResult.total_score
+        query = (
+            select(
+                Assessment.type,
+                func.count(score),
+                func.avg(score),
+                func.avg(score * score)
             )
             .join(Assessment)
             .where(
-                and_(
-                    AssessmentResult.patient_id == patient_id,
-                    Assessment.type == assessment_type,
-                    AssessmentResult.status == AssessmentStatus.COMPLETED,
-                    AssessmentResult.completed_at >= start_date
-                )
+                Assessment.type.in_(missing),
+                AssessmentResult.status == AssessmentStatus.COMPLETED
             )
-            .order_by(AssessmentResult.completed_at)
+            .group_by(Assessment.type)
         )
-        result = await db.execute(query)
-        return [
-            {
-                "date": row.completed_at,
-                "score": row.total_score,
-                "type": row.type
-            }
-            for row in result
+        rows = {row[0]: row[1:] for row in await db.execute(query)}
+        for assessment_type in missing:
+            count, mean, mean_square = rows.get(assessment_type, (0, None, None))
+            sd = None
+            if count and count > 1:
+                # 不偏分散に補正する
+                variance = max(0.0, float(mean_square) - float(mean) ** 2) * count / (count - 1)
+                sd = math.sqrt(variance) or None
+            trend_cache.put_reference_sd(assessment_type, sd)
+            sds[assessment_type] = sd
+        return sds
+
+    async def get_trends(
+        self,
+        db: AsyncSession,
+        patient_id: UUID,
+        assessment_types: Optional[List[str]] = None,
+        days: int = 30
+    ) -> List[AssessmentGraphData]:
+        """
+        患者の複数検査タイプのトレンド（回帰直線・移動平均・RCI）の取得
+
+        計算結果は (患者, タイプ, 日数) ごとにキャッシュし、患者の検査完了時に破棄する。
+        タイプ未指定の場合は期間内に完了した結果のある全タイプを対象とする。
+        """
+        graphs: Dict[str, AssessmentGraphData] = {}
+        missing = assessment_types
+        if assessment_types is not None:
+            missing = []
+            for assessment_type in dict.fromkeys(assessment_types):
+                cached = trend_cache.get(patient_id, assessment_type, days)
+                if cached is not None:
+                    graphs[assessment_type] = cached
+                else:
+                    missing.append(assessment_type)
+
+        if missing is None or missing:
+            series = await self._get_trend_series(db, patient_id, missing, days)
+            targets = list(series) if missing is None else missing
+            sds = await self._get_reference_sds(db, targets)
+            computed: List[AssessmentGraphData] = []
+            for assessment_type in targets:
+                rows = series.get(assessment_type)
+                if rows:
+                    cutoff = rows[-1].cutoff
+                else:
+                    # 期間内の結果が無いタイプはキャッシュ済みの検査定義からカットオフを取得する
+                    definitions = await assessment_crud.get_definitions_by_type(db, assessment_type)
+                    if not definitions:
+                        continue
+                    cutoff = definitions[0].cutoff
+                    rows = []
+                computed.append(compute_trend(
+                    assessment_type,
+                    [row.completed_at for row in rows],
+                    [row.total_score for row in rows],
+                    cutoff,
+                    reference_sd=sds.get(assessment_type)
+                ))
+            trend_cache.put(patient_id, days, computed)
+            graphs.update((graph.assessment_type, graph) for graph in computed)
+
+        order = assessment_types if assessment_types is not None else sorted(graphs)
+        return [graphs[t] for t in dict.fromkeys(order) if t in graphs]
+
+    async def get_trend_for_result(
+        self,
+        db: AsyncSession,
+        result_id: UUID,
+        days: int = 30
+    ) -> Optional[AssessmentGraphData]:
+        """
+        検査結果と同じ患者・検査タイプのトレンドの取得
+        """
+        query = (
+            select(AssessmentResult.patient_id, Assessment.type)
+            .join(Assessment)
+            .where(AssessmentResult.id == result_id)
+        )
+        row = (await db.execute(query)).one_or_none()
+        if row is None:
+            return None
+        graphs = await self.get_trends(db, row.patient_id, [row.type], days=days)
+        return graphs[0] if graphs else None
+
+    def dashboard_query(self, patient_id: UUID, days: Optional[int] = None) -> Select:
+        """
+        検査マスターに患者の完了済み結果を外部結合したクエリ（結果の無い検査も含む）
+        """
+        conditions = [
+            AssessmentResult.patient_id == patient_id,
+            AssessmentResult.status == AssessmentStatus.COMPLETED
         ]
+        if days is not None:
+            conditions.append(
+                AssessmentResult.completed_at >= utc_now() - timedelta(days=days)
+            )
+        # 患者の結果を先に絞り込むため、CTEを実体化して結合順序を固定する
+        # （展開されると検査ごとに全患者の結果を走査する計画が選ばれる）
+        patient_results = (
+            select(
+                AssessmentResult.assessment_id,
+                AssessmentResult.completed_at,
+                AssessmentResult.total_score
+            )
+            .where(and_(*conditions))
+            .cte("patient_results")
+            .prefix_with("MATERIALIZED")
+        )
+        return (
+            select(
+                Assessment.id,
+                Assessment.name,
+                Assessment.type,
+                Assessment.cutoff,
+                Assessment.max_score,
+                Assessment.severity_bands,
+                patient_results.c.completed_at,
+                patient_results.c.total_score
+            )
+            .outerjoin(patient_results, patient_results.c.assessment_id == Assessment.id)
+            .order_by(Assessment.type, patient_results.c.completed_at)
+        )
+
+    async def get_dashboard(
+        self,
+        db: AsyncSession,
+        patient_id: UUID,
+        days: Optional[int] = None
+    ) -> PatientDashboard:
+        """
+        患者の全検査の一覧表示データの取得
+
+        検査マスターに完了済み結果を外部結合した1回のクエリで全タイプの時系列を取得し、
+        最新スコア・カットオフ判定・重症度はメモリ上で求める（結果の無い検査も含む）
+        """
+        query = self.dashboard_query(patient_id, days)
+
+        # タイプごとに時系列をまとめる（同じタイプの検査が複数ある場合は最新の結果の検査を代表とする）
+        groups: Dict[str, Tuple[Any, List[Any]]] = {}
+        for row in await db.execute(query):
+            representative, rows = groups.get(row.type, (row, []))
+            if row.completed_at is not None:
+                rows.append(row)
+                representative = row
+            groups[row.type] = (representative, rows)
+
+        instruments: List[DashboardInstrument] = []
+        for assessment_type, (representative, rows) in groups.items():
+            latest = rows[-1] if rows else None
+            latest_score = (latest.total_score or 0) if latest else None
+            instruments.append(DashboardInstrument(
+                assessment_id=representative.id,
+                assessment_name=representative.name,
+                assessment_type=assessment_type,
+                cutoff=representative.cutoff,
+                max_score=representative.max_score,
+                data_points=[
+                    GraphDataPoint(date=row.completed_at, value=row.total_score or 0)
+                    for row in rows
+                ],
+                result_count=len(rows),
+                latest_score=latest_score,
+                latest_completed_at=latest.completed_at if latest else None,
+                is_above_cutoff=latest_score >= representative.cutoff if latest else None,
+                severity_level=(
+                    severity_classifier.classify(representative, latest_score)
+                    if latest else None
+                )
+            ))
+
+        dates = [i.latest_completed_at for i in instruments if i.latest_completed_at]
+        return PatientDashboard(
+            patient_id=patient_id,
+            instruments=instruments,
+            last_assessment_date=max(dates) if dates else None
+        )
 
     async def get_severity_level(
         self,
@@ -146,22 +804,41 @@ class CRUDAssessmentResult(CRUDBase[AssessmentResult, AssessmentResultCreate, As
         """
         重症度レベルの判定
         """
-        result = await self.get_with_details(db, result_id)
-        if not result or not result.assessment:
+        query = (
+            select(AssessmentResult.total_score, Assessment)
+            .join(Assessment)
+            .where(AssessmentResult.id == result_id)
+        )
+        row = (await db.execute(query)).one_or_none()
+        if row is None:
             return "unknown"
+        return severity_classifier.classify(row.Assessment, row.total_score)
 
-        score = result.total_score or 0
-        cutoff = result.assessment.cutoff
-        max_score = result.assessment.max_score
+    async def get_severity_levels(
+        self,
+        db: AsyncSession,
+        results: List[AssessmentResult]
+    ) -> List[str]:
+        """
+        複数の検査結果の重症度レベルの一括判定
 
-        if score >= cutoff:
-            if score >= max_score * 0.8:
-                return "severe"
-            elif score >= max_score * 0.6:
-                return "moderate"
-            else:
-                return "mild"
-        return "normal"
+        検査ごとにまとめてコンパイル済みの区分表で分類するため、結果ごとのクエリは発生しない
+        """
+        levels: List[str] = ["unknown"] * len(results)
+        by_assessment: Dict[UUID, List[int]] = {}
+        for index, result in enumerate(results):
+            by_assessment.setdefault(result.assessment_id, []).append(index)
+        for assessment_id, indexes in by_assessment.items():
+            definition = await assessment_crud.get_definition(db, assessment_id)
+            if definition is None:
+                continue
+            labels = severity_classifier.classify_many(
+                definition,
+                [results[i].total_score for i in indexes]
+            )
+            for index, label in zip(indexes, labels):
+                levels[index] = label
+        return levels
 
 # CRUDAssessmentResultのインスタンスを作成
 assessment_result = CRUDAssessmentResult(AssessmentResult)
\ No newline at end of file
@@ -0,0 +1,231 @@
+from typing import Any, Dict, Optional
+from uuid import UUID
+from sqlalchemy import Select, case, delete, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import AssessmentResult, AssessmentScoreBucket, AssessmentStatisticsRollup
+from app.models.base import AssessmentStatus, utc_now
+from app.services.statistics import ScoreDistribution
+
+_rollup = AssessmentStatisticsRollup.__table__
+_buckets = AssessmentScoreBucket.__table__
+
+class CRUDAssessmentStatistics:
+    """
+    検査ごとの統計情報の集計テーブルに対する操作
+
+    更新系のメソッドはコミットしない（呼び出し元の検査結果の更新と同じトランザクションで反映する）
+    """
+    @staticmethod
+    def _dialect_insert(db: AsyncSession):
+        """
+        ON CONFLICT 対応のINSERT（非対応のDBではNone）
+        """
+        dialect_name = db.get_bind().dialect.name
+        if dialect_name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            return None
+        return dialect_insert
+
+    async def _upsert(
+        self,
+        db: AsyncSession,
+        table,
+        key: Dict[str, Any],
+        initial: Dict[str, Any],
+        changes: Dict[str, Any]
+    ) -> None:
+        """
+        キーの行があれば changes で更新し、無ければ initial で作成する
+        """
+        dialect_insert = self._dialect_insert(db)
+        if dialect_insert is not None:
+            stmt = dialect_insert(table).values(**key, **initial)
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=[table.c[name] for name in key],
+                set_=changes
+            ))
+            return
+        # ON CONFLICT 非対応のDBでは更新件数で存在を判定する
+        conditions = [table.c[name] == value for name, value in key.items()]
+        result = await db.execute(update(table).where(*conditions).values(**changes))
+        if result.rowcount == 0:
+            await db.execute(insert(table).values(**key, **initial))
+
+    async def record_result(self, db: AsyncSession, assessment_id: UUID) -> None:
+        """
+        検査結果の作成の反映
+        """
+        await self._upsert(
+            db,
+            _rollup,
+            {"assessment_id": assessment_id},
+            {"total_results": 1, "updated_at": utc_now()},
+            {"total_results": _rollup.c.total_results + 1, "updated_at": utc_now()}
+        )
+
+    async def record_completion(
+        self,
+        db: AsyncSession,
+        assessment_id: UUID,
+        score: Optional[int]
+    ) -> None:
+        """
+        検査の完了の反映（件数・合計・二乗和・最小/最大・スコアの度数）
+        """
+        now = utc_now()
+        if score is None:
+            await self._upsert(
+                db,
+                _rollup,
+                {"assessment_id": assessment_id},
+                {"completed_count": 1, "updated_at": now},
+                {"completed_count": _rollup.c.completed_count + 1, "updated_at": now}
+            )
+            return
+        await self._upsert(
+            db,
+            _rollup,
+            {"assessment_id": assessment_id},
+            {
+                "completed_count": 1,
+                "scored_count": 1,
+                "score_sum": score,
+                "score_sum_squares": score * score,
+                "min_score": score,
+                "max_score": score,
+                "updated_at": now
+            },
+            {
+                "completed_count": _rollup.c.completed_count + 1,
+                "scored_count": _rollup.c.scored_count + 1,
+                "score_sum": _rollup.c.score_sum + score,
+                "score_sum_squares": _rollup.c.score_sum_squares + score * score,
+                "min_score": case(
+                    (_rollup.c.min_score.is_(None) | (_rollup.c.min_score > score), score),
+                    else_=_rollup.c.min_score
+                ),
+                "max_score": case(
+                    (_rollup.c.max_score.is_(None) | (_rollup.c.max_score < score), score),
+                    else_=_rollup.c.max_score
+                ),
+                "updated_at": now
+            }
+        )
+        await self._upsert(
+            db,
+            _buckets,
+            {"assessment_id": assessment_id, "score": score},
+            {"count": 1},
+            {"count": _buckets.c.count + 1}
+        )
+
+    async def rebuild(
+        self,
+        db: AsyncSession,
+        assessment_id: Optional[UUID] = None
+    ) -> int:
+        """
+        検査結果からの集計テーブルの再構築（ID未指定の場合は全検査）
+
+        戻り値は再構築した検査の数
+        """
+        rollup_delete = delete(_rollup)
+        buckets_delete = delete(_buckets)
+        results_filter = []
+        if assessment_id is not None:
+            rollup_delete = rollup_delete.where(_rollup.c.assessment_id == assessment_id)
+            buckets_delete = buckets_delete.where(_buckets.c.assessment_id == assessment_id)
+            results_filter.append(AssessmentResult.assessment_id == assessment_id)
+        await db.execute(buckets_delete)
+        await db.execute(rollup_delete)
+
+        is_completed = AssessmentResult.status == AssessmentStatus.COMPLETED
+        completed_score = case((is_completed, AssessmentResult.total_score))
+        rollup_select = (
+            select(
+                AssessmentResult.assessment_id,
+                func.count(AssessmentResult.id),
+                func.sum(case((is_completed, 1), else_=0)),
+                func.count(completed_score),
+                func.coalesce(func.sum(completed_score), 0),
+                func.coalesce(func.sum(completed_score * completed_score), 0),
+                func.min(completed_score),
+                func.max(completed_score),
+                literal(utc_now(), _rollup.c.updated_at.type)
+            )
+            .where(*results_filter)
+            .group_by(AssessmentResult.assessment_id)
+        )
+        result = await db.execute(insert(_rollup).from_select(
+            [
+                "assessment_id",
+                "total_results",
+                "completed_count",
+                "scored_count",
+                "score_sum",
+                "score_sum_squares",
+                "min_score",
+                "max_score",
+                "updated_at"
+            ],
+            rollup_select
+        ))
+        buckets_select = (
+            select(
+                AssessmentResult.assessment_id,
+                AssessmentResult.total_score,
+                func.count(AssessmentResult.id)
+            )
+            .where(is_completed, AssessmentResult.total_score.is_not(None), *results_filter)
+            .group_by(AssessmentResult.assessment_id, AssessmentResult.total_score)
+        )
+        await db.execute(insert(_buckets).from_select(
+            ["assessment_id", "score", "count"],
+            buckets_select
+        ))
+        return result.rowcount
+
+    def rollup_query(self, assessment_id: UUID) -> Select:
+        """
+        集計行（結果件数・完了件数）のクエリ
+        """
+        return (
+            select(_rollup.c.total_results, _rollup.c.completed_count)
+            .where(_rollup.c.assessment_id == assessment_id)
+        )
+
+    def buckets_query(self, assessment_id: UUID) -> Select:
+        """
+        スコアの度数のクエリ
+        """
+        return (
+            select(_buckets.c.score, _buckets.c.count)
+            .where(_buckets.c.assessment_id == assessment_id)
+        )
+
+    async def get_distribution(
+        self,
+        db: AsyncSession,
+        assessment_id: UUID
+    ) -> Optional[ScoreDistribution]:
+        """
+        集計テーブルからの度数分布の取得（集計行が無い場合はNone）
+
+        件数は集計行、度数はスコアの種類数（最大スコア+1以下）の行を読むだけで済む
+        """
+        rollup = (await db.execute(self.rollup_query(assessment_id))).one_or_none()
+        if rollup is None:
+            return None
+        buckets = await db.execute(self.buckets_query(assessment_id))
+        return ScoreDistribution(
+            total_results=rollup.total_results,
+            completed=rollup.completed_count,
+            frequencies={row.score: row.count for row in buckets if row.count}
+        )
+
+# CRUDAssessmentStatisticsのインスタンスを作成
+assessment_statistics = CRUDAssessmentStatistics()
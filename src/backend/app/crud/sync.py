@@ -0,0 +1,219 @@
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.result import assessment_result
+from app.models import AssessmentResult, SyncOperation
+from app.models.base import AssessmentStatus, utc_now
+from app.schemas.sync import (
+    SyncOperationCreate,
+    SyncOperationResult,
+    SyncRequest,
+    SyncResponse
+)
+
+class SyncRejected(Exception):
+    """
+    適用できない操作（同期結果に理由を返し、他の操作の適用は続ける）
+    """
+    def __init__(self, code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.code = code
+        self.detail = detail
+
+class _DuplicateOperation(Exception):
+    """冪等キーの一意制約違反（同時に再送された操作）"""
+
+def _as_utc(timestamp: datetime) -> datetime:
+    """
+    UTCの日時に揃える（タイムゾーンの無い日時はUTCとみなす）
+    """
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc)
+
+def _server_timestamp(client_timestamp: datetime, now: datetime) -> datetime:
+    """
+    クライアントの操作日時をサーバーの日時（UTC）に揃える（未来の日時は現在時刻にする）
+    """
+    return min(_as_utc(client_timestamp), now)
+
+class CRUDSync:
+    """
+    オフライン中にクライアントのキューに積まれた操作の一括同期
+
+    操作はリクエストの順に操作ごとのセーブポイント内で適用し、失敗した操作のみを
+    取り消して全体を1回でコミットする。適用した操作は冪等キーを同じセーブポイント内で
+    記録するため、再送された操作は重複として適用しない。
+    """
+    async def get_applied_keys(self, db: AsyncSession, keys: Iterable[str]) -> Set[str]:
+        """
+        適用済みの冪等キーの取得
+        """
+        keys = list(set(keys))
+        if not keys:
+            return set()
+        result = await db.execute(
+            select(SyncOperation.idempotency_key).where(SyncOperation.idempotency_key.in_(keys))
+        )
+        return set(result.scalars())
+
+    async def _get_results(self, db: AsyncSession, result_ids: Set[UUID]) -> Dict[UUID, AssessmentResult]:
+        if not result_ids:
+            return {}
+        result = await db.execute(
+            select(AssessmentResult).where(AssessmentResult.id.in_(list(result_ids)))
+        )
+        return {row.id: row for row in result.scalars()}
+
+    async def _check(self, db: AsyncSession, result: AssessmentResult, op: SyncOperationCreate) -> None:
+        """
+        操作を適用できるかの確認（できない場合は SyncRejected）
+        """
+        if op.type == "answer":
+            if result.status != AssessmentStatus.IN_PROGRESS:
+                raise SyncRejected(409, "進行中の検査でのみ回答を追加できます")
+            try:
+                await assessment_result.validate_answers(db, result.assessment_id, op.answers)
+            except ValueError as e:
+                raise SyncRejected(400, str(e)) from e
+        elif op.type == "complete" and result.status == AssessmentStatus.NOT_STARTED:
+            raise SyncRejected(409, "開始していない検査は完了できません")
+
+    async def _apply_operation(
+        self,
+        db: AsyncSession,
+        result: AssessmentResult,
+        op: SyncOperationCreate,
+        timestamp: datetime
+    ) -> bool:
+        """
+        操作の適用（状態を変更した場合はTrue。開始済み・完了済みへの再操作は変更なしとして扱う）
+        """
+        if op.type == "start":
+            return assessment_result._apply_start(result, timestamp)
+        if op.type == "complete":
+            return await assessment_result._apply_complete(db, result, timestamp)
+        await assessment_result._upsert_answers(
+            db,
+            result.id,
+            [answer.model_dump() for answer in op.answers],
+            timestamp
+        )
+        return True
+
+    async def apply(self, db: AsyncSession, sync_in: SyncRequest) -> SyncResponse:
+        """
+        操作の一括適用
+        """
+        now = utc_now()
+        operations = sync_in.operations
+        applied_keys = await self.get_applied_keys(db, (op.op_id for op in operations))
+        results = await self._get_results(
+            db,
+            {op.result_id for op in operations if op.op_id not in applied_keys}
+        )
+
+        outcomes: List[SyncOperationResult] = []
+        # コミット後に通知する変更（操作の順）
+        changes: List[Tuple[str, AssessmentResult]] = []
+        for op in operations:
+            if op.op_id in applied_keys:
+                outcomes.append(SyncOperationResult(op_id=op.op_id, status="duplicate", code=200))
+                continue
+            result = results.get(op.result_id)
+            try:
+                if result is None:
+                    raise SyncRejected(404, "指定された検査結果が見つかりません")
+                await self._check(db, result, op)
+                changed = await self._apply_in_savepoint(db, result, op, sync_in.device_id, now)
+            except SyncRejected as e:
+                outcomes.append(SyncOperationResult(
+                    op_id=op.op_id,
+                    status="rejected",
+                    code=e.code,
+                    detail=e.detail
+                ))
+                continue
+            except _DuplicateOperation:
+                # 同じ操作が別のリクエストで同時に適用された
+                outcomes.append(SyncOperationResult(op_id=op.op_id, status="duplicate", code=200))
+                applied_keys.add(op.op_id)
+                continue
+            applied_keys.add(op.op_id)
+            outcomes.append(SyncOperationResult(op_id=op.op_id, status="applied", code=200))
+            if changed:
+                changes.append((op.type, result))
+
+        await db.commit()
+        await self._after_commit(db, changes)
+
+        counts = {status: 0 for status in ("applied", "duplicate", "rejected")}
+        for outcome in outcomes:
+            counts[outcome.status] += 1
+        return SyncResponse(
+            applied=counts["applied"],
+            duplicates=counts["duplicate"],
+            rejected=counts["rejected"],
+            server_time=now,
+            results=outcomes
+        )
+
+    async def _apply_in_savepoint(
+        self,
+        db: AsyncSession,
+        result: AssessmentResult,
+        op: SyncOperationCreate,
+        device_id: Optional[str],
+        now: datetime
+    ) -> bool:
+        """
+        操作の適用と冪等キーの記録を1つのセーブポイントで行う
+        """
+        try:
+            async with db.begin_nested():
+                # 冪等キーを先に記録し、一意制約違反はこのINSERTのみで判定する
+                db.add(SyncOperation(
+                    idempotency_key=op.op_id,
+                    device_id=device_id,
+                    result_id=result.id,
+                    operation=op.type,
+                    client_timestamp=_as_utc(op.client_timestamp)
+                ))
+                try:
+                    await db.flush()
+                except IntegrityError as e:
+                    raise _DuplicateOperation() from e
+                changed = await self._apply_operation(
+                    db,
+                    result,
+                    op,
+                    _server_timestamp(op.client_timestamp, now)
+                )
+                await db.flush()
+        except IntegrityError as e:
+            # 取り消した変更を読み直す（期限切れの属性は非同期では遅延読み込みできない）
+            await db.refresh(result)
+            raise SyncRejected(400, "回答の選択肢または質問が不正です") from e
+        return changed
+
+    async def _after_commit(self, db: AsyncSession, changes: List[Tuple[str, AssessmentResult]]) -> None:
+        """
+        コミット後のキャッシュの更新と通知
+        """
+        answered: Set[UUID] = set()
+        for operation, result in changes:
+            if operation == "start":
+                await assessment_result._publish(result, "start_assessment", answered_count=0)
+            elif operation == "complete":
+                await assessment_result._after_complete(result)
+            else:
+                answered.add(result.id)
+        for result_id in answered:
+            await assessment_result._publish_progress(db, result_id)
+
+# CRUDSyncのインスタンスを作成
+sync = CRUDSync()
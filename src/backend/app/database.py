@@ -1,8 +1,10 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine
 from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 import os
-from typing import Generator
+from typing import Any, Dict, Generator
 
 # データベースURLの設定
 SQLALCHEMY_DATABASE_URL = os.getenv(
@@ -10,12 +12,86 @@ SQLALCHEMY_DATABASE_URL = os.getenv(
     "sqlite+aiosqlite:///./scale_app.db"  # デフォルトはSQLite
 )
 
+def _env_bool(name: str, default: bool) -> bool:
+    """環境変数を真偽値として取得する"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+# コネクションプールの設定（デプロイ環境に合わせて環境変数で調整）
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # 秒
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+DB_ECHO = _env_bool("DB_ECHO", False)  # SQLログはデフォルトで無効
+DB_POOL_WARMUP = int(os.getenv("DB_POOL_WARMUP", "1"))  # 起動時に確立する接続数
+DB_AUTO_CREATE = _env_bool("DB_AUTO_CREATE", False)  # 起動時にテーブルを作成（開発用）
+
+# SQLite用のPRAGMA設定
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "20000"))
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+def _is_sqlite_memory(url: str) -> bool:
+    database = make_url(url).database
+    return not database or database == ":memory:" or "mode=memory" in url
+
+def _engine_options(url: str) -> Dict[str, Any]:
+    """
+    URLに応じたエンジンオプションの組み立て
+    """
+    options: Dict[str, Any] = {
+        "echo": DB_ECHO,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if _is_sqlite(url) and _is_sqlite_memory(url):
+        # インメモリDBは単一接続を共有しないとデータが失われる
+        options["poolclass"] = StaticPool
+        options["connect_args"] = {"check_same_thread": False}
+        return options
+
+    # aiosqliteはファイルDBでNullPoolが既定のため、明示的にキュープールを使用する
+    options.update(
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+    )
+    return options
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    SQLite接続ごとのPRAGMA設定（WAL・同期モード・ロック待ち時間など）
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA foreign_keys=ON")
+    finally:
+        cursor.close()
+
+def create_engine_from_url(url: str) -> AsyncEngine:
+    """
+    設定値を適用した非同期エンジンの作成
+    """
+    new_engine = create_async_engine(url, **_engine_options(url))
+    if _is_sqlite(url):
+        event.listen(new_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    return new_engine
+
 # エンジンの作成
-engine = create_async_engine(
-    SQLALCHEMY_DATABASE_URL,
-    poolclass=NullPool,
-    echo=True  # SQLログを出力（開発環境用）
-)
+engine = create_engine_from_url(SQLALCHEMY_DATABASE_URL)
 
 # 非同期セッションの設定
 AsyncSessionLocal = sessionmaker(
@@ -51,8 +127,45 @@ async def init_db() -> None:
         # 開発環境でのみ使用（本番環境ではマイグレーションを使用）
         await conn.run_sync(Base.metadata.create_all)
 
+async def warm_up_db() -> None:
+    """
+    起動時にプールへ接続を確立しておく（初回リクエストの接続待ちを回避）
+    """
+    count = max(0, min(DB_POOL_WARMUP, DB_POOL_SIZE))
+    if not isinstance(engine.pool, AsyncAdaptedQueuePool):
+        count = min(count, 1)
+    connections = []
+    try:
+        # 同時にチェックアウトしてプールに指定数の接続を確立させる
+        for _ in range(count):
+            conn = await engine.connect()
+            connections.append(conn)
+            await conn.execute(text("SELECT 1"))
+    finally:
+        for conn in connections:
+            await conn.close()
+
 async def close_db() -> None:
     """
     データベース接続のクリーンアップ
     """
-    await engine.dispose()
\ No newline at end of file
+    await engine.dispose()
+
+def get_pool_status() -> Dict[str, Any]:
+    """
+    コネクションプールの統計情報の取得（プールサイズ調整用）
+    """
+    pool = engine.pool
+    stats: Dict[str, Any] = {
+        "pool_class": type(pool).__name__,
+        "status": pool.status(),
+    }
+    # QueuePool系のみが持つ統計値
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    if hasattr(pool, "timeout"):
+        stats["timeout"] = pool.timeout()
+        stats["max_overflow"] = DB_MAX_OVERFLOW
+    return stats
@@ -1,21 +1,52 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from typing import Dict
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
+from typing import Any, AsyncIterator, Dict
 import os
 
 from app.api import api_router
+from app.api.middleware import MetricsMiddleware, ProfilingMiddleware
+from app.api.responses import serialization_stats
+from app.database import (
+    DB_AUTO_CREATE,
+    close_db,
+    engine,
+    get_pool_status,
+    init_db,
+    warm_up_db
+)
+from app.services.events import event_broker
+from app.services.metrics import install_query_hooks, metrics_registry
+from app.services.profiling import PROFILING_ENABLED
 
 API_V1_STR = "/api/v1"
 CORS_ORIGINS = os.environ.get("CORS_ORIGINS", "*").split(",")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    起動時の接続ウォームアップ・イベント配信の開始と、終了時の解放
+    """
+    if DB_AUTO_CREATE:
+        await init_db()
+    await warm_up_db()
+    await event_broker.start()
+    try:
+        yield
+    finally:
+        await event_broker.stop()
+        await close_db()
+
 app = FastAPI(
     title="Scale App API",
     description="心理検査管理システムのバックエンドAPI",
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json"
+    openapi_url="/api/openapi.json",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS設定
@@ -25,8 +56,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-DB-Query-Count", "X-Profile-Id", "X-Profile-Files"],
 )
 
+# リクエストの処理時間とSQLの実行回数・時間の計測
+install_query_hooks(engine.sync_engine)
+app.add_middleware(MetricsMiddleware)
+
+# X-Profile ヘッダーによるリクエスト単位のプロファイリング（無効時はミドルウェア自体を登録しない）
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
 # APIルーターの登録
 app.include_router(api_router, prefix=API_V1_STR)
 
@@ -37,6 +77,30 @@ async def health_check() -> Dict[str, str]:
     """
     return {"status": "healthy"}
 
+@app.get("/health/db", response_model=Dict[str, Any])
+async def database_pool_status() -> Dict[str, Any]:
+    """
+    コネクションプールの統計情報
+    """
+    return get_pool_status()
+
+@app.get("/health/serialization", response_model=Dict[str, Any])
+async def serialization_timing() -> Dict[str, Any]:
+    """
+    エンドポイントごとのシリアライズ時間（レスポンスモデルの検証とJSON変換）の統計
+    """
+    return serialization_stats.snapshot()
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """
+    Prometheus形式のメトリクス（ルートごとの処理時間・SQLの実行回数/時間）
+    """
+    return PlainTextResponse(
+        metrics_registry.render(),
+        media_type="text/plain; version=0.0.4"
+    )
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """
@@ -1,6 +1,9 @@
-from app.models.base import Base
+from app.database import Base
+from app.models.base import AssessmentStatus, TimestampMixin, GUID, generate_uuid
 from app.models.assessment import Patient, Assessment, Question, Option
 from app.models.result import AssessmentResult, AnswerDetail
+from app.models.statistics import AssessmentStatisticsRollup, AssessmentScoreBucket
+from app.models.sync import SyncOperation
 
 __all__ = [
     "Base",
@@ -13,5 +16,8 @@ __all__ = [
     "Question",
     "Option",
     "AssessmentResult",
-    "AnswerDetail"
+    "AnswerDetail",
+    "AssessmentStatisticsRollup",
+    "AssessmentScoreBucket",
+    "SyncOperation"
 ]
\ No newline at end of file
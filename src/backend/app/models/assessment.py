@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, Text
+from sqlalchemy import Column, String, Integer, ForeignKey, Text, Index, JSON
 from sqlalchemy.orm import relationship
 from app.database import Base
 from app.models.base import GUID, TimestampMixin, generate_uuid, AssessmentStatus
@@ -7,6 +7,10 @@ from typing import List
 class Patient(Base, TimestampMixin):
     """患者モデル"""
     __tablename__ = "patients"
+    __table_args__ = (
+        # カーソルページネーション（作成日時の新しい順）
+        Index("ix_patients_created_at_id", "created_at", "id"),
+    )
 
     id = Column(GUID, primary_key=True, default=generate_uuid)
     name = Column(String(100), nullable=False)
@@ -20,6 +24,9 @@ class Patient(Base, TimestampMixin):
 class Assessment(Base, TimestampMixin):
     """検査マスターモデル"""
     __tablename__ = "assessments"
+    __table_args__ = (
+        Index("ix_assessments_type", "type"),
+    )
 
     id = Column(GUID, primary_key=True, default=generate_uuid)
     name = Column(String(100), nullable=False)
@@ -27,6 +34,8 @@ class Assessment(Base, TimestampMixin):
     description = Column(Text, nullable=True)
     cutoff = Column(Integer, nullable=False)
     max_score = Column(Integer, nullable=False)
+    scoring_config = Column(JSON, nullable=True)  # 逆転項目・重み・下位尺度の設定
+    severity_bands = Column(JSON, nullable=True)  # 重症度区分（ラベルと下限スコア）
     
     # リレーションシップ
     questions = relationship("Question", back_populates="assessment", cascade="all, delete-orphan")
@@ -39,6 +48,9 @@ class Assessment(Base, TimestampMixin):
 class Question(Base):
     """質問モデル"""
     __tablename__ = "questions"
+    __table_args__ = (
+        Index("ix_questions_assessment_id_order", "assessment_id", "order"),
+    )
 
     id = Column(GUID, primary_key=True, default=generate_uuid)
     assessment_id = Column(GUID, ForeignKey("assessments.id"), nullable=False)
@@ -55,6 +67,9 @@ class Question(Base):
 class Option(Base):
     """選択肢モデル"""
     __tablename__ = "options"
+    __table_args__ = (
+        Index("ix_options_assessment_id_order", "assessment_id", "order"),
+    )
 
     id = Column(GUID, primary_key=True, default=generate_uuid)
     assessment_id = Column(GUID, ForeignKey("assessments.id"), nullable=False)
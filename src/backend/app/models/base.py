@@ -2,6 +2,7 @@ from sqlalchemy import Column, DateTime
 from sqlalchemy.sql import func
 from enum import Enum as PyEnum
 from uuid import uuid4
+from datetime import datetime, timezone
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.types import TypeDecorator, CHAR
 import uuid
@@ -42,13 +43,25 @@ class GUID(TypeDecorator):
                 value = uuid.UUID(value)
             return value
 
+def utc_now() -> datetime:
+    """現在時刻（UTC）"""
+    return datetime.now(timezone.utc)
+
 class TimestampMixin:
     """タイムスタンプミックスイン"""
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # カーソルページネーションで比較できるよう、アプリ側でマイクロ秒まで設定する
+    created_at = Column(
+        DateTime(timezone=True),
+        default=utc_now,
+        server_default=func.now(),
+        nullable=False
+    )
+    # ETag・Last-Modified の算出に使うため、更新時もアプリ側でマイクロ秒まで設定する
     updated_at = Column(
         DateTime(timezone=True),
+        default=utc_now,
         server_default=func.now(),
-        onupdate=func.now(),
+        onupdate=utc_now,
         nullable=False
     )
 
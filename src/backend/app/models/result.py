@@ -1,17 +1,39 @@
-from sqlalchemy import Column, ForeignKey, Integer, DateTime, Enum
+from sqlalchemy import Column, ForeignKey, Integer, DateTime, Enum, Index, JSON
 from sqlalchemy.orm import relationship
 from app.database import Base
-from app.models.base import GUID, TimestampMixin, generate_uuid, AssessmentStatus
-from datetime import datetime
+from app.models.base import GUID, TimestampMixin, generate_uuid, utc_now, AssessmentStatus
 
 class AssessmentResult(Base, TimestampMixin):
     """検査結果モデル"""
     __tablename__ = "assessment_results"
+    __table_args__ = (
+        # トレンド・完了済み一覧（患者・状態で絞り込み完了日時で並べる）
+        Index(
+            "ix_assessment_results_patient_status_completed",
+            "patient_id",
+            "status",
+            "completed_at"
+        ),
+        # 進行中の検査（患者で絞り込み作成日時で並べる）
+        Index(
+            "ix_assessment_results_patient_created",
+            "patient_id",
+            "created_at"
+        ),
+        # 検査ごとの統計（スコアまで含めてインデックスのみで集計）
+        Index(
+            "ix_assessment_results_assessment_status_score",
+            "assessment_id",
+            "status",
+            "total_score"
+        ),
+    )
 
     id = Column(GUID, primary_key=True, default=generate_uuid)
     patient_id = Column(GUID, ForeignKey("patients.id"), nullable=False)
     assessment_id = Column(GUID, ForeignKey("assessments.id"), nullable=False)
     total_score = Column(Integer, nullable=True)  # 完了時に計算
+    subscale_scores = Column(JSON, nullable=True)  # 下位尺度ごとのスコア（完了時に計算）
     status = Column(
         Enum(AssessmentStatus),
         nullable=False,
@@ -43,24 +65,20 @@ class AssessmentResult(Base, TimestampMixin):
         """検査を開始する"""
         if self.status == AssessmentStatus.NOT_STARTED:
             self.status = AssessmentStatus.IN_PROGRESS
-            self.started_at = datetime.now()
-
-    def complete(self) -> None:
-        """検査を完了する"""
-        if self.status == AssessmentStatus.IN_PROGRESS:
-            self.status = AssessmentStatus.COMPLETED
-            self.completed_at = datetime.now()
-            self.calculate_total_score()
-
-    def calculate_total_score(self) -> None:
-        """合計スコアを計算する"""
-        self.total_score = sum(
-            answer.value for answer in self.answer_details
-        )
+            self.started_at = utc_now()
 
 class AnswerDetail(Base, TimestampMixin):
     """回答詳細モデル"""
     __tablename__ = "answer_details"
+    __table_args__ = (
+        # 1つの検査結果につき質問ごとに1回答（再回答は上書き）
+        Index(
+            "uq_answer_details_result_question",
+            "result_id",
+            "question_id",
+            unique=True
+        ),
+    )
 
     id = Column(GUID, primary_key=True, default=generate_uuid)
     result_id = Column(GUID, ForeignKey("assessment_results.id"), nullable=False)
@@ -70,7 +88,7 @@ class AnswerDetail(Base, TimestampMixin):
     answered_at = Column(
         DateTime(timezone=True),
         nullable=False,
-        default=datetime.now
+        default=utc_now
     )
 
     # リレーションシップ
@@ -0,0 +1,52 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer
+from app.database import Base
+from app.models.base import GUID, utc_now
+
+class AssessmentStatisticsRollup(Base):
+    """
+    検査ごとの統計情報の集計テーブル
+
+    検査結果の作成・完了と同じトランザクションで差分更新する（再構築は管理コマンドで行う）
+    """
+    __tablename__ = "assessment_statistics"
+
+    assessment_id = Column(
+        GUID,
+        ForeignKey("assessments.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    total_results = Column(BigInteger, nullable=False, default=0)  # 全ステータスの結果件数
+    completed_count = Column(BigInteger, nullable=False, default=0)  # 完了件数
+    scored_count = Column(BigInteger, nullable=False, default=0)  # 完了かつ採点済みの件数
+    score_sum = Column(BigInteger, nullable=False, default=0)
+    score_sum_squares = Column(BigInteger, nullable=False, default=0)
+    min_score = Column(Integer, nullable=True)
+    max_score = Column(Integer, nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=utc_now)
+
+    def __repr__(self) -> str:
+        return (
+            f"<AssessmentStatisticsRollup("
+            f"assessment_id={self.assessment_id}, "
+            f"completed_count={self.completed_count})>"
+        )
+
+class AssessmentScoreBucket(Base):
+    """検査ごとのスコアの度数（完了済み結果のヒストグラム）"""
+    __tablename__ = "assessment_score_buckets"
+
+    assessment_id = Column(
+        GUID,
+        ForeignKey("assessments.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    score = Column(Integer, primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return (
+            f"<AssessmentScoreBucket("
+            f"assessment_id={self.assessment_id}, "
+            f"score={self.score}, "
+            f"count={self.count})>"
+        )
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String
+from app.database import Base
+from app.models.base import GUID, utc_now
+
+class SyncOperation(Base):
+    """
+    同期エンドポイントで適用済みの操作（冪等キーによる再送の重複排除）
+
+    操作の適用と同じセーブポイント内で記録するため、記録がある操作は必ず適用済み
+    """
+    __tablename__ = "sync_operations"
+    __table_args__ = (
+        Index("ix_sync_operations_result_id", "result_id"),
+    )
+
+    idempotency_key = Column(String(100), primary_key=True)  # クライアントが生成する操作ID
+    device_id = Column(String(100), nullable=True)
+    result_id = Column(
+        GUID,
+        ForeignKey("assessment_results.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    operation = Column(String(20), nullable=False)  # start / answer / complete
+    client_timestamp = Column(DateTime(timezone=True), nullable=False)
+    applied_at = Column(DateTime(timezone=True), nullable=False, default=utc_now)
+
+    def __repr__(self) -> str:
+        return (
+            f"<SyncOperation("
+            f"idempotency_key={self.idempotency_key}, "
+            f"operation={self.operation}, "
+            f"result_id={self.result_id})>"
+        )
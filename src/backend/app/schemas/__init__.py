@@ -10,15 +10,20 @@ from app.schemas.assessment import (
     PatientCreate,
     PatientUpdate,
     PatientResponse,
+    ScoringConfig,
+    SeverityBand,
     AssessmentCreate,
     AssessmentUpdate,
     AssessmentResponse,
+    AssessmentListItem,
     QuestionCreate,
     QuestionUpdate,
     QuestionResponse,
     OptionCreate,
     OptionUpdate,
-    OptionResponse
+    OptionResponse,
+    ScoreFrequency,
+    AssessmentStatistics
 )
 from app.schemas.result import (
     AssessmentResultCreate,
@@ -27,11 +32,25 @@ from app.schemas.result import (
     AnswerDetailCreate,
     AnswerDetailUpdate,
     AnswerDetailResponse,
+    AnswerItem,
+    AnswerBatchCreate,
+    AnswerBatchAck,
     AssessmentSummary,
     PatientAssessmentSummary,
     DetailedAssessmentResult,
     GraphDataPoint,
-    AssessmentGraphData
+    ReliableChange,
+    AssessmentGraphData,
+    DashboardInstrument,
+    PatientDashboard,
+    ResultProgress,
+    ResultEvent
+)
+from app.schemas.sync import (
+    SyncOperationCreate,
+    SyncRequest,
+    SyncOperationResult,
+    SyncResponse
 )
 
 __all__ = [
@@ -47,15 +66,20 @@ __all__ = [
     "PatientCreate",
     "PatientUpdate",
     "PatientResponse",
+    "ScoringConfig",
+    "SeverityBand",
     "AssessmentCreate",
     "AssessmentUpdate",
     "AssessmentResponse",
+    "AssessmentListItem",
     "QuestionCreate",
     "QuestionUpdate",
     "QuestionResponse",
     "OptionCreate",
     "OptionUpdate",
     "OptionResponse",
+    "ScoreFrequency",
+    "AssessmentStatistics",
     
     # Result schemas
     "AssessmentResultCreate",
@@ -64,9 +88,23 @@ __all__ = [
     "AnswerDetailCreate",
     "AnswerDetailUpdate",
     "AnswerDetailResponse",
+    "AnswerItem",
+    "AnswerBatchCreate",
+    "AnswerBatchAck",
     "AssessmentSummary",
     "PatientAssessmentSummary",
     "DetailedAssessmentResult",
     "GraphDataPoint",
-    "AssessmentGraphData"
+    "ReliableChange",
+    "AssessmentGraphData",
+    "DashboardInstrument",
+    "PatientDashboard",
+    "ResultProgress",
+    "ResultEvent",
+
+    # Sync schemas
+    "SyncOperationCreate",
+    "SyncRequest",
+    "SyncOperationResult",
+    "SyncResponse"
 ]
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from uuid import UUID
 from app.models.base import AssessmentStatus
@@ -27,6 +27,20 @@ class PatientResponse(PatientBase, BaseResponseSchema, TimestampSchema):
     """患者レスポース用スキーマ"""
     pass
 
+# 採点設定スキーマ（項目は質問の表示順序で指定する）
+class ScoringConfig(BaseModel):
+    """検査ごとの採点設定スキーマ"""
+    reverse_items: List[int] = Field(default_factory=list)  # 逆転項目
+    weights: Dict[int, float] = Field(default_factory=dict)  # 項目の重み（未指定は1）
+    subscales: Dict[str, List[int]] = Field(default_factory=dict)  # 下位尺度と所属項目
+    reverse_offset: Optional[int] = None  # 逆転の基準値（未指定は選択肢の最小値+最大値）
+
+# 重症度区分スキーマ（例: PHQ-9は 0/5/10/15/20 を下限とする5区分）
+class SeverityBand(BaseModel):
+    """重症度区分スキーマ"""
+    label: str = Field(..., min_length=1)
+    min_score: float  # この区分の下限スコア（以上）
+
 # Assessment スキーマ
 class AssessmentBase(BaseModel):
     """検査の基本情報スキーマ"""
@@ -35,6 +49,8 @@ class AssessmentBase(BaseModel):
     description: Optional[str] = None
     cutoff: int = Field(..., ge=0)
     max_score: int = Field(..., ge=0)
+    scoring_config: Optional[ScoringConfig] = None
+    severity_bands: Optional[List[SeverityBand]] = None
 
 class AssessmentCreate(AssessmentBase, BaseCreateSchema):
     """検査作成用スキーマ"""
@@ -48,12 +64,18 @@ class AssessmentUpdate(BaseUpdateSchema):
     description: Optional[str] = None
     cutoff: Optional[int] = Field(None, ge=0)
     max_score: Optional[int] = Field(None, ge=0)
+    scoring_config: Optional[ScoringConfig] = None
+    severity_bands: Optional[List[SeverityBand]] = None
 
 class AssessmentResponse(AssessmentBase, BaseResponseSchema, TimestampSchema):
     """検査レスポンス用スキーマ"""
     questions: List["QuestionResponse"]
     options: List["OptionResponse"]
 
+class AssessmentListItem(AssessmentBase, BaseResponseSchema, TimestampSchema):
+    """検査一覧用スキーマ（質問・選択肢を含まない）"""
+    pass
+
 # Question スキーマ
 class QuestionBase(BaseModel):
     """質問の基本情報スキーマ"""
@@ -94,6 +116,23 @@ class OptionResponse(OptionBase, BaseResponseSchema):
     """選択肢レスポンス用スキーマ"""
     assessment_id: UUID
 
+# 統計情報スキーマ
+class ScoreFrequency(BaseModel):
+    """スコアごとの完了件数（ヒストグラム）"""
+    score: int
+    count: int
+
+class AssessmentStatistics(BaseModel):
+    """検査の統計情報スキーマ"""
+    total_attempts: int  # 完了件数
+    average_score: float
+    min_score: Optional[int] = None
+    max_score: Optional[int] = None
+    median_score: Optional[float] = None
+    std_score: Optional[float] = None  # 母標準偏差
+    completion_rate: float  # 完了率（%）
+    histogram: List[ScoreFrequency] = []
+
 # 循環参照を解決するための更新
 AssessmentCreate.model_rebuild()
 AssessmentResponse.model_rebuild()
\ No newline at end of file
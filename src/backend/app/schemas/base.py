@@ -32,6 +32,31 @@ class PaginatedResponse(BaseModel):
     items: list
     has_next: bool
     has_prev: bool
+    total_estimated: bool = False  # 大規模テーブルで総件数が推定値の場合True
+    next_cursor: Optional[str] = None  # カーソルページネーション時の次ページ
+
+    @classmethod
+    def build(
+        cls,
+        *,
+        items: list,
+        total: int,
+        skip: int,
+        limit: int,
+        total_estimated: bool = False
+    ) -> "PaginatedResponse":
+        """
+        総件数からページ情報を組み立てる
+        """
+        return cls(
+            total=total,
+            page=skip // limit + 1 if limit > 0 else 1,
+            per_page=limit,
+            items=items,
+            has_next=bool(items) and skip + len(items) < total,
+            has_prev=skip > 0,
+            total_estimated=total_estimated
+        )
 
 class ErrorResponse(BaseModel):
     """エラーレスポンススキーマ"""
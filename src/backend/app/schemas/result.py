@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from uuid import UUID
 from app.models.base import AssessmentStatus
@@ -31,6 +31,8 @@ class AssessmentResultResponse(AssessmentResultBase, BaseResponseSchema, Timesta
     """検査結果レスポンス用スキーマ"""
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    subscale_scores: Optional[Dict[str, float]] = None  # 下位尺度ごとのスコア
+    severity_level: Optional[str] = None  # 一覧表示用の重症度レベル
     answer_details: List["AnswerDetailResponse"] = []
 
 # AnswerDetail スキーマ
@@ -44,6 +46,20 @@ class AnswerDetailCreate(AnswerDetailBase, BaseCreateSchema):
     """回答詳細作成用スキーマ"""
     result_id: UUID
 
+class AnswerItem(AnswerDetailBase, BaseCreateSchema):
+    """一括回答用の回答スキーマ（検査結果IDはパスで指定）"""
+    pass
+
+class AnswerBatchCreate(BaseCreateSchema):
+    """回答一括登録用スキーマ"""
+    answers: List[AnswerItem] = Field(..., min_length=1)
+
+class AnswerBatchAck(BaseModel):
+    """回答一括登録の受付結果スキーマ"""
+    result_id: UUID
+    accepted: int
+    answered_at: datetime
+
 class AnswerDetailUpdate(BaseUpdateSchema):
     """回答詳細更新用スキーマ"""
     selected_option_id: Optional[UUID] = None
@@ -91,13 +107,68 @@ class GraphDataPoint(BaseModel):
     value: float
     label: Optional[str] = None
 
+class ReliableChange(BaseModel):
+    """信頼性のある変化（Reliable Change Index）スキーマ"""
+    baseline: float  # 最初のスコア
+    latest: float  # 最新のスコア
+    change: float  # 最新 - 最初
+    index: float  # RCI = 変化量 / 差の標準誤差
+    significant: bool  # |RCI| >= 1.96
+    direction: str  # improved / deteriorated / no_reliable_change
+
 class AssessmentGraphData(BaseModel):
     """検査グラフデータスキーマ"""
     assessment_type: str
     data_points: List[GraphDataPoint]
-    trend_line: List[float]
+    trend_line: List[float]  # 回帰直線上の値（データポイントごと）
     cutoff_line: float
     average_line: float
+    moving_average: List[float] = []  # 移動平均（データポイントごと）
+    slope_per_day: Optional[float] = None  # 回帰直線の傾き（1日あたりのスコア変化）
+    reliable_change: Optional[ReliableChange] = None
+
+# ダッシュボード用スキーマ
+class DashboardInstrument(BaseModel):
+    """ダッシュボードの検査ごとの表示データスキーマ"""
+    assessment_id: UUID
+    assessment_name: str
+    assessment_type: str
+    cutoff: int
+    max_score: int
+    data_points: List[GraphDataPoint]  # 完了日時の昇順
+    result_count: int
+    latest_score: Optional[int] = None
+    latest_completed_at: Optional[datetime] = None
+    is_above_cutoff: Optional[bool] = None  # 結果が無い場合はNone
+    severity_level: Optional[str] = None
+
+class PatientDashboard(BaseModel):
+    """患者の全検査の一覧表示（ダッシュボード）スキーマ"""
+    patient_id: UUID
+    instruments: List[DashboardInstrument]
+    last_assessment_date: Optional[datetime] = None
+
+# 進捗表示用スキーマ
+class ResultProgress(BaseModel):
+    """検査の回答進捗スキーマ"""
+    result_id: UUID
+    assessment_id: UUID
+    status: AssessmentStatus
+    answered_count: int
+    question_count: int
+    started_at: Optional[datetime] = None
+
+# リアルタイム通知用スキーマ
+class ResultEvent(BaseModel):
+    """検査結果の通知イベントスキーマ"""
+    event: str  # start_assessment / answer_progress / complete_assessment
+    result_id: UUID
+    patient_id: UUID
+    assessment_id: UUID
+    status: AssessmentStatus
+    answered_count: Optional[int] = None  # 回答済みの質問数（answer_progress）
+    total_score: Optional[int] = None  # 合計スコア（complete_assessment）
+    occurred_at: datetime
 
 # 循環参照を解決するための更新
 AssessmentResultResponse.model_rebuild()
\ No newline at end of file
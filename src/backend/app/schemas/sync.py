@@ -0,0 +1,44 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal, Optional
+from datetime import datetime
+from uuid import UUID
+from app.schemas.base import BaseCreateSchema
+from app.schemas.result import AnswerItem
+
+# 1回の同期で受け付ける操作数の上限
+SYNC_MAX_OPERATIONS = 500
+
+# 同期スキーマ
+class SyncOperationCreate(BaseCreateSchema):
+    """同期する操作スキーマ（オフライン中にクライアントでキューに積まれた操作）"""
+    op_id: str = Field(..., min_length=1, max_length=100)  # 冪等キー（再送時も同じ値）
+    type: Literal["start", "answer", "complete"]
+    result_id: UUID
+    client_timestamp: datetime  # クライアントで操作した日時（タイムゾーンの無い場合はUTCとみなす）
+    answers: Optional[List[AnswerItem]] = None  # type=answer の場合の回答
+
+    @model_validator(mode="after")
+    def check_answers(self) -> "SyncOperationCreate":
+        if self.type == "answer" and not self.answers:
+            raise ValueError("answer操作には回答が必要です")
+        return self
+
+class SyncRequest(BaseCreateSchema):
+    """同期リクエストスキーマ"""
+    device_id: Optional[str] = Field(None, max_length=100)
+    operations: List[SyncOperationCreate] = Field(..., min_length=1, max_length=SYNC_MAX_OPERATIONS)
+
+class SyncOperationResult(BaseModel):
+    """操作ごとの同期結果スキーマ"""
+    op_id: str
+    status: Literal["applied", "duplicate", "rejected"]
+    code: int  # HTTPのステータスコード相当
+    detail: Optional[str] = None
+
+class SyncResponse(BaseModel):
+    """同期レスポンススキーマ"""
+    applied: int
+    duplicates: int
+    rejected: int
+    server_time: datetime
+    results: List[SyncOperationResult]
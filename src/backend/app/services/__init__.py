@@ -0,0 +1,28 @@
+from app.services.scoring import CompiledScoring, ScoringEngine, compile_scoring, scoring_engine
+from app.services.severity import (
+    CompiledSeverity,
+    SeverityClassifier,
+    compile_severity,
+    default_bands,
+    severity_classifier
+)
+from app.services.statistics import ScoreDistribution, StatisticsCache, statistics_cache
+from app.services.trend import TrendCache, compute_trend, trend_cache
+
+__all__ = [
+    "CompiledScoring",
+    "ScoringEngine",
+    "compile_scoring",
+    "scoring_engine",
+    "CompiledSeverity",
+    "SeverityClassifier",
+    "compile_severity",
+    "default_bands",
+    "severity_classifier",
+    "ScoreDistribution",
+    "StatisticsCache",
+    "statistics_cache",
+    "TrendCache",
+    "compute_trend",
+    "trend_cache"
+]
@@ -0,0 +1,209 @@
+"""
+検査結果のリアルタイム通知
+
+イベントはチャネル（全体・患者・検査結果）ごとに配信する。プロセス内ではasyncioの
+キューで購読者に分配し、プロセス間の共有はバックエンド（EVENTS_BACKEND）で切り替える。
+
+    memory: 単一プロセス内のみ（既定）
+    redis:  Redis Pub/Sub で複数ワーカー間に配信（redis パッケージと EVENTS_REDIS_URL が必要）
+"""
+import asyncio
+import logging
+import os
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
+from uuid import UUID
+
+from app.schemas.result import ResultEvent
+
+logger = logging.getLogger(__name__)
+
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "memory")
+EVENTS_REDIS_URL = os.getenv("EVENTS_REDIS_URL", "redis://localhost:6379/0")
+EVENTS_CHANNEL_PREFIX = os.getenv("EVENTS_CHANNEL_PREFIX", "scale_app:events:")
+# 購読者ごとのキューの上限（超えた場合は古いイベントから破棄する）
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+
+ALL_RESULTS_CHANNEL = "results"
+
+def patient_channel(patient_id: UUID) -> str:
+    return f"patient:{patient_id}"
+
+def result_channel(result_id: UUID) -> str:
+    return f"result:{result_id}"
+
+def event_channels(event: ResultEvent) -> List[str]:
+    """
+    イベントの配信先チャネル
+    """
+    return [
+        ALL_RESULTS_CHANNEL,
+        patient_channel(event.patient_id),
+        result_channel(event.result_id),
+    ]
+
+Deliver = Callable[[str, str], Awaitable[None]]
+
+class EventBackend(ABC):
+    """
+    イベントの配送バックエンド
+
+    publish されたメッセージを（自プロセスを含む）全プロセスの deliver に届ける
+    """
+    # 他プロセスの購読者に届くか（Falseの場合は自プロセスに購読者がいなければ発行を省略できる）
+    shared = False
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    @abstractmethod
+    async def publish(self, channels: List[str], message: str) -> None:
+        """
+        全プロセスの購読者へのメッセージの発行
+        """
+
+    async def stop(self) -> None:
+        pass
+
+class InMemoryBackend(EventBackend):
+    """単一プロセス内の配送"""
+    async def publish(self, channels: List[str], message: str) -> None:
+        for channel in channels:
+            await self._deliver(channel, message)
+
+class RedisBackend(EventBackend):
+    """
+    Redis Pub/Sub による複数ワーカー間の配送
+
+    自プロセスのイベントもRedis経由で受け取るため、どのワーカーに接続した購読者にも同じ順序で届く
+    """
+    shared = True
+
+    def __init__(self, url: str = EVENTS_REDIS_URL, prefix: str = EVENTS_CHANNEL_PREFIX) -> None:
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError(
+                "EVENTS_BACKEND=redis には redis パッケージが必要です（pip install redis）"
+            ) from e
+        self._client = redis.from_url(url)
+        self._prefix = prefix
+        self._pubsub = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, deliver: Deliver) -> None:
+        await super().start(deliver)
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.psubscribe(f"{self._prefix}*")
+        self._task = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        async for message in self._pubsub.listen():
+            channel = message["channel"]
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            data = message["data"]
+            if isinstance(data, bytes):
+                data = data.decode()
+            await self._deliver(channel[len(self._prefix):], data)
+
+    async def publish(self, channels: List[str], message: str) -> None:
+        async with self._client.pipeline(transaction=False) as pipe:
+            for channel in channels:
+                pipe.publish(f"{self._prefix}{channel}", message)
+            await pipe.execute()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        if self._pubsub is not None:
+            await self._pubsub.close()
+        await self._client.close()
+
+def create_backend(name: str = EVENTS_BACKEND) -> EventBackend:
+    backends: Dict[str, Callable[[], EventBackend]] = {
+        "memory": InMemoryBackend,
+        "redis": RedisBackend,
+    }
+    if name not in backends:
+        raise ValueError(f"未対応のイベントバックエンドです: {name}")
+    return backends[name]()
+
+class EventBroker:
+    """
+    チャネルごとの購読者キューへのファンアウト
+
+    配信は put_nowait のみで行い、遅い購読者が発行側（APIリクエスト）を待たせないようにする
+    """
+    def __init__(self, backend: Optional[EventBackend] = None) -> None:
+        self._backend = backend
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._started = False
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    @property
+    def has_subscribers(self) -> bool:
+        """
+        イベントを受け取る購読者がいる可能性があるか（イベント作成のクエリを省略する判定に使う）
+        """
+        if self._backend is not None and self._backend.shared:
+            return True
+        return bool(self._subscribers)
+
+    async def start(self) -> None:
+        if self._started:
+            return
+        if self._backend is None:
+            self._backend = create_backend()
+        await self._backend.start(self._dispatch)
+        self._started = True
+
+    async def stop(self) -> None:
+        if self._started:
+            await self._backend.stop()
+            self._started = False
+
+    async def _dispatch(self, channel: str, message: str) -> None:
+        for queue in list(self._subscribers.get(channel, ())):
+            if queue.full():
+                # 最も古いイベントを破棄して最新の状態を優先する
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+    async def publish(self, event: ResultEvent) -> None:
+        """
+        イベントの発行（配信の失敗はAPIの処理に影響させない）
+        """
+        if not self._started:
+            await self.start()
+        try:
+            await self._backend.publish(event_channels(event), event.model_dump_json())
+        except Exception:
+            logger.exception("イベントの発行に失敗しました: %s", event.event)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[asyncio.Queue]:
+        """
+        チャネルの購読（JSON文字列のイベントがキューに届く）
+
+        イベントは全体・患者・検査結果の各チャネルに発行されるため、購読は1チャネルに限る
+        """
+        if not self._started:
+            await self.start()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=EVENTS_QUEUE_SIZE)
+        self._subscribers.setdefault(channel, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(channel)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[channel]
+
+# プロセス共通のイベントブローカー
+event_broker = EventBroker()
@@ -0,0 +1,269 @@
+"""
+リクエストとSQLの計測
+
+ルートごとの処理時間・SQLの実行回数/時間をプロセス内で集計し、Prometheusのテキスト形式で出力する。
+SQLの計測はエンジンのイベントで行い、実行中のリクエストの集計（コンテキスト変数）に加算する。
+"""
+import logging
+import os
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+def _env_buckets(name: str, default: str) -> Tuple[float, ...]:
+    return tuple(sorted(float(value) for value in os.getenv(name, default).split(",")))
+
+# 処理時間のヒストグラムの区切り（秒）
+METRICS_LATENCY_BUCKETS = _env_buckets(
+    "METRICS_LATENCY_BUCKETS",
+    "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10"
+)
+# SSE・WebSocketの接続時間のヒストグラムの区切り（秒）
+METRICS_STREAM_BUCKETS = _env_buckets("METRICS_STREAM_BUCKETS", "1,10,60,300,900,1800,3600")
+# リクエストあたりのSQL実行回数のヒストグラムの区切り
+METRICS_QUERY_BUCKETS = _env_buckets("METRICS_QUERY_BUCKETS", "1,2,3,5,10,20,50,100")
+# この回数を超えるSQLを実行したリクエストを警告する（N+1の検出用、0で無効）
+METRICS_QUERY_WARN_THRESHOLD = int(os.getenv("METRICS_QUERY_WARN_THRESHOLD", "10"))
+
+METRICS_PREFIX = "scale_app_"
+
+@dataclass
+class RequestMetrics:
+    """
+    1リクエスト内のSQLの実行回数と合計時間
+    """
+    queries: int = 0
+    db_seconds: float = 0.0
+
+_current_request: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "current_request_metrics",
+    default=None
+)
+
+def start_request() -> Tuple[RequestMetrics, object]:
+    """
+    リクエストの計測の開始（戻り値のトークンを end_request に渡す）
+    """
+    metrics = RequestMetrics()
+    return metrics, _current_request.set(metrics)
+
+def end_request(token: object) -> None:
+    _current_request.reset(token)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+class _Histogram:
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts: Dict[Labels, List[int]] = {}
+        self.sums: Dict[Labels, float] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        counts = self.counts.get(labels)
+        if counts is None:
+            # 最後の要素は +Inf
+            counts = self.counts[labels] = [0] * (len(self.buckets) + 1)
+            self.sums[labels] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self.sums[labels] += value
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class MetricsRegistry:
+    """
+    プロセス内のメトリクスの集計
+    """
+    def __init__(
+        self,
+        latency_buckets: Sequence[float] = METRICS_LATENCY_BUCKETS,
+        query_buckets: Sequence[float] = METRICS_QUERY_BUCKETS,
+        query_warn_threshold: int = METRICS_QUERY_WARN_THRESHOLD,
+        stream_buckets: Sequence[float] = METRICS_STREAM_BUCKETS
+    ) -> None:
+        self._lock = Lock()
+        self.query_warn_threshold = query_warn_threshold
+        self._requests: Dict[Labels, int] = {}
+        self._latency = _Histogram(latency_buckets)
+        self._queries = _Histogram(query_buckets)
+        self._db_seconds: Dict[Labels, float] = {}
+        self._flagged: Dict[Labels, int] = {}
+        # SSE・WebSocketの接続（処理時間に含めると分布が歪むため別に集計する）
+        self._streams: Dict[Labels, int] = {}
+        self._stream_duration = _Histogram(stream_buckets)
+        self._total_queries = 0
+        self._total_db_seconds = 0.0
+
+    def record_query(self, seconds: float) -> None:
+        """
+        SQLの実行の記録（リクエスト外の実行を含む全体の集計）
+        """
+        with self._lock:
+            self._total_queries += 1
+            self._total_db_seconds += seconds
+
+    def record_request(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        seconds: float,
+        metrics: RequestMetrics
+    ) -> bool:
+        """
+        リクエストの記録（SQLの実行回数が閾値を超えた場合はTrueを返す）
+        """
+        labels: Labels = (("method", method), ("route", route))
+        flagged = 0 < self.query_warn_threshold < metrics.queries
+        with self._lock:
+            key = labels + (("status", str(status_code)),)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            self._latency.observe(labels, seconds)
+            self._queries.observe(labels, metrics.queries)
+            self._db_seconds[labels] = self._db_seconds.get(labels, 0.0) + metrics.db_seconds
+            if flagged:
+                self._flagged[labels] = self._flagged.get(labels, 0) + 1
+        if flagged:
+            logger.warning(
+                "SQLの実行回数が多いリクエストです（N+1の可能性）: %s %s queries=%d db=%.1fms",
+                method,
+                route,
+                metrics.queries,
+                metrics.db_seconds * 1000
+            )
+        return flagged
+
+    def record_stream(self, protocol: str, route: str, seconds: float) -> None:
+        """
+        SSE・WebSocketの接続の記録（接続時間はリクエストの処理時間とは別に集計する）
+        """
+        labels: Labels = (("protocol", protocol), ("route", route))
+        with self._lock:
+            self._streams[labels] = self._streams.get(labels, 0) + 1
+            self._stream_duration.observe(labels, seconds)
+
+    def render(self) -> str:
+        """
+        Prometheusのテキスト形式（version 0.0.4）での出力
+        """
+        lines: List[str] = []
+
+        def header(name: str, kind: str, help_text: str) -> str:
+            lines.append(f"# HELP {METRICS_PREFIX}{name} {help_text}")
+            lines.append(f"# TYPE {METRICS_PREFIX}{name} {kind}")
+            return METRICS_PREFIX + name
+
+        def samples(name: str, values: Dict[Labels, float]) -> None:
+            for labels, value in sorted(values.items()):
+                lines.append(f"{name}{_format_labels(labels)} {_format_number(value)}")
+
+        def histogram(name: str, data: _Histogram) -> None:
+            for labels, counts in sorted(data.counts.items()):
+                cumulative = 0
+                for bound, count in zip(data.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else _format_number(float(bound))
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', le))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_number(data.sums[labels])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+
+        with self._lock:
+            samples(header("http_requests_total", "counter", "HTTPリクエスト数"), self._requests)
+            histogram(
+                header("http_request_duration_seconds", "histogram", "HTTPリクエストの処理時間"),
+                self._latency
+            )
+            histogram(
+                header("http_request_db_queries", "histogram", "リクエストあたりのSQL実行回数"),
+                self._queries
+            )
+            samples(
+                header("http_request_db_seconds_total", "counter", "リクエスト内のSQL実行時間の合計"),
+                self._db_seconds
+            )
+            samples(
+                header(
+                    "http_requests_query_threshold_exceeded_total",
+                    "counter",
+                    "SQL実行回数が閾値を超えたリクエスト数"
+                ),
+                self._flagged
+            )
+            samples(
+                header("stream_connections_total", "counter", "終了したSSE・WebSocketの接続数"),
+                self._streams
+            )
+            histogram(
+                header("stream_duration_seconds", "histogram", "SSE・WebSocketの接続時間"),
+                self._stream_duration
+            )
+            samples(header("db_queries_total", "counter", "SQL実行回数"), {(): self._total_queries})
+            samples(
+                header("db_query_seconds_total", "counter", "SQL実行時間の合計"),
+                {(): self._total_db_seconds}
+            )
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._requests.clear()
+            self._latency = _Histogram(self._latency.buckets)
+            self._queries = _Histogram(self._queries.buckets)
+            self._db_seconds.clear()
+            self._flagged.clear()
+            self._streams.clear()
+            self._stream_duration = _Histogram(self._stream_duration.buckets)
+            self._total_queries = 0
+            self._total_db_seconds = 0.0
+
+# プロセス共通のメトリクス
+metrics_registry = MetricsRegistry()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    _finish_query(conn)
+
+def _handle_error(exception_context) -> None:
+    if exception_context.connection is not None:
+        _finish_query(exception_context.connection)
+
+def _finish_query(conn) -> None:
+    started = conn.info.get("query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    metrics_registry.record_query(elapsed)
+    # 非同期エンジンのイベントはリクエストと同じコンテキストで呼ばれる
+    current = _current_request.get()
+    if current is not None:
+        current.queries += 1
+        current.db_seconds += elapsed
+
+def install_query_hooks(engine: Engine) -> None:
+    """
+    SQLの実行回数・時間を計測するイベントの登録（非同期エンジンは sync_engine を渡す）
+    """
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
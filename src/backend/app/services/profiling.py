@@ -0,0 +1,140 @@
+"""
+リクエスト単位のプロファイリング
+
+    cprofile:     標準ライブラリの決定的プロファイラ（既定）。.prof（pstats）と app/ 配下の関数の要約 .txt を保存する
+    pyinstrument: サンプリングプロファイラ（pyinstrument パッケージが必要）。async対応のため他のリクエストが混ざらない。.html を保存する
+
+cProfile はスレッド単位で計測するため、計測中に同じイベントループで処理された他のリクエストも結果に含まれる。
+また同時に有効にできるプロファイラは1つのため、計測は1リクエストずつ行う。
+"""
+import cProfile
+import io
+import os
+import pstats
+import re
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "").strip().lower() in ("1", "true", "yes", "on")
+PROFILING_DIR = os.getenv("PROFILING_DIR", "./profiles")
+PROFILING_PROFILER = os.getenv("PROFILING_PROFILER", "cprofile")
+# 要約に出力する関数の数
+PROFILING_TOP = int(os.getenv("PROFILING_TOP", "40"))
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+@dataclass
+class ProfileResult:
+    """
+    保存したプロファイルの情報
+    """
+    profile_id: str
+    profiler: str
+    duration: float
+    files: List[str]
+
+class RequestProfiler(ABC):
+    """
+    1リクエストの計測（start / stop の後に save で保存する）
+    """
+    name = ""
+
+    @abstractmethod
+    def start(self) -> None:
+        """計測の開始"""
+
+    @abstractmethod
+    def stop(self) -> None:
+        """計測の終了"""
+
+    @abstractmethod
+    def save(self, directory: str, stem: str) -> List[str]:
+        """計測結果の保存（保存したファイルのパスを返す）"""
+
+class CProfileProfiler(RequestProfiler):
+    name = "cprofile"
+
+    def __init__(self) -> None:
+        self._profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self._profile.enable()
+
+    def stop(self) -> None:
+        self._profile.disable()
+
+    def save(self, directory: str, stem: str) -> List[str]:
+        prof_path = os.path.join(directory, f"{stem}.prof")
+        self._profile.dump_stats(prof_path)
+        # エンドポイントとCRUDなどアプリケーションの関数に絞った累積時間順の要約
+        summary = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=summary)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+            rf"{re.escape(os.sep)}app{re.escape(os.sep)}",
+            PROFILING_TOP
+        )
+        txt_path = os.path.join(directory, f"{stem}.txt")
+        with open(txt_path, "w", encoding="utf-8") as f:
+            f.write(summary.getvalue())
+        return [prof_path, txt_path]
+
+class PyinstrumentProfiler(RequestProfiler):
+    name = "pyinstrument"
+
+    def __init__(self) -> None:
+        try:
+            from pyinstrument import Profiler
+        except ImportError as e:
+            raise RuntimeError(
+                "pyinstrument によるプロファイリングには pyinstrument パッケージが必要です（pip install pyinstrument）"
+            ) from e
+        self._profiler = Profiler(async_mode="enabled")
+
+    def start(self) -> None:
+        self._profiler.start()
+
+    def stop(self) -> None:
+        self._profiler.stop()
+
+    def save(self, directory: str, stem: str) -> List[str]:
+        html_path = os.path.join(directory, f"{stem}.html")
+        with open(html_path, "w", encoding="utf-8") as f:
+            f.write(self._profiler.output_html())
+        return [html_path]
+
+def create_profiler(name: str = PROFILING_PROFILER) -> RequestProfiler:
+    profilers = {
+        "cprofile": CProfileProfiler,
+        "pyinstrument": PyinstrumentProfiler,
+    }
+    if name not in profilers:
+        raise ValueError(f"未対応のプロファイラです: {name}")
+    return profilers[name]()
+
+def new_profile_id(method: str, path: str) -> str:
+    """
+    保存ファイル名に使うプロファイルID（時刻_メソッド_パス_乱数）
+    """
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", path).strip("-")[:60] or "root"
+    return f"{time.strftime('%Y%m%d-%H%M%S')}_{method.lower()}_{slug}_{uuid.uuid4().hex[:8]}"
+
+def save_profile(
+    profiler: RequestProfiler,
+    profile_id: str,
+    duration: float,
+    directory: str = PROFILING_DIR
+) -> ProfileResult:
+    """
+    プロファイルの保存（ファイル書き込みを行うためスレッドプールから呼び出す）
+    """
+    os.makedirs(directory, exist_ok=True)
+    files = profiler.save(directory, profile_id)
+    return ProfileResult(
+        profile_id=profile_id,
+        profiler=profiler.name,
+        duration=duration,
+        files=files
+    )
@@ -0,0 +1,190 @@
+import json
+from dataclasses import dataclass
+from threading import RLock
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from app.schemas.assessment import ScoringConfig
+
+@dataclass(frozen=True)
+class CompiledScoring:
+    """
+    検査ごとにコンパイルされた採点表
+
+    回答値の行列 V（結果×項目）と回答有無のマスク M から
+    合計 = V @ item_weights + M @ item_offsets を1回の行列演算で求める。
+    逆転項目は重みの符号を反転し、基準値を加算項に含める。
+    """
+    assessment_id: UUID
+    question_index: Dict[UUID, int]  # 質問ID -> 列番号
+    item_weights: np.ndarray  # (項目数,)
+    item_offsets: np.ndarray  # (項目数,)
+    subscale_names: Tuple[str, ...]
+    subscale_weights: np.ndarray  # (項目数, 下位尺度数)
+    subscale_offsets: np.ndarray  # (項目数, 下位尺度数)
+
+    @property
+    def item_count(self) -> int:
+        return len(self.question_index)
+
+    def score_matrix(
+        self,
+        values: np.ndarray,
+        answered: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        複数結果の一括採点
+
+        戻り値は (合計スコア（結果数,）, 下位尺度スコア（結果数, 下位尺度数）)
+        """
+        totals = values @ self.item_weights + answered @ self.item_offsets
+        subscales = values @ self.subscale_weights + answered @ self.subscale_offsets
+        return totals, subscales
+
+    def build_matrix(
+        self,
+        answers: Sequence[Tuple[UUID, float]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        1件分の回答 (質問ID, 値) を回答行列に変換する（未知の質問は無視）
+        """
+        values = np.zeros((1, self.item_count))
+        answered = np.zeros((1, self.item_count))
+        for question_id, value in answers:
+            column = self.question_index.get(question_id)
+            if column is not None:
+                values[0, column] = value
+                answered[0, column] = 1.0
+        return values, answered
+
+    def score_answers(
+        self,
+        answers: Sequence[Tuple[UUID, float]]
+    ) -> Tuple[int, Dict[str, float]]:
+        """
+        1件分の回答の採点
+
+        戻り値は (合計スコア, 下位尺度ごとのスコア)
+        """
+        values, answered = self.build_matrix(answers)
+        totals, subscales = self.score_matrix(values, answered)
+        return self.to_scores(totals[0], subscales[0])
+
+    def to_scores(
+        self,
+        total: float,
+        subscales: np.ndarray
+    ) -> Tuple[int, Dict[str, float]]:
+        """
+        行列演算の結果を保存用の値に変換する
+        """
+        return (
+            int(round(float(total))),
+            {
+                name: round(float(score), 4)
+                for name, score in zip(self.subscale_names, subscales)
+            }
+        )
+
+def compile_scoring(assessment: Any) -> CompiledScoring:
+    """
+    検査定義（AssessmentResponse またはORMのAssessment）から採点表を作成する
+    """
+    config = assessment.scoring_config or ScoringConfig()
+    if not isinstance(config, ScoringConfig):
+        config = ScoringConfig.model_validate(config)
+
+    questions = sorted(assessment.questions, key=lambda q: q.order)
+    orders = [q.order for q in questions]
+    option_values = [o.value for o in assessment.options]
+    reverse_offset = config.reverse_offset
+    if reverse_offset is None:
+        reverse_offset = (min(option_values) + max(option_values)) if option_values else 0
+
+    weights = np.array([config.weights.get(order, 1.0) for order in orders], dtype=float)
+    reverse = np.isin(orders, config.reverse_items)
+    item_weights = np.where(reverse, -weights, weights)
+    item_offsets = np.where(reverse, weights * reverse_offset, 0.0)
+
+    subscale_names = tuple(config.subscales.keys())
+    membership = np.zeros((len(orders), len(subscale_names)))
+    for column, name in enumerate(subscale_names):
+        membership[:, column] = np.isin(orders, config.subscales[name])
+
+    return CompiledScoring(
+        assessment_id=assessment.id,
+        question_index={q.id: index for index, q in enumerate(questions)},
+        item_weights=item_weights,
+        item_offsets=item_offsets,
+        subscale_names=subscale_names,
+        subscale_weights=membership * item_weights[:, None],
+        subscale_offsets=membership * item_offsets[:, None],
+    )
+
+class ScoringEngine:
+    """
+    検査定義ごとにコンパイル済みの採点表を保持する
+
+    採点設定・質問の並び・選択肢の値が変わった場合のみ再コンパイルする
+    """
+    def __init__(self) -> None:
+        self._lock = RLock()
+        self._compiled: Dict[UUID, Tuple[Hashable, CompiledScoring]] = {}
+
+    @staticmethod
+    def _key(definition: Any) -> Hashable:
+        config = definition.scoring_config or ScoringConfig()
+        if not isinstance(config, ScoringConfig):
+            config = ScoringConfig.model_validate(config)
+        return (
+            json.dumps(config.model_dump(), sort_keys=True),
+            tuple(sorted((q.order, str(q.id)) for q in definition.questions)),
+            tuple(sorted(o.value for o in definition.options)),
+        )
+
+    def get(self, definition: Any) -> CompiledScoring:
+        key = self._key(definition)
+        with self._lock:
+            cached = self._compiled.get(definition.id)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            compiled = compile_scoring(definition)
+            self._compiled[definition.id] = (key, compiled)
+            return compiled
+
+    def score_results(
+        self,
+        definition: Any,
+        rows: Sequence[Tuple[UUID, UUID, float]]
+    ) -> Dict[UUID, Tuple[int, Dict[str, float]]]:
+        """
+        複数結果の一括採点
+
+        rows は (結果ID, 質問ID, 値) の並び。戻り値は 結果ID -> (合計, 下位尺度)
+        """
+        compiled = self.get(definition)
+        if not rows:
+            return {}
+        result_ids, row_index = np.unique(
+            np.array([str(r[0]) for r in rows]),
+            return_inverse=True
+        )
+        columns = np.array([compiled.question_index.get(r[1], -1) for r in rows])
+        values = np.array([r[2] for r in rows], dtype=float)
+        known = columns >= 0
+
+        value_matrix = np.zeros((len(result_ids), compiled.item_count))
+        answered = np.zeros((len(result_ids), compiled.item_count))
+        value_matrix[row_index[known], columns[known]] = values[known]
+        answered[row_index[known], columns[known]] = 1.0
+
+        totals, subscales = compiled.score_matrix(value_matrix, answered)
+        return {
+            UUID(result_id): compiled.to_scores(totals[i], subscales[i])
+            for i, result_id in enumerate(result_ids)
+        }
+
+# プロセス共通の採点エンジン
+scoring_engine = ScoringEngine()
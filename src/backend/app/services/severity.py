@@ -0,0 +1,105 @@
+from dataclasses import dataclass
+from threading import RLock
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.schemas.assessment import SeverityBand
+
+@dataclass(frozen=True)
+class CompiledSeverity:
+    """
+    検査ごとにコンパイルされた重症度の区分表
+
+    区分の下限値を昇順に並べ、二分探索（np.searchsorted）でスコアを分類する
+    """
+    thresholds: np.ndarray  # 各区分の下限値（昇順）
+    labels: Tuple[str, ...]
+
+    def classify(self, score: Optional[float]) -> str:
+        return self.classify_many([score])[0]
+
+    def classify_many(self, scores: Sequence[Optional[float]]) -> List[str]:
+        """
+        複数スコアの一括分類（未採点は0点として扱う）
+        """
+        if not scores:
+            return []
+        values = np.array([score or 0 for score in scores], dtype=float)
+        indexes = np.searchsorted(self.thresholds, values, side="right") - 1
+        indexes = np.clip(indexes, 0, len(self.labels) - 1)
+        return [self.labels[i] for i in indexes]
+
+def default_bands(cutoff: int, max_score: int) -> List[SeverityBand]:
+    """
+    区分表が未設定の検査の既定区分
+
+    カットオフ未満は正常、以上は最大スコアの60%・80%で軽度・中等度・重度に分ける
+    """
+    return [
+        SeverityBand(label="normal", min_score=float("-inf")),
+        SeverityBand(label="mild", min_score=cutoff),
+        SeverityBand(label="moderate", min_score=max(cutoff, max_score * 0.6)),
+        SeverityBand(label="severe", min_score=max(cutoff, max_score * 0.8)),
+    ]
+
+def compile_severity(
+    cutoff: int,
+    max_score: int,
+    severity_bands: Optional[Sequence[Any]] = None
+) -> CompiledSeverity:
+    """
+    区分表（未設定の場合は既定区分）から分類表を作成する
+    """
+    bands = [
+        band if isinstance(band, SeverityBand) else SeverityBand.model_validate(band)
+        for band in (severity_bands or default_bands(cutoff, max_score))
+    ]
+    bands.sort(key=lambda band: band.min_score)
+    return CompiledSeverity(
+        thresholds=np.array([band.min_score for band in bands], dtype=float),
+        labels=tuple(band.label for band in bands),
+    )
+
+class SeverityClassifier:
+    """
+    検査ごとにコンパイル済みの分類表を保持する
+
+    検査定義（AssessmentResponse）・ORMのAssessmentのどちらからでも利用でき、
+    カットオフ・最大スコア・区分表が変わった場合のみ再コンパイルする
+    """
+    def __init__(self) -> None:
+        self._lock = RLock()
+        self._compiled: Dict[Any, Tuple[Hashable, CompiledSeverity]] = {}
+
+    @staticmethod
+    def _key(assessment: Any) -> Hashable:
+        bands = tuple(
+            (band.label, band.min_score) if isinstance(band, SeverityBand)
+            else (band["label"], band["min_score"])
+            for band in (assessment.severity_bands or [])
+        )
+        return (assessment.cutoff, assessment.max_score, bands)
+
+    def get(self, assessment: Any) -> CompiledSeverity:
+        key = self._key(assessment)
+        with self._lock:
+            cached = self._compiled.get(assessment.id)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            compiled = compile_severity(
+                assessment.cutoff,
+                assessment.max_score,
+                assessment.severity_bands
+            )
+            self._compiled[assessment.id] = (key, compiled)
+            return compiled
+
+    def classify(self, assessment: Any, score: Optional[float]) -> str:
+        return self.get(assessment).classify(score)
+
+    def classify_many(self, assessment: Any, scores: Sequence[Optional[float]]) -> List[str]:
+        return self.get(assessment).classify_many(scores)
+
+# プロセス共通の重症度分類器
+severity_classifier = SeverityClassifier()
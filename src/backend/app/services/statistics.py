@@ -0,0 +1,127 @@
+import os
+import time
+from dataclasses import dataclass, field
+from threading import RLock
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from app.schemas.assessment import AssessmentStatistics, ScoreFrequency
+
+# 統計情報キャッシュの有効期間（秒）
+STATISTICS_CACHE_TTL = float(os.getenv("STATISTICS_CACHE_TTL", "300"))
+
+@dataclass
+class ScoreDistribution:
+    """
+    検査の結果件数とスコアの度数分布
+
+    スコアの種類は最大スコア+1通りしかないため、度数分布から
+    平均・中央値・標準偏差などを結果の件数に依存せず求められる
+    """
+    total_results: int = 0  # 全ステータスの結果件数
+    completed: int = 0  # 完了件数（未採点を含む）
+    frequencies: Dict[int, int] = field(default_factory=dict)  # スコア -> 完了件数
+
+    def add_result(self) -> None:
+        self.total_results += 1
+
+    def add_completion(self, score: Optional[int]) -> None:
+        self.completed += 1
+        if score is not None:
+            self.frequencies[score] = self.frequencies.get(score, 0) + 1
+
+    def summarize(self) -> AssessmentStatistics:
+        """
+        度数分布からの統計量の計算
+        """
+        scores = np.array(sorted(self.frequencies), dtype=float)
+        counts = np.array([self.frequencies[int(s)] for s in scores], dtype=float)
+        n = counts.sum()
+        completion_rate = (
+            self.completed / self.total_results * 100 if self.total_results > 0 else 0.0
+        )
+        if n == 0:
+            return AssessmentStatistics(
+                total_attempts=self.completed,
+                average_score=0.0,
+                completion_rate=completion_rate,
+            )
+        mean = float(np.dot(scores, counts) / n)
+        variance = float(np.dot((scores - mean) ** 2, counts) / n)
+        # 累積度数から中央の順位（偶数件の場合は中央2件の平均）を求める
+        cumulative = np.cumsum(counts)
+        middle = np.searchsorted(cumulative, [(n - 1) // 2 + 1, n // 2 + 1])
+        median = float(scores[middle].mean())
+        return AssessmentStatistics(
+            total_attempts=self.completed,
+            average_score=mean,
+            min_score=int(scores[0]),
+            max_score=int(scores[-1]),
+            median_score=median,
+            std_score=float(np.sqrt(variance)),
+            completion_rate=completion_rate,
+            histogram=[
+                ScoreFrequency(score=int(score), count=int(count))
+                for score, count in zip(scores, counts)
+            ],
+        )
+
+class StatisticsCache:
+    """
+    検査ごとの度数分布のプロセス内キャッシュ
+
+    検査結果の作成・完了時にキャッシュ済みの度数分布を差分更新し、
+    有効期間の経過後はデータベースから作り直す（他プロセスでの更新を反映するため）
+    """
+    def __init__(self, ttl: float = STATISTICS_CACHE_TTL) -> None:
+        self._lock = RLock()
+        self._ttl = ttl
+        self._entries: Dict[UUID, Tuple[float, ScoreDistribution]] = {}
+
+    def get(self, assessment_id: UUID) -> Optional[AssessmentStatistics]:
+        with self._lock:
+            entry = self._entries.get(assessment_id)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._entries.pop(assessment_id, None)
+                return None
+            return entry[1].summarize()
+
+    def put(self, assessment_id: UUID, distribution: ScoreDistribution) -> AssessmentStatistics:
+        with self._lock:
+            self._entries[assessment_id] = (time.monotonic() + self._ttl, distribution)
+            return distribution.summarize()
+
+    def record_result(self, assessment_id: UUID) -> None:
+        """
+        検査結果の作成の反映（キャッシュ済みの場合のみ）
+        """
+        with self._lock:
+            entry = self._entries.get(assessment_id)
+            if entry is not None:
+                entry[1].add_result()
+
+    def record_completion(self, assessment_id: UUID, score: Optional[int]) -> None:
+        """
+        検査の完了の反映（キャッシュ済みの場合のみ）
+        """
+        with self._lock:
+            entry = self._entries.get(assessment_id)
+            if entry is not None:
+                entry[1].add_completion(score)
+
+    def invalidate(self, assessment_id: Optional[UUID] = None) -> None:
+        """
+        キャッシュの無効化（ID未指定の場合は全件）
+        """
+        with self._lock:
+            if assessment_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(assessment_id, None)
+
+# プロセス共通の統計情報キャッシュ
+statistics_cache = StatisticsCache()
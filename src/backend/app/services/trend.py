@@ -0,0 +1,181 @@
+import os
+import time
+from datetime import datetime
+from threading import RLock
+from typing import Dict, Hashable, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from app.schemas.result import AssessmentGraphData, GraphDataPoint, ReliableChange
+
+# 移動平均の窓幅（データポイント数）
+MOVING_AVERAGE_WINDOW = int(os.getenv("TREND_MOVING_AVERAGE_WINDOW", "3"))
+# RCIの算出に用いる検査の信頼性係数（検査ごとの値が無い場合の既定値）
+DEFAULT_RELIABILITY = float(os.getenv("TREND_RELIABILITY", "0.8"))
+# RCIの有意判定の閾値（両側5%）
+RELIABLE_CHANGE_THRESHOLD = 1.96
+# キャッシュの有効期間（秒）。期間指定の起点が現在時刻のため一定時間で作り直す
+TREND_CACHE_TTL = float(os.getenv("TREND_CACHE_TTL", "300"))
+
+_SECONDS_PER_DAY = 86400.0
+
+def moving_average(scores: np.ndarray, window: int = MOVING_AVERAGE_WINDOW) -> np.ndarray:
+    """
+    累積和による移動平均（先頭の窓幅未満の区間はそれまでの平均）
+    """
+    if len(scores) == 0:
+        return scores
+    window = max(1, window)
+    cumsum = np.concatenate(([0.0], np.cumsum(scores)))
+    ends = np.arange(1, len(scores) + 1)
+    starts = np.maximum(ends - window, 0)
+    return (cumsum[ends] - cumsum[starts]) / (ends - starts)
+
+def regression_line(days: np.ndarray, scores: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    最小二乗法による回帰直線
+
+    戻り値は (各データポイントの回帰値, 1日あたりの傾き)
+    """
+    if len(scores) < 2 or np.ptp(days) == 0:
+        return np.full(len(scores), scores.mean() if len(scores) else 0.0), 0.0
+    slope, intercept = np.polyfit(days, scores, 1)
+    return slope * days + intercept, float(slope)
+
+def reliable_change(
+    scores: np.ndarray,
+    reference_sd: Optional[float],
+    reliability: float = DEFAULT_RELIABILITY
+) -> Optional[ReliableChange]:
+    """
+    最初と最新のスコアの Reliable Change Index（Jacobson & Truax）
+
+    差の標準誤差 = SD × √(2(1 - 信頼性係数))。SDには検査全体の完了結果の標準偏差を用いる。
+    スコアが高いほど症状が重い尺度を前提に、減少を改善とする。
+    """
+    if len(scores) < 2 or not reference_sd or reliability >= 1:
+        return None
+    se_difference = reference_sd * np.sqrt(2 * (1 - reliability))
+    baseline, latest = float(scores[0]), float(scores[-1])
+    change = latest - baseline
+    index = change / se_difference
+    significant = abs(index) >= RELIABLE_CHANGE_THRESHOLD
+    if not significant:
+        direction = "no_reliable_change"
+    else:
+        direction = "improved" if change < 0 else "deteriorated"
+    return ReliableChange(
+        baseline=baseline,
+        latest=latest,
+        change=change,
+        index=round(float(index), 4),
+        significant=significant,
+        direction=direction,
+    )
+
+def compute_trend(
+    assessment_type: str,
+    dates: Sequence[datetime],
+    scores: Sequence[Optional[float]],
+    cutoff: float,
+    reference_sd: Optional[float] = None,
+    window: int = MOVING_AVERAGE_WINDOW
+) -> AssessmentGraphData:
+    """
+    時系列のスコアから回帰直線・移動平均・RCIを含むグラフデータを作成する
+
+    dates は昇順であること（未採点は0点として扱う）
+    """
+    values = np.array([score or 0 for score in scores], dtype=float)
+    if len(values):
+        origin = dates[0]
+        days = np.array([(d - origin).total_seconds() for d in dates]) / _SECONDS_PER_DAY
+    else:
+        days = np.zeros(0)
+    line, slope = regression_line(days, values)
+    return AssessmentGraphData(
+        assessment_type=assessment_type,
+        data_points=[
+            GraphDataPoint(date=date, value=value)
+            for date, value in zip(dates, values.tolist())
+        ],
+        trend_line=np.round(line, 4).tolist(),
+        cutoff_line=cutoff,
+        average_line=float(values.mean()) if len(values) else 0,
+        moving_average=np.round(moving_average(values, window), 4).tolist(),
+        slope_per_day=round(slope, 6) if len(values) >= 2 else None,
+        reliable_change=reliable_change(values, reference_sd),
+    )
+
+class TrendCache:
+    """
+    患者ごとのトレンド計算結果のプロセス内キャッシュ
+
+    (患者ID, 検査タイプ, 日数) をキーとし、患者の検査が完了した時点で破棄する
+    """
+    def __init__(self, ttl: float = TREND_CACHE_TTL) -> None:
+        self._lock = RLock()
+        self._ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, AssessmentGraphData]] = {}
+        self._by_patient: Dict[UUID, Set[Hashable]] = {}
+        self._reference_sd: Dict[str, Tuple[float, Optional[float]]] = {}
+
+    def get(
+        self,
+        patient_id: UUID,
+        assessment_type: str,
+        days: int
+    ) -> Optional[AssessmentGraphData]:
+        key = (patient_id, assessment_type, days)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                return None
+            return entry[1]
+
+    def put(
+        self,
+        patient_id: UUID,
+        days: int,
+        graphs: List[AssessmentGraphData]
+    ) -> None:
+        expires_at = time.monotonic() + self._ttl
+        with self._lock:
+            keys = self._by_patient.setdefault(patient_id, set())
+            for graph in graphs:
+                key = (patient_id, graph.assessment_type, days)
+                self._entries[key] = (expires_at, graph)
+                keys.add(key)
+
+    def get_reference_sd(self, assessment_type: str) -> Tuple[bool, Optional[float]]:
+        """
+        検査タイプ全体の標準偏差（RCI用）の取得。戻り値は (キャッシュの有無, 値)
+        """
+        with self._lock:
+            entry = self._reference_sd.get(assessment_type)
+            if entry is None or entry[0] < time.monotonic():
+                return False, None
+            return True, entry[1]
+
+    def put_reference_sd(self, assessment_type: str, sd: Optional[float]) -> None:
+        with self._lock:
+            self._reference_sd[assessment_type] = (time.monotonic() + self._ttl, sd)
+
+    def invalidate(self, patient_id: Optional[UUID] = None) -> None:
+        """
+        キャッシュの無効化（患者ID未指定の場合は全件）
+        """
+        with self._lock:
+            if patient_id is None:
+                self._entries.clear()
+                self._by_patient.clear()
+                return
+            for key in self._by_patient.pop(patient_id, set()):
+                self._entries.pop(key, None)
+
+# プロセス共通のトレンドキャッシュ
+trend_cache = TrendCache()
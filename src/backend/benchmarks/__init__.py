@@ -0,0 +1,3 @@
+"""
+APIのベンチマーク（python -m benchmarks --help）
+"""
@@ -0,0 +1,84 @@
+"""
+ベンチマークの実行
+
+    python -m benchmarks --patients 200 --results-per-patient 12 --iterations 200
+    python -m benchmarks --output baseline.json
+    python -m benchmarks --baseline baseline.json
+
+既定では一時ディレクトリのSQLiteに合成データを作成する。--database-url で
+PostgreSQL（postgresql+asyncpg://...）などを指定する場合、既存のテーブルを削除して
+作り直すため --reset が必要。
+"""
+import argparse
+import asyncio
+import json
+import sys
+from typing import List, Optional
+
+from benchmarks.environment import (
+    add_database_arguments,
+    add_dataset_arguments,
+    configure_database,
+    dataset_config,
+    prepare_database
+)
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Scale App APIのベンチマーク")
+    add_database_arguments(parser)
+    add_dataset_arguments(parser)
+    parser.add_argument("--iterations", type=int, default=200, help="計測するフローの回数")
+    parser.add_argument("--warmup", type=int, default=10, help="計測前に実行するフローの回数")
+    parser.add_argument("--concurrency", type=int, default=1, help="フローの同時実行数")
+    parser.add_argument("--output", default=None, help="結果を保存するJSONファイル")
+    parser.add_argument("--baseline", default=None, help="比較する過去の結果のJSONファイル")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    # アプリケーションは読み込み時に設定を参照するため、読み込む前に環境変数を設定する
+    workdir = configure_database(args)
+
+    from app.database import engine
+    from app.main import API_V1_STR, app
+    from benchmarks.harness import BenchmarkConfig, format_report, run_benchmark
+
+    config = dataset_config(args)
+    benchmark_config = BenchmarkConfig(
+        iterations=args.iterations,
+        warmup=args.warmup,
+        concurrency=args.concurrency,
+        seed=args.seed,
+        api_prefix=API_V1_STR
+    )
+
+    async def run():
+        try:
+            dataset = await prepare_database(config)
+            return await run_benchmark(app, dataset, benchmark_config)
+        finally:
+            await engine.dispose()
+
+    try:
+        report = asyncio.run(run())
+    finally:
+        if workdir is not None:
+            workdir.cleanup()
+
+    report["config"] = {
+        "database": args.database_url.split("://", 1)[0],
+        "dataset": vars(config),
+        "benchmark": vars(benchmark_config),
+    }
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print(format_report(report, baseline))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 1 if report["total"].get("failed_flows") else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
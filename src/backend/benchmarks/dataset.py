@@ -0,0 +1,208 @@
+"""
+ベンチマーク用の合成データ（12種類の検査と患者・検査結果・回答）
+
+同じシードからは同じデータを作成する。検査結果は一括INSERTで作成し、
+統計情報の集計テーブルは最後に再構築する。
+"""
+import random
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import insert
+
+from app.crud import assessment_statistics
+from app.models import AnswerDetail, Assessment, AssessmentResult, Option, Patient, Question
+from app.models.base import AssessmentStatus, utc_now
+
+@dataclass(frozen=True)
+class Instrument:
+    """
+    検査の定義（質問数・選択肢の値・カットオフ）
+    """
+    type: str
+    name: str
+    question_count: int
+    option_values: Tuple[int, ...]
+    cutoff: int
+
+    @property
+    def max_score(self) -> int:
+        return self.question_count * max(self.option_values)
+
+# README の対応検査（項目数・選択肢は各尺度に近い形の合成データ）
+INSTRUMENTS: Tuple[Instrument, ...] = (
+    Instrument("PHQ-9", "PHQ-9（うつ病検査）", 9, (0, 1, 2, 3), 10),
+    Instrument("SDS", "SDS（うつ病検査）", 20, (1, 2, 3, 4), 50),
+    Instrument("AQ", "AQ（自閉スペクトラム症検査）", 50, (0, 1), 33),
+    Instrument("Conners-3", "Conners-3（ADHD検査）", 39, (0, 1, 2, 3), 60),
+    Instrument("LSAS", "LSAS（社交不安検査）", 48, (0, 1, 2, 3), 60),
+    Instrument("STAI", "STAI（不安検査）", 40, (1, 2, 3, 4), 90),
+    Instrument("BDI-II", "BDI-II（うつ病検査）", 21, (0, 1, 2, 3), 14),
+    Instrument("CAPS", "CAPS（PTSD検査）", 20, (0, 1, 2, 3, 4), 33),
+    Instrument("GAD-7", "GAD-7（全般性不安障害検査）", 7, (0, 1, 2, 3), 10),
+    Instrument("Y-BOCS", "Y-BOCS（強迫性障害検査）", 10, (0, 1, 2, 3, 4), 16),
+    Instrument("PCL-5", "PCL-5（PTSD検査）", 20, (0, 1, 2, 3, 4), 33),
+    Instrument("ASRS", "ASRS（ADHD検査）", 18, (0, 1, 2, 3, 4), 24),
+)
+
+@dataclass
+class DatasetConfig:
+    """
+    合成データの規模
+    """
+    patients: int = 200
+    results_per_patient: int = 12
+    answers_per_result: Optional[int] = None  # 未指定の場合は全質問に回答
+    seed: int = 42
+    batch_size: int = 5000  # 一括INSERTの行数
+
+@dataclass
+class SeededAssessment:
+    id: UUID
+    instrument: Instrument
+    question_ids: List[UUID]
+    option_ids: Dict[int, UUID]  # 選択肢の値 -> ID
+
+@dataclass
+class SeededDataset:
+    """
+    作成したデータのID（ベンチマークのシナリオで使用する）
+    """
+    patient_ids: List[UUID] = field(default_factory=list)
+    assessments: List[SeededAssessment] = field(default_factory=list)
+    results: int = 0
+    answers: int = 0
+
+class _BatchInserter:
+    """
+    テーブルごとに行をためて一括INSERTする
+
+    書き込みは最初に行を追加したテーブルの順（親テーブルが先）に行い、外部キーの制約を満たす
+    """
+    def __init__(self, db, batch_size: int) -> None:
+        self._db = db
+        self._batch_size = batch_size
+        self._rows: Dict[type, List[dict]] = {}
+
+    async def add(self, model: type, row: dict) -> None:
+        rows = self._rows.setdefault(model, [])
+        rows.append(row)
+        if len(rows) >= self._batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        for model, rows in self._rows.items():
+            if rows:
+                await self._db.execute(insert(model.__table__), rows)
+                rows.clear()
+
+def _answer_value(rng: random.Random, instrument: Instrument, severity: float) -> int:
+    # 患者ごとの重症度（0〜1）の周りに値をばらつかせる
+    values = instrument.option_values
+    position = min(max(rng.gauss(severity, 0.2), 0.0), 1.0)
+    return values[round(position * (len(values) - 1))]
+
+async def seed_dataset(session_factory, config: DatasetConfig) -> SeededDataset:
+    """
+    合成データの作成（既存のテーブルは空である前提）
+    """
+    rng = random.Random(config.seed)
+    dataset = SeededDataset()
+    now = utc_now()
+
+    async with session_factory() as db:
+        inserter = _BatchInserter(db, config.batch_size)
+
+        for instrument in INSTRUMENTS:
+            assessment_id = uuid4()
+            await inserter.add(Assessment, {
+                "id": assessment_id,
+                "name": instrument.name,
+                "type": instrument.type,
+                "cutoff": instrument.cutoff,
+                "max_score": instrument.max_score,
+                "created_at": now,
+                "updated_at": now,
+            })
+            question_ids = [uuid4() for _ in range(instrument.question_count)]
+            option_ids = {value: uuid4() for value in instrument.option_values}
+            for order, question_id in enumerate(question_ids):
+                await inserter.add(Question, {
+                    "id": question_id,
+                    "assessment_id": assessment_id,
+                    "text": f"{instrument.type} 質問{order + 1}",
+                    "order": order,
+                })
+            for order, (value, option_id) in enumerate(option_ids.items()):
+                await inserter.add(Option, {
+                    "id": option_id,
+                    "assessment_id": assessment_id,
+                    "text": f"選択肢{value}",
+                    "value": value,
+                    "order": order,
+                })
+            dataset.assessments.append(
+                SeededAssessment(assessment_id, instrument, question_ids, option_ids)
+            )
+        await inserter.flush()
+
+        for index in range(config.patients):
+            patient_id = uuid4()
+            await inserter.add(Patient, {
+                "id": patient_id,
+                "name": f"患者{index + 1:05d}",
+                "created_at": now,
+                "updated_at": now,
+            })
+            dataset.patient_ids.append(patient_id)
+        await inserter.flush()
+
+        for patient_id in dataset.patient_ids:
+            severity = rng.random()
+            for number in range(config.results_per_patient):
+                seeded = rng.choice(dataset.assessments)
+                # 過去1年に古い順に分散させ、重症度は徐々に改善させる
+                days_ago = 365 * (config.results_per_patient - number) / config.results_per_patient
+                completed_at = now - timedelta(days=max(days_ago - rng.uniform(0, 7), 0.5))
+                severity = max(severity - rng.uniform(0, 0.05), 0.0)
+                question_ids = seeded.question_ids
+                if config.answers_per_result is not None:
+                    question_ids = question_ids[:config.answers_per_result]
+                result_id = uuid4()
+                answers = []
+                total = 0
+                for question_id in question_ids:
+                    value = _answer_value(rng, seeded.instrument, severity)
+                    total += value
+                    answers.append({
+                        "id": uuid4(),
+                        "result_id": result_id,
+                        "question_id": question_id,
+                        "selected_option_id": seeded.option_ids[value],
+                        "value": value,
+                        "answered_at": completed_at,
+                        "created_at": completed_at,
+                        "updated_at": completed_at,
+                    })
+                await inserter.add(AssessmentResult, {
+                    "id": result_id,
+                    "patient_id": patient_id,
+                    "assessment_id": seeded.id,
+                    "status": AssessmentStatus.COMPLETED,
+                    "total_score": total,
+                    "started_at": completed_at - timedelta(minutes=10),
+                    "completed_at": completed_at,
+                    "created_at": completed_at - timedelta(minutes=10),
+                    "updated_at": completed_at,
+                })
+                for answer in answers:
+                    await inserter.add(AnswerDetail, answer)
+                dataset.results += 1
+                dataset.answers += len(answers)
+        await inserter.flush()
+
+        await assessment_statistics.rebuild(db)
+        await db.commit()
+    return dataset
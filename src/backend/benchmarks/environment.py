@@ -0,0 +1,74 @@
+"""
+ベンチマーク・負荷試験の共通の準備（データベースの指定と合成データの作成）
+
+アプリケーションは読み込み時に DATABASE_URL などを参照するため、このモジュールは
+app を読み込まない。configure_database の後に app を読み込むこと。
+"""
+import argparse
+import os
+import sys
+import tempfile
+from typing import Optional
+
+def add_database_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--database-url", default=None, help="対象のデータベース（未指定の場合は一時SQLite）")
+    parser.add_argument("--reset", action="store_true", help="--database-url のテーブルを削除して作り直す")
+
+def add_dataset_arguments(parser: argparse.ArgumentParser, patients: int = 200) -> None:
+    parser.add_argument("--patients", type=int, default=patients, help="患者数")
+    parser.add_argument("--results-per-patient", type=int, default=12, help="患者あたりの既存の検査結果数")
+    parser.add_argument(
+        "--answers-per-result",
+        type=int,
+        default=None,
+        help="既存の検査結果あたりの回答数（未指定の場合は全質問）"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="乱数のシード")
+
+def configure_database(args: argparse.Namespace) -> Optional[tempfile.TemporaryDirectory]:
+    """
+    対象データベースの環境変数の設定（一時SQLiteの場合は作成したディレクトリを返す）
+
+    --database-url の指定時に --reset が無い場合は終了する（既存のテーブルを削除するため）
+    """
+    workdir = None
+    if args.database_url is None:
+        workdir = tempfile.TemporaryDirectory(prefix="scale_app_bench_")
+        args.database_url = f"sqlite+aiosqlite:///{os.path.join(workdir.name, 'benchmark.db')}"
+    elif not args.reset:
+        print("--database-url を指定する場合はテーブルを作り直すため --reset が必要です", file=sys.stderr)
+        sys.exit(2)
+
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["DB_AUTO_CREATE"] = "0"
+    # SQLの実行回数は集計結果に含めるため、リクエストごとの警告ログは出さない
+    os.environ.setdefault("METRICS_QUERY_WARN_THRESHOLD", "0")
+    return workdir
+
+def dataset_config(args: argparse.Namespace):
+    from benchmarks.dataset import DatasetConfig
+
+    return DatasetConfig(
+        patients=args.patients,
+        results_per_patient=args.results_per_patient,
+        answers_per_result=args.answers_per_result,
+        seed=args.seed
+    )
+
+async def prepare_database(config):
+    """
+    テーブルを作り直して合成データを作成する
+    """
+    import app.models  # noqa: F401  テーブル定義の登録
+    from app.database import AsyncSessionLocal, Base, engine
+    from benchmarks.dataset import seed_dataset
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    dataset = await seed_dataset(AsyncSessionLocal, config)
+    print(
+        f"seeded {len(dataset.patient_ids)} patients, {len(dataset.assessments)} assessments, "
+        f"{dataset.results} results, {dataset.answers} answers ({engine.url.get_backend_name()})"
+    )
+    return dataset
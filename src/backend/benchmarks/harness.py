@@ -0,0 +1,230 @@
+"""
+APIの主要フローのベンチマーク
+
+app.main:app をプロセス内（httpx の ASGITransport）で呼び出し、ステップごとの
+レイテンシ（p50/p99）・スループット・SQLの実行回数（X-DB-Query-Count ヘッダー）を集計する。
+"""
+import asyncio
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import httpx
+import numpy as np
+
+from benchmarks.dataset import SeededAssessment, SeededDataset
+
+@dataclass
+class BenchmarkConfig:
+    iterations: int = 200
+    warmup: int = 10
+    concurrency: int = 1
+    seed: int = 42
+    api_prefix: str = "/api/v1"
+
+@dataclass
+class Sample:
+    step: str
+    seconds: float
+    queries: Optional[int]
+    status_code: int  # 通信エラーの場合は0
+    error: Optional[str] = None  # エラーの分類
+
+def classify_error(response: httpx.Response) -> Optional[str]:
+    """
+    サーバーエラーの分類（SQLiteのロック待ちのタイムアウト・プールの接続待ちのタイムアウトなど）
+    """
+    if response.status_code < 500:
+        return None
+    text = response.text
+    if "database is locked" in text:
+        return "database_locked"
+    if "QueuePool limit" in text or "TimeoutError" in text:
+        return "pool_timeout"
+    return "server_error"
+
+@dataclass
+class LatencyRecorder:
+    """
+    ステップごとの計測値の記録
+    """
+    samples: List[Sample] = field(default_factory=list)
+
+    async def request(
+        self,
+        client: httpx.AsyncClient,
+        step: str,
+        method: str,
+        url: str,
+        **kwargs: Any
+    ) -> httpx.Response:
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        elapsed = time.perf_counter() - started
+        queries = response.headers.get("x-db-query-count")
+        self.samples.append(Sample(
+            step=step,
+            seconds=elapsed,
+            queries=int(queries) if queries is not None else None,
+            status_code=response.status_code,
+            error=classify_error(response)
+        ))
+        return response
+
+    def record_failure(self, step: str, seconds: float, error: str) -> None:
+        """
+        レスポンスを受け取れなかったリクエストの記録
+        """
+        self.samples.append(Sample(step=step, seconds=seconds, queries=None, status_code=0, error=error))
+
+    def summarize(self, elapsed: float, flows: int) -> Dict[str, Any]:
+        """
+        ステップごとの集計（ミリ秒）と全体のスループット
+        """
+        steps: Dict[str, Any] = {}
+        for step in dict.fromkeys(sample.step for sample in self.samples):
+            samples = [s for s in self.samples if s.step == step]
+            latencies = np.array([s.seconds for s in samples]) * 1000
+            queries = [s.queries for s in samples if s.queries is not None]
+            steps[step] = {
+                "count": len(samples),
+                "errors": sum(1 for s in samples if s.error or s.status_code >= 400),
+                "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+                "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+                "p99_ms": round(float(np.percentile(latencies, 99)), 3),
+                "mean_ms": round(float(latencies.mean()), 3),
+                "max_ms": round(float(latencies.max()), 3),
+                "queries_avg": round(sum(queries) / len(queries), 2) if queries else None,
+                "queries_max": max(queries) if queries else None,
+            }
+        return {
+            "steps": steps,
+            "total": {
+                "requests": len(self.samples),
+                "flows": flows,
+                "elapsed_s": round(elapsed, 3),
+                "requests_per_s": round(len(self.samples) / elapsed, 2) if elapsed else 0.0,
+                "flows_per_s": round(flows / elapsed, 2) if elapsed else 0.0,
+                "errors_by_kind": dict(Counter(s.error for s in self.samples if s.error)),
+            },
+        }
+
+def _answers(rng: random.Random, seeded: SeededAssessment) -> List[Dict[str, str]]:
+    values = list(seeded.option_ids)
+    answers = []
+    for question_id in seeded.question_ids:
+        value = rng.choice(values)
+        answers.append({
+            "question_id": str(question_id),
+            "selected_option_id": str(seeded.option_ids[value]),
+            "value": value,
+        })
+    return answers
+
+async def run_flow(
+    client: httpx.AsyncClient,
+    recorder: LatencyRecorder,
+    dataset: SeededDataset,
+    rng: random.Random,
+    api_prefix: str
+) -> bool:
+    """
+    1患者の検査の実施から医師の閲覧までの主要フロー（失敗したステップで中断する）
+    """
+    patient_id = str(rng.choice(dataset.patient_ids))
+    seeded = rng.choice(dataset.assessments)
+    assessment_id = str(seeded.id)
+
+    response = await recorder.request(
+        client, "create_result", "POST", f"{api_prefix}/results/",
+        json={"patient_id": patient_id, "assessment_id": assessment_id}
+    )
+    if response.status_code >= 400:
+        return False
+    result_id = response.json()["id"]
+    results_url = f"{api_prefix}/results/{result_id}"
+
+    steps = (
+        ("start", "POST", f"{results_url}/start", None),
+        ("answer_all", "POST", f"{results_url}/answers/batch", {"answers": _answers(rng, seeded)}),
+        ("complete", "POST", f"{results_url}/complete", None),
+        ("detail", "GET", results_url, None),
+        ("trend", "GET", f"{results_url}/trend", None),
+        ("summary", "GET", f"{api_prefix}/patients/{patient_id}/summary", None),
+        ("statistics", "GET", f"{api_prefix}/assessments/{assessment_id}/statistics", None),
+    )
+    for step, method, url, body in steps:
+        response = await recorder.request(client, step, method, url, json=body)
+        if response.status_code >= 400:
+            return False
+    return True
+
+async def run_benchmark(app, dataset: SeededDataset, config: BenchmarkConfig) -> Dict[str, Any]:
+    """
+    ウォームアップの後に主要フローを指定回数（同時実行数 concurrency）実行して集計する
+    """
+    rng = random.Random(config.seed)
+    # 500エラーも例外にせずレスポンスとして集計する
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            warmup = LatencyRecorder()
+            for _ in range(config.warmup):
+                await run_flow(client, warmup, dataset, rng, config.api_prefix)
+
+            recorder = LatencyRecorder()
+            semaphore = asyncio.Semaphore(config.concurrency)
+            # 各フローの乱数はシードから決めて同時実行数によらず同じ操作列にする
+            flow_seeds = [rng.random() for _ in range(config.iterations)]
+
+            async def flow(flow_seed: float) -> bool:
+                async with semaphore:
+                    return await run_flow(
+                        client, recorder, dataset, random.Random(flow_seed), config.api_prefix
+                    )
+
+            started = time.perf_counter()
+            completed = await asyncio.gather(*(flow(s) for s in flow_seeds))
+            elapsed = time.perf_counter() - started
+
+    report = recorder.summarize(elapsed, flows=sum(completed))
+    report["total"]["failed_flows"] = len(completed) - sum(completed)
+    return report
+
+def format_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> str:
+    """
+    集計結果の表（baseline を指定した場合は p50/p99 の増減率を併記する）
+    """
+    def delta(step: str, key: str) -> str:
+        if not baseline:
+            return ""
+        before = baseline.get("steps", {}).get(step, {}).get(key)
+        if not before:
+            return "        "
+        return f" {(report['steps'][step][key] - before) / before * 100:+6.1f}%"
+
+    lines = [
+        f"{'step':<20}{'count':>7}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'mean ms':>10}"
+        f"{'queries':>9}{'max q':>7}"
+    ]
+    for step, stats in report["steps"].items():
+        queries = "-" if stats["queries_avg"] is None else f"{stats['queries_avg']:.1f}"
+        max_queries = "-" if stats["queries_max"] is None else str(stats["queries_max"])
+        lines.append(
+            f"{step:<20}{stats['count']:>7}{stats['errors']:>5}"
+            f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['mean_ms']:>10.2f}"
+            f"{queries:>9}{max_queries:>7}"
+            + (f"   p50{delta(step, 'p50_ms')} p99{delta(step, 'p99_ms')}" if baseline else "")
+        )
+    total = report["total"]
+    lines.append(
+        f"total: {total['requests']} requests / {total['flows']} flows in {total['elapsed_s']:.2f}s"
+        f" ({total['requests_per_s']:.1f} req/s, {total['flows_per_s']:.1f} flows/s)"
+    )
+    if total.get("failed_flows"):
+        lines.append(f"failed flows: {total['failed_flows']}")
+    if total.get("errors_by_kind"):
+        lines.append("errors: " + ", ".join(f"{kind}={count}" for kind, count in total["errors_by_kind"].items()))
+    return "\n".join(lines)
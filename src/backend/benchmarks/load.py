@@ -0,0 +1,355 @@
+"""
+負荷試験: 朝の受付時の集中（待合室の多数のiPadの同時回答と医師の画面更新）
+
+    python -m benchmarks.load --ipads 40 --doctors 5
+    python -m benchmarks.load --base-url http://localhost:8000 --ipads 40 --doctors 5
+
+iPadは受付から ramp 秒の間に順に検査を開始し、1問ずつ回答を送信して完了する
+（POST /results/ -> /start -> /answers を質問数回 -> /complete）。医師は終了まで
+ダッシュボード・回答進捗・検査履歴・結果詳細を --doctor-mix の比率で繰り返し取得する。
+
+既定ではプロセス内のASGIアプリ（一時SQLiteに合成データを作成）を対象にする。
+--base-url を指定した場合は起動済みのサーバー（uvicorn など）を対象にし、検査と患者をAPIで作成する。
+
+エンドポイントごとのレイテンシに加え、SQLiteの "database is locked" エラー・プールの接続待ちの
+タイムアウトを集計し、/health/db の定期取得からプールの使用状況（接続待ちの発生）を報告する。
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+import httpx
+
+from benchmarks.dataset import INSTRUMENTS, SeededAssessment, SeededDataset
+from benchmarks.environment import (
+    add_database_arguments,
+    add_dataset_arguments,
+    configure_database,
+    dataset_config,
+    prepare_database
+)
+from benchmarks.harness import LatencyRecorder, format_report
+
+DOCTOR_ACTIONS = ("dashboard", "progress", "history", "detail")
+
+@dataclass
+class LoadConfig:
+    ipads: int = 30
+    doctors: int = 4
+    sessions_per_ipad: int = 1
+    ramp_seconds: float = 5.0
+    answer_interval: float = 0.3  # 回答の間隔（秒、±50%でばらつかせる）
+    doctor_interval: float = 1.0  # 医師の画面更新の間隔（秒、±50%でばらつかせる）
+    doctor_mix: Dict[str, float] = field(
+        default_factory=lambda: {"dashboard": 4, "progress": 3, "history": 2, "detail": 1}
+    )
+    pool_sample_interval: float = 0.2
+    request_timeout: float = 30.0
+    seed: int = 42
+    api_prefix: str = "/api/v1"
+
+@dataclass
+class PoolSampler:
+    """
+    /health/db の定期取得によるコネクションプールの使用状況
+    """
+    samples: List[Dict[str, Any]] = field(default_factory=list)
+
+    async def run(self, client: httpx.AsyncClient, interval: float, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            try:
+                response = await client.get("/health/db")
+                if response.status_code == 200:
+                    self.samples.append(response.json())
+            except httpx.HTTPError:
+                pass
+            try:
+                await asyncio.wait_for(stop.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def summarize(self) -> Dict[str, Any]:
+        checked_out = [s["checkedout"] for s in self.samples if "checkedout" in s]
+        if not checked_out:
+            return {"samples": len(self.samples), "pool_class": self._pool_class()}
+        limits = [s["size"] + s.get("max_overflow", 0) for s in self.samples if "checkedout" in s]
+        # 全接続が使用中の間は新しいリクエストが接続の返却を待つ
+        saturated = sum(1 for used, limit in zip(checked_out, limits) if used >= limit)
+        return {
+            "samples": len(checked_out),
+            "pool_class": self._pool_class(),
+            "pool_limit": max(limits),
+            "peak_checked_out": max(checked_out),
+            "mean_checked_out": round(sum(checked_out) / len(checked_out), 2),
+            "peak_overflow": max(s.get("overflow", 0) for s in self.samples),
+            "saturated_ratio": round(saturated / len(checked_out), 3),
+        }
+
+    def _pool_class(self) -> Optional[str]:
+        return self.samples[0].get("pool_class") if self.samples else None
+
+class LoadScenario:
+    def __init__(self, client: httpx.AsyncClient, dataset: SeededDataset, config: LoadConfig) -> None:
+        self.client = client
+        self.dataset = dataset
+        self.config = config
+        self.recorder = LatencyRecorder()
+        self.rng = random.Random(config.seed)
+        # 医師が参照する回答中の患者と完了した検査結果
+        self.active_patients: Set[str] = set()
+        self.completed_results: List[str] = []
+        self.sessions = {"completed": 0, "failed": 0}
+
+    async def _request(self, step: str, method: str, url: str, **kwargs: Any) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await self.recorder.request(self.client, step, method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.recorder.record_failure(step, time.perf_counter() - started, type(e).__name__)
+            return None
+        return response if response.status_code < 400 else None
+
+    def _jitter(self, rng: random.Random, seconds: float) -> float:
+        return seconds * rng.uniform(0.5, 1.5)
+
+    async def ipad(self, index: int) -> None:
+        """
+        1台のiPad（1人の患者）の検査の実施
+        """
+        rng = random.Random(self.rng.random())
+        prefix = self.config.api_prefix
+        patient_id = str(self.dataset.patient_ids[index % len(self.dataset.patient_ids)])
+        await asyncio.sleep(rng.uniform(0, self.config.ramp_seconds))
+
+        for _ in range(self.config.sessions_per_ipad):
+            seeded = rng.choice(self.dataset.assessments)
+            response = await self._request(
+                "create_result", "POST", f"{prefix}/results/",
+                json={"patient_id": patient_id, "assessment_id": str(seeded.id)}
+            )
+            if response is None:
+                self.sessions["failed"] += 1
+                continue
+            result_id = response.json()["id"]
+            result_url = f"{prefix}/results/{result_id}"
+            self.active_patients.add(patient_id)
+            try:
+                if await self._request("start", "POST", f"{result_url}/start") is None:
+                    self.sessions["failed"] += 1
+                    continue
+                values = list(seeded.option_ids)
+                for question_id in seeded.question_ids:
+                    await asyncio.sleep(self._jitter(rng, self.config.answer_interval))
+                    value = rng.choice(values)
+                    # 失敗した回答はiPadの再送と同様に1回だけ再試行する
+                    for _attempt in range(2):
+                        answer = await self._request(
+                            "answer", "POST", f"{result_url}/answers",
+                            json={
+                                "result_id": result_id,
+                                "question_id": str(question_id),
+                                "selected_option_id": str(seeded.option_ids[value]),
+                                "value": value,
+                            }
+                        )
+                        if answer is not None:
+                            break
+                if await self._request("complete", "POST", f"{result_url}/complete") is None:
+                    self.sessions["failed"] += 1
+                    continue
+                self.completed_results.append(result_url)
+                self.sessions["completed"] += 1
+            finally:
+                self.active_patients.discard(patient_id)
+
+    async def doctor(self, stop: asyncio.Event) -> None:
+        """
+        医師の画面更新（終了までアクションを比率に従って繰り返す）
+        """
+        rng = random.Random(self.rng.random())
+        prefix = self.config.api_prefix
+        actions = [a for a in DOCTOR_ACTIONS if self.config.doctor_mix.get(a, 0) > 0]
+        weights = [self.config.doctor_mix[a] for a in actions]
+        while not stop.is_set():
+            action = rng.choices(actions, weights)[0]
+            if self.active_patients:
+                patient_id = rng.choice(sorted(self.active_patients))
+            else:
+                patient_id = str(rng.choice(self.dataset.patient_ids))
+            if action == "dashboard":
+                await self._request("doctor_dashboard", "GET", f"{prefix}/patients/{patient_id}/dashboard")
+            elif action == "progress":
+                await self._request("doctor_progress", "GET", f"{prefix}/patients/{patient_id}/progress")
+            elif action == "history":
+                await self._request(
+                    "doctor_history", "GET", f"{prefix}/patients/{patient_id}/assessments",
+                    params={"limit": 20}
+                )
+            elif self.completed_results:
+                await self._request("doctor_detail", "GET", rng.choice(self.completed_results))
+            try:
+                await asyncio.wait_for(stop.wait(), self._jitter(rng, self.config.doctor_interval))
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self) -> Dict[str, Any]:
+        stop = asyncio.Event()
+        sampler = PoolSampler()
+        background = [
+            asyncio.create_task(sampler.run(self.client, self.config.pool_sample_interval, stop)),
+            *(asyncio.create_task(self.doctor(stop)) for _ in range(self.config.doctors)),
+        ]
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(self.ipad(i) for i in range(self.config.ipads)))
+        finally:
+            stop.set()
+            await asyncio.gather(*background, return_exceptions=True)
+        elapsed = time.perf_counter() - started
+
+        report = self.recorder.summarize(elapsed, flows=self.sessions["completed"])
+        report["total"]["failed_flows"] = self.sessions["failed"]
+        report["pool"] = sampler.summarize()
+        return report
+
+async def bootstrap_via_api(client: httpx.AsyncClient, api_prefix: str, patients: int) -> SeededDataset:
+    """
+    起動済みのサーバー向けに検査と患者をAPIで作成する
+    """
+    dataset = SeededDataset()
+    for instrument in INSTRUMENTS:
+        response = await client.post(f"{api_prefix}/assessments/", json={
+            "name": instrument.name,
+            "type": instrument.type,
+            "cutoff": instrument.cutoff,
+            "max_score": instrument.max_score,
+            "questions": [
+                {"text": f"{instrument.type} 質問{i + 1}", "order": i}
+                for i in range(instrument.question_count)
+            ],
+            "options": [
+                {"text": f"選択肢{value}", "value": value, "order": i}
+                for i, value in enumerate(instrument.option_values)
+            ],
+        })
+        response.raise_for_status()
+        body = response.json()
+        dataset.assessments.append(SeededAssessment(
+            id=body["id"],
+            instrument=instrument,
+            question_ids=[q["id"] for q in sorted(body["questions"], key=lambda q: q["order"])],
+            option_ids={o["value"]: o["id"] for o in body["options"]}
+        ))
+    for index in range(patients):
+        response = await client.post(f"{api_prefix}/patients/", json={"name": f"負荷試験{index + 1:05d}"})
+        response.raise_for_status()
+        dataset.patient_ids.append(response.json()["id"])
+    return dataset
+
+def _parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in DOCTOR_ACTIONS:
+            raise argparse.ArgumentTypeError(f"未対応のアクションです: {name}（{', '.join(DOCTOR_ACTIONS)}）")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load", description="朝の受付時の集中の負荷試験")
+    parser.add_argument("--base-url", default=None, help="起動済みのサーバー（未指定の場合はプロセス内のASGIアプリ）")
+    parser.add_argument("--api-prefix", default="/api/v1")
+    add_database_arguments(parser)
+    add_dataset_arguments(parser, patients=100)
+    parser.add_argument("--ipads", type=int, default=30, help="同時に回答するiPadの台数")
+    parser.add_argument("--doctors", type=int, default=4, help="画面を更新する医師の人数")
+    parser.add_argument("--sessions-per-ipad", type=int, default=1, help="iPadあたりの検査数")
+    parser.add_argument("--ramp", type=float, default=5.0, help="全iPadが検査を開始するまでの秒数")
+    parser.add_argument("--answer-interval", type=float, default=0.3, help="回答の間隔（秒）")
+    parser.add_argument("--doctor-interval", type=float, default=1.0, help="医師の画面更新の間隔（秒）")
+    parser.add_argument(
+        "--doctor-mix",
+        type=_parse_mix,
+        default="dashboard=4,progress=3,history=2,detail=1",
+        help="医師のアクションの比率"
+    )
+    parser.add_argument("--output", default=None, help="結果を保存するJSONファイル")
+    return parser.parse_args(argv)
+
+def format_pool(pool: Dict[str, Any]) -> str:
+    if "peak_checked_out" not in pool:
+        return f"pool: {pool.get('pool_class')} (no queue statistics, {pool['samples']} samples)"
+    return (
+        f"pool: {pool['pool_class']} peak {pool['peak_checked_out']}/{pool['pool_limit']} checked out"
+        f" (mean {pool['mean_checked_out']}, peak overflow {pool['peak_overflow']}),"
+        f" saturated in {pool['saturated_ratio'] * 100:.1f}% of {pool['samples']} samples"
+    )
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    load_config = LoadConfig(
+        ipads=args.ipads,
+        doctors=args.doctors,
+        sessions_per_ipad=args.sessions_per_ipad,
+        ramp_seconds=args.ramp,
+        answer_interval=args.answer_interval,
+        doctor_interval=args.doctor_interval,
+        doctor_mix=args.doctor_mix,
+        seed=args.seed,
+        api_prefix=args.api_prefix
+    )
+    workdir = None
+    if args.base_url is None:
+        # アプリケーションは読み込み時に設定を参照するため、読み込む前に環境変数を設定する
+        workdir = configure_database(args)
+
+    async def run() -> Dict[str, Any]:
+        timeout = httpx.Timeout(load_config.request_timeout)
+        # iPadと医師の同時接続数を制限しない（サーバー側の競合を計測するため）
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        if args.base_url is not None:
+            async with httpx.AsyncClient(base_url=args.base_url, timeout=timeout, limits=limits) as client:
+                dataset = await bootstrap_via_api(client, args.api_prefix, max(args.patients, args.ipads))
+                return await LoadScenario(client, dataset, load_config).run()
+
+        from app.database import engine
+        from app.main import app
+
+        try:
+            dataset = await prepare_database(dataset_config(args))
+            # 500エラーも例外にせずレスポンスとして集計する
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+            async with app.router.lifespan_context(app):
+                async with httpx.AsyncClient(
+                    transport=transport,
+                    base_url="http://load-test",
+                    timeout=timeout
+                ) as client:
+                    return await LoadScenario(client, dataset, load_config).run()
+        finally:
+            await engine.dispose()
+
+    try:
+        report = asyncio.run(run())
+    finally:
+        if workdir is not None:
+            workdir.cleanup()
+
+    report["config"] = {
+        "target": args.base_url or args.database_url.split("://", 1)[0],
+        "load": vars(load_config),
+    }
+    print(format_report(report))
+    print(format_pool(report["pool"]))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
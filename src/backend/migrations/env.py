@@ -15,6 +15,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 # モデルのメタデータをインポート
 from app.database import Base
 from app.database import SQLALCHEMY_DATABASE_URL
+import app.models  # noqa: F401  モデルをメタデータに登録する
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
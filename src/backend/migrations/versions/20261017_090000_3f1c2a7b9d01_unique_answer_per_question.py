@@ -0,0 +1,64 @@
+"""unique answer per question
+
+Revision ID: 3f1c2a7b9d01
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000+09:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a7b9d01'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 重複した回答は最新のもののみ残す
+    op.execute(
+        sa.text(
+            """
+            DELETE FROM answer_details
+            WHERE id IN (
+                SELECT older.id
+                FROM answer_details AS older
+                JOIN answer_details AS newer
+                  ON older.result_id = newer.result_id
+                 AND older.question_id = newer.question_id
+                 AND (
+                      older.answered_at < newer.answered_at
+                      OR (older.answered_at = newer.answered_at AND older.id < newer.id)
+                 )
+            )
+            """
+        )
+    )
+    # 重複を含めて計算されていた合計スコアを再計算する
+    op.execute(
+        sa.text(
+            """
+            UPDATE assessment_results
+            SET total_score = (
+                SELECT COALESCE(SUM(answer_details.value), 0)
+                FROM answer_details
+                WHERE answer_details.result_id = assessment_results.id
+            )
+            WHERE status = 'COMPLETED'
+            """
+        )
+    )
+    op.create_index(
+        'uq_answer_details_result_question',
+        'answer_details',
+        ['result_id', 'question_id'],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_answer_details_result_question', table_name='answer_details')
@@ -0,0 +1,50 @@
+"""add hot query indexes
+
+Revision ID: 8b4e6d2c1a57
+Revises: 3f1c2a7b9d01
+Create Date: 2026-10-17 09:30:00.000000+09:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b4e6d2c1a57'
+down_revision: Union[str, None] = '3f1c2a7b9d01'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_patients_created_at_id', 'patients', ['created_at', 'id'])
+    op.create_index('ix_assessments_type', 'assessments', ['type'])
+    op.create_index('ix_questions_assessment_id_order', 'questions', ['assessment_id', 'order'])
+    op.create_index('ix_options_assessment_id_order', 'options', ['assessment_id', 'order'])
+    op.create_index(
+        'ix_assessment_results_patient_status_completed',
+        'assessment_results',
+        ['patient_id', 'status', 'completed_at']
+    )
+    op.create_index(
+        'ix_assessment_results_patient_created',
+        'assessment_results',
+        ['patient_id', 'created_at']
+    )
+    op.create_index(
+        'ix_assessment_results_assessment_status_score',
+        'assessment_results',
+        ['assessment_id', 'status', 'total_score']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_assessment_results_assessment_status_score', table_name='assessment_results')
+    op.drop_index('ix_assessment_results_patient_created', table_name='assessment_results')
+    op.drop_index('ix_assessment_results_patient_status_completed', table_name='assessment_results')
+    op.drop_index('ix_options_assessment_id_order', table_name='options')
+    op.drop_index('ix_questions_assessment_id_order', table_name='questions')
+    op.drop_index('ix_assessments_type', table_name='assessments')
+    op.drop_index('ix_patients_created_at_id', table_name='patients')
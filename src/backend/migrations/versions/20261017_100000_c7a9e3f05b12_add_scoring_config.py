@@ -0,0 +1,30 @@
+"""add scoring config and subscale scores
+
+Revision ID: c7a9e3f05b12
+Revises: 8b4e6d2c1a57
+Create Date: 2026-10-17 10:00:00.000000+09:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7a9e3f05b12'
+down_revision: Union[str, None] = '8b4e6d2c1a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('assessments', sa.Column('scoring_config', sa.JSON(), nullable=True))
+    op.add_column('assessment_results', sa.Column('subscale_scores', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('assessment_results') as batch_op:
+        batch_op.drop_column('subscale_scores')
+    with op.batch_alter_table('assessments') as batch_op:
+        batch_op.drop_column('scoring_config')
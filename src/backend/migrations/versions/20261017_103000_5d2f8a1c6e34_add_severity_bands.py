@@ -0,0 +1,27 @@
+"""add severity bands
+
+Revision ID: 5d2f8a1c6e34
+Revises: c7a9e3f05b12
+Create Date: 2026-10-17 10:30:00.000000+09:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2f8a1c6e34'
+down_revision: Union[str, None] = 'c7a9e3f05b12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('assessments', sa.Column('severity_bands', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('assessments') as batch_op:
+        batch_op.drop_column('severity_bands')
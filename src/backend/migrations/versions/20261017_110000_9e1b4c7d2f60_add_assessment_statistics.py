@@ -0,0 +1,81 @@
+"""add assessment statistics rollup
+
+Revision ID: 9e1b4c7d2f60
+Revises: 5d2f8a1c6e34
+Create Date: 2026-10-17 11:00:00.000000+09:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.base import GUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e1b4c7d2f60'
+down_revision: Union[str, None] = '5d2f8a1c6e34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'assessment_statistics',
+        sa.Column('assessment_id', GUID(), nullable=False),
+        sa.Column('total_results', sa.BigInteger(), nullable=False),
+        sa.Column('completed_count', sa.BigInteger(), nullable=False),
+        sa.Column('scored_count', sa.BigInteger(), nullable=False),
+        sa.Column('score_sum', sa.BigInteger(), nullable=False),
+        sa.Column('score_sum_squares', sa.BigInteger(), nullable=False),
+        sa.Column('min_score', sa.Integer(), nullable=True),
+        sa.Column('max_score', sa.Integer(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['assessment_id'], ['assessments.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('assessment_id')
+    )
+    op.create_table(
+        'assessment_score_buckets',
+        sa.Column('assessment_id', GUID(), nullable=False),
+        sa.Column('score', sa.Integer(), nullable=False),
+        sa.Column('count', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['assessment_id'], ['assessments.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('assessment_id', 'score')
+    )
+
+    # 既存の検査結果から集計する（以降は検査結果の作成・完了時に差分更新される）
+    op.execute(
+        """
+        INSERT INTO assessment_statistics (
+            assessment_id, total_results, completed_count, scored_count,
+            score_sum, score_sum_squares, min_score, max_score, updated_at
+        )
+        SELECT
+            assessment_id,
+            COUNT(id),
+            SUM(CASE WHEN status = 'COMPLETED' THEN 1 ELSE 0 END),
+            COUNT(CASE WHEN status = 'COMPLETED' THEN total_score END),
+            COALESCE(SUM(CASE WHEN status = 'COMPLETED' THEN total_score END), 0),
+            COALESCE(SUM(CASE WHEN status = 'COMPLETED' THEN total_score * total_score END), 0),
+            MIN(CASE WHEN status = 'COMPLETED' THEN total_score END),
+            MAX(CASE WHEN status = 'COMPLETED' THEN total_score END),
+            CURRENT_TIMESTAMP
+        FROM assessment_results
+        GROUP BY assessment_id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO assessment_score_buckets (assessment_id, score, count)
+        SELECT assessment_id, total_score, COUNT(id)
+        FROM assessment_results
+        WHERE status = 'COMPLETED' AND total_score IS NOT NULL
+        GROUP BY assessment_id, total_score
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('assessment_score_buckets')
+    op.drop_table('assessment_statistics')
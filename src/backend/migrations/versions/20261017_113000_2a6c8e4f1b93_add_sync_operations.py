@@ -0,0 +1,45 @@
+"""add sync operations
+
+Revision ID: 2a6c8e4f1b93
+Revises: 9e1b4c7d2f60
+Create Date: 2026-10-17 11:30:00.000000+09:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.base import GUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2a6c8e4f1b93'
+down_revision: Union[str, None] = '9e1b4c7d2f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sync_operations',
+        sa.Column('idempotency_key', sa.String(length=100), nullable=False),
+        sa.Column('device_id', sa.String(length=100), nullable=True),
+        sa.Column('result_id', GUID(), nullable=False),
+        sa.Column('operation', sa.String(length=20), nullable=False),
+        sa.Column('client_timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('applied_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['result_id'], ['assessment_results.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('idempotency_key')
+    )
+    op.create_index(
+        'ix_sync_operations_result_id',
+        'sync_operations',
+        ['result_id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sync_operations_result_id', table_name='sync_operations')
+    op.drop_table('sync_operations')
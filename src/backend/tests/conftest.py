@@ -0,0 +1,65 @@
+"""
+テスト共通のフィクスチャ
+
+アプリケーションの読み込み前に一時ディレクトリのSQLiteを設定し、起動時にテーブルを作成する
+"""
+import os
+import tempfile
+import time
+
+_DB_DIR = tempfile.mkdtemp(prefix="scale_app_test_")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ["DB_AUTO_CREATE"] = "1"
+
+import httpx
+import pytest
+
+from app.main import app
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+async def client():
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c
+
+@pytest.fixture
+async def assessment(client):
+    """
+    4択・9問の検査
+    """
+    response = await client.post("/api/v1/assessments/", json={
+        "name": "PHQ-9（うつ病検査）",
+        "type": "PHQ-9",
+        "cutoff": 10,
+        "max_score": 27,
+        "questions": [{"text": f"質問{i + 1}", "order": i} for i in range(9)],
+        "options": [{"text": f"選択肢{i}", "value": i, "order": i} for i in range(4)],
+    })
+    assert response.status_code == 201, response.text
+    return response.json()
+
+@pytest.fixture
+async def patient(client):
+    response = await client.post("/api/v1/patients/", json={"name": "テスト患者"})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+@pytest.fixture
+def server_timezone():
+    """
+    サーバーのタイムゾーンをUTC以外にする（ローカル時刻の混在を検出するため）
+    """
+    original = os.environ.get("TZ")
+    os.environ["TZ"] = "Asia/Tokyo"
+    time.tzset()
+    yield
+    if original is None:
+        os.environ.pop("TZ", None)
+    else:
+        os.environ["TZ"] = original
+    time.tzset()
@@ -0,0 +1,72 @@
+from uuid import uuid4
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+async def result_id(client, assessment, patient):
+    response = await client.post("/api/v1/results/", json={
+        "patient_id": patient["id"],
+        "assessment_id": assessment["id"],
+    })
+    result_id = response.json()["id"]
+    assert (await client.post(f"/api/v1/results/{result_id}/start")).status_code == 200
+    return result_id
+
+def _answer(assessment, question_index: int, value: int) -> dict:
+    option = next(o for o in assessment["options"] if o["value"] == value)
+    return {
+        "question_id": assessment["questions"][question_index]["id"],
+        "selected_option_id": option["id"],
+        "value": value,
+    }
+
+async def test_batch_ack_counts_distinct_questions(client, assessment, result_id):
+    answers = [_answer(assessment, 0, 1), _answer(assessment, 1, 2), _answer(assessment, 0, 3)]
+    response = await client.post(f"/api/v1/results/{result_id}/answers/batch", json={"answers": answers})
+    assert response.status_code == 201, response.text
+    assert response.json()["accepted"] == 2
+
+    result = (await client.get(f"/api/v1/results/{result_id}")).json()
+    values = {a["question_id"]: a["value"] for a in result["answer_details"]}
+    assert values == {
+        assessment["questions"][0]["id"]: 3,
+        assessment["questions"][1]["id"]: 2,
+    }
+
+@pytest.mark.parametrize("override", [
+    {"value": 2},
+    {"selected_option_id": None},
+    {"question_id": None},
+])
+async def test_invalid_answers_are_rejected(client, assessment, result_id, override):
+    invalid = {**_answer(assessment, 0, 1), **override}
+    for key, value in override.items():
+        if value is None:
+            invalid[key] = str(uuid4())
+
+    url = f"/api/v1/results/{result_id}/answers"
+    batch = await client.post(f"{url}/batch", json={"answers": [_answer(assessment, 1, 1), invalid]})
+    assert batch.status_code == 400
+    single = await client.post(url, json={**invalid, "result_id": result_id})
+    assert single.status_code == 400
+
+    result = (await client.get(f"/api/v1/results/{result_id}")).json()
+    assert result["answer_details"] == []
+
+async def test_answer_timestamps_use_one_utc_clock(client, assessment, result_id):
+    from datetime import datetime, timedelta, timezone
+
+    url = f"/api/v1/results/{result_id}/answers/batch"
+    await client.post(url, json={"answers": [_answer(assessment, 0, 1)]})
+    # 同じ質問への再回答はON CONFLICTの更新になる
+    await client.post(url, json={"answers": [_answer(assessment, 0, 2)]})
+
+    result = (await client.get(f"/api/v1/results/{result_id}")).json()
+    (answer,) = result["answer_details"]
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    for name in ("created_at", "updated_at", "answered_at"):
+        value = datetime.fromisoformat(answer[name]).replace(tzinfo=None)
+        assert abs(now - value) < timedelta(minutes=1), name
+    assert answer["updated_at"] > answer["created_at"]
@@ -0,0 +1,53 @@
+import pytest
+
+from app.api import middleware
+from app.api.middleware import MetricsMiddleware
+from app.services.metrics import MetricsRegistry
+
+pytestmark = pytest.mark.anyio
+
+def _app(content_type: bytes):
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", content_type)],
+        })
+        await send({"type": "http.response.body", "body": b"data: {}\n\n"})
+    return app
+
+async def _call(app, scope_type: str = "http") -> None:
+    scope = {"type": scope_type, "method": "GET", "path": "/events", "app": None}
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(middleware, "metrics_registry", registry)
+    return registry
+
+async def test_sse_connections_are_not_recorded_as_request_latency(registry):
+    await _call(MetricsMiddleware(_app(b"text/event-stream; charset=utf-8")))
+    rendered = registry.render()
+    assert 'scale_app_stream_connections_total{protocol="sse",route="unmatched"} 1' in rendered
+    assert "scale_app_http_request_duration_seconds_count" not in rendered
+
+async def test_regular_responses_are_recorded_as_request_latency(registry):
+    await _call(MetricsMiddleware(_app(b"application/json")))
+    rendered = registry.render()
+    assert 'scale_app_http_request_duration_seconds_count{method="GET",route="unmatched"} 1' in rendered
+    assert "scale_app_stream_connections_total{" not in rendered
+
+async def test_websocket_connections_are_recorded_as_streams(registry):
+    async def app(scope, receive, send):
+        pass
+
+    await _call(MetricsMiddleware(app), scope_type="websocket")
+    assert 'scale_app_stream_connections_total{protocol="websocket",route="unmatched"} 1' in registry.render()
@@ -0,0 +1,31 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+@pytest.mark.parametrize("params", [
+    {"limit": 0},
+    {"limit": -1},
+    {"limit": 101},
+    {"skip": -1},
+    {"cursor": "", "limit": 0},
+])
+async def test_pagination_params_out_of_range_are_rejected(client, params):
+    response = await client.get("/api/v1/patients/", params=params)
+    assert response.status_code == 422
+
+async def test_cursor_pagination_walks_all_pages(client):
+    created = set()
+    for i in range(5):
+        response = await client.post("/api/v1/patients/", json={"name": f"ページ{i}"})
+        created.add(response.json()["id"])
+
+    seen = []
+    params = {"cursor": "", "limit": 2}
+    while True:
+        page = (await client.get("/api/v1/patients/", params=params)).json()
+        seen.extend(item["id"] for item in page["items"])
+        if not page["has_next"]:
+            break
+        params["cursor"] = page["next_cursor"]
+    assert created <= set(seen)
+    assert len(seen) == len(set(seen))
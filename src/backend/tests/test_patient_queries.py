@@ -0,0 +1,31 @@
+import pytest
+
+from app.crud import patient as patient_crud
+from app.database import AsyncSessionLocal
+from app.models.base import AssessmentStatus
+
+pytestmark = pytest.mark.anyio
+
+async def test_active_and_completed_assessments_split_by_status(client, assessment, patient):
+    ids = []
+    for _ in range(2):
+        response = await client.post("/api/v1/results/", json={
+            "patient_id": patient["id"],
+            "assessment_id": assessment["id"],
+        })
+        ids.append(response.json()["id"])
+    completed_id, active_id = ids
+    await client.post(f"/api/v1/results/{completed_id}/start")
+    assert (await client.post(f"/api/v1/results/{completed_id}/complete")).status_code == 200
+
+    async with AsyncSessionLocal() as db:
+        active = await patient_crud.get_active_assessments(db, patient["id"])
+        completed = await patient_crud.get_completed_assessments(db, patient["id"])
+        history = await patient_crud.get_assessment_history(db, patient["id"], assessment["type"])
+    assert [str(r.id) for r in active] == [active_id]
+    assert [str(r.id) for r in completed] == [completed_id]
+    assert [str(r.id) for r in history] == [completed_id]
+    assert all(r.status == AssessmentStatus.COMPLETED for r in history)
+
+    dashboard = (await client.get(f"/api/v1/patients/{patient['id']}/dashboard")).json()
+    assert dashboard["instruments"][0]["result_count"] == 1
@@ -0,0 +1,36 @@
+import threading
+
+import httpx
+import pytest
+from fastapi import APIRouter, FastAPI
+
+from app.api.responses import TimedRoute, serialization_stats
+
+pytestmark = pytest.mark.anyio
+
+def _app() -> FastAPI:
+    router = APIRouter(route_class=TimedRoute)
+
+    @router.get("/sync")
+    def sync_endpoint():
+        return {"thread": threading.current_thread().name}
+
+    @router.get("/async")
+    async def async_endpoint():
+        return {"thread": threading.current_thread().name}
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+@pytest.mark.parametrize("path", ["/sync", "/async"])
+async def test_timed_route_supports_sync_and_async_endpoints(path):
+    transport = httpx.ASGITransport(app=_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(path)
+    assert response.status_code == 200
+    assert "serialize;dur=" in response.headers["server-timing"]
+    assert f"GET {path}" in serialization_stats.snapshot()
+    # 同期関数のエンドポイントはスレッドプールで実行される
+    on_main_thread = response.json()["thread"] == threading.main_thread().name
+    assert on_main_thread is (path == "/async")
@@ -0,0 +1,142 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.services.scoring import ScoringEngine
+
+def _definition(assessment_id, question_ids, scoring_config=None):
+    return SimpleNamespace(
+        id=assessment_id,
+        scoring_config=scoring_config,
+        questions=[SimpleNamespace(id=qid, order=i) for i, qid in enumerate(question_ids)],
+        options=[SimpleNamespace(value=v) for v in range(4)],
+    )
+
+def test_engine_recompiles_when_scoring_config_changes():
+    engine = ScoringEngine()
+    assessment_id = uuid4()
+    question_ids = [uuid4() for _ in range(3)]
+    answers = [(qid, 1) for qid in question_ids]
+
+    original = _definition(assessment_id, question_ids)
+    assert engine.get(original).score_answers(answers)[0] == 3
+    assert engine.get(_definition(assessment_id, question_ids)) is engine.get(original)
+
+    # 同じIDの定義でも採点設定が変われば再コンパイルする（JSONの文字列キーも同じ設定とみなす）
+    updated = _definition(assessment_id, question_ids, {"weights": {"0": 2.0}})
+    assert engine.get(updated).score_answers(answers)[0] == 4
+    same = _definition(assessment_id, question_ids, {"weights": {0: 2.0}})
+    assert engine.get(same) is engine.get(updated)
+
+def _answers(question_ids, values):
+    return [(qid, value) for qid, value in zip(question_ids, values) if value is not None]
+
+def test_plain_sum_and_weights():
+    question_ids = [uuid4() for _ in range(4)]
+    answers = _answers(question_ids, [0, 1, 2, 3])
+
+    plain = ScoringEngine().get(_definition(uuid4(), question_ids))
+    assert plain.score_answers(answers) == (6, {})
+
+    weighted = ScoringEngine().get(_definition(uuid4(), question_ids, {"weights": {1: 2.0, 3: 0.5}}))
+    # 0 + 1*2 + 2 + 3*0.5 = 5.5、0 + 1*2 + 2 + 1*0.5 = 4.5 -> 偶数丸めで6・4
+    assert weighted.score_answers(answers) == (6, {})
+    assert weighted.score_answers(_answers(question_ids, [0, 1, 2, 1])) == (4, {})
+
+def test_reverse_items_use_option_range_or_custom_offset():
+    question_ids = [uuid4() for _ in range(3)]
+    answers = _answers(question_ids, [0, 1, 3])
+
+    # 選択肢0〜3の逆転は 3 - 値
+    reverse = ScoringEngine().get(_definition(uuid4(), question_ids, {"reverse_items": [0, 2]}))
+    assert reverse.score_answers(answers) == (3 + 1 + 0, {})
+
+    custom = ScoringEngine().get(_definition(uuid4(), question_ids, {
+        "reverse_items": [0],
+        "reverse_offset": 5,
+        "weights": {0: 2.0},
+    }))
+    assert custom.score_answers(answers) == (2 * (5 - 0) + 1 + 3, {})
+
+def test_unanswered_and_unknown_questions_contribute_nothing():
+    question_ids = [uuid4() for _ in range(3)]
+    compiled = ScoringEngine().get(_definition(uuid4(), question_ids, {"reverse_items": [0, 1]}))
+
+    # 未回答の逆転項目に基準値は加算しない
+    assert compiled.score_answers(_answers(question_ids, [None, 1, 2])) == (2 + 2, {})
+    assert compiled.score_answers([(uuid4(), 3)]) == (0, {})
+    assert compiled.score_answers([]) == (0, {})
+
+def test_subscales_apply_weights_and_reverse_items():
+    question_ids = [uuid4() for _ in range(4)]
+    compiled = ScoringEngine().get(_definition(uuid4(), question_ids, {
+        "reverse_items": [1],
+        "weights": {3: 1.5},
+        "subscales": {"a": [0, 1], "b": [2, 3], "empty": []},
+    }))
+    total, subscales = compiled.score_answers(_answers(question_ids, [1, 1, 2, 3]))
+    assert subscales == {"a": 1 + 2, "b": 2 + 4.5, "empty": 0}
+    assert total == round(1 + 2 + 2 + 4.5)
+
+def test_score_results_matches_single_result_scoring():
+    question_ids = [uuid4() for _ in range(4)]
+    definition = _definition(uuid4(), question_ids, {
+        "reverse_items": [2],
+        "weights": {0: 2.0},
+        "subscales": {"a": [0, 2], "b": [1, 3]},
+    })
+    engine = ScoringEngine()
+    compiled = engine.get(definition)
+
+    answer_sets = {
+        uuid4(): _answers(question_ids, [3, 2, 1, 0]),
+        uuid4(): _answers(question_ids, [None, 3, None, 3]),
+        uuid4(): _answers(question_ids, [0, 0, 0, 0]) + [(uuid4(), 3)],
+    }
+    rows = [
+        (result_id, question_id, value)
+        for result_id, answers in answer_sets.items()
+        for question_id, value in answers
+    ]
+    scores = engine.score_results(definition, rows)
+
+    assert scores == {
+        result_id: compiled.score_answers(answers)
+        for result_id, answers in answer_sets.items()
+    }
+    assert scores[next(iter(answer_sets))] == (6 + 2 + 2 + 0, {"a": 8, "b": 2})
+    assert engine.score_results(definition, []) == {}
+
+@pytest.mark.anyio
+async def test_completed_result_uses_scoring_config(client, patient):
+    response = await client.post("/api/v1/assessments/", json={
+        "name": "逆転項目つき検査",
+        "type": "REVERSE-4",
+        "cutoff": 5,
+        "max_score": 12,
+        "scoring_config": {"reverse_items": [1, 3], "subscales": {"a": [0, 1], "b": [2, 3]}},
+        "questions": [{"text": f"質問{i + 1}", "order": i} for i in range(4)],
+        "options": [{"text": f"選択肢{i}", "value": i, "order": i} for i in range(4)],
+    })
+    assert response.status_code == 201, response.text
+    definition = response.json()
+    options = {o["value"]: o["id"] for o in definition["options"]}
+
+    response = await client.post("/api/v1/results/", json={
+        "patient_id": patient["id"],
+        "assessment_id": definition["id"],
+    })
+    result_id = response.json()["id"]
+    await client.post(f"/api/v1/results/{result_id}/start")
+    answers = [
+        {"question_id": q["id"], "selected_option_id": options[value], "value": value}
+        for q, value in zip(definition["questions"], [3, 0, 1, 2])
+    ]
+    response = await client.post(f"/api/v1/results/{result_id}/answers/batch", json={"answers": answers})
+    assert response.status_code == 201, response.text
+    assert (await client.post(f"/api/v1/results/{result_id}/complete")).status_code == 200
+
+    result = (await client.get(f"/api/v1/results/{result_id}")).json()
+    assert result["total_score"] == 3 + (3 - 0) + 1 + (3 - 2)
+    assert result["subscale_scores"] == {"a": 6, "b": 2}
@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.schemas.assessment import SeverityBand
+from app.services.severity import SeverityClassifier, compile_severity, default_bands
+
+PHQ9_BANDS = [
+    {"label": "minimal", "min_score": 0},
+    {"label": "mild", "min_score": 5},
+    {"label": "moderate", "min_score": 10},
+    {"label": "moderately_severe", "min_score": 15},
+    {"label": "severe", "min_score": 20},
+]
+
+def _baseline_severity(score, cutoff, max_score):
+    """
+    区分表導入前の重症度判定（既定区分はこれと同じ結果になること）
+    """
+    score = score or 0
+    if score >= cutoff:
+        if score >= max_score * 0.8:
+            return "severe"
+        elif score >= max_score * 0.6:
+            return "moderate"
+        else:
+            return "mild"
+    return "normal"
+
+@pytest.mark.parametrize("cutoff,max_score", [
+    (10, 27),  # PHQ-9
+    (10, 21),  # GAD-7（60%・80%が小数）
+    (5, 10),  # 60%・80%がちょうど整数
+    (20, 27),  # カットオフが60%を超える
+    (25, 27),  # カットオフが80%を超える
+    (0, 0),
+])
+def test_default_bands_match_baseline_severity(cutoff, max_score):
+    compiled = compile_severity(cutoff, max_score)
+    scores = [None] + list(range(max_score + 2))
+    assert compiled.classify_many(scores) == [
+        _baseline_severity(score, cutoff, max_score) for score in scores
+    ]
+
+def test_score_on_a_threshold_belongs_to_that_band():
+    compiled = compile_severity(10, 27, PHQ9_BANDS)
+    assert compiled.classify_many([4, 5, 9.5, 10, 14, 15, 19, 20, 27]) == [
+        "minimal", "mild", "mild", "moderate", "moderate",
+        "moderately_severe", "moderately_severe", "severe", "severe",
+    ]
+
+def test_scores_below_the_lowest_band_use_the_first_band():
+    compiled = compile_severity(10, 27, [
+        {"label": "low", "min_score": 3},
+        {"label": "high", "min_score": 10},
+    ])
+    assert compiled.classify_many([None, 0, 2.9, 3, 10]) == ["low", "low", "low", "low", "high"]
+
+def test_unsorted_bands_are_sorted_by_min_score():
+    shuffled = [PHQ9_BANDS[i] for i in (3, 0, 4, 2, 1)]
+    compiled = compile_severity(10, 27, shuffled)
+    assert compiled.labels == tuple(band["label"] for band in PHQ9_BANDS)
+    assert compiled.classify_many([0, 5, 10, 15, 20]) == list(compiled.labels)
+
+@pytest.mark.parametrize("bands", [None, []])
+def test_missing_or_empty_bands_fall_back_to_defaults(bands):
+    compiled = compile_severity(10, 27, bands)
+    expected = compile_severity(10, 27, default_bands(10, 27))
+    assert compiled.labels == expected.labels == ("normal", "mild", "moderate", "severe")
+    assert compiled.thresholds.tolist() == expected.thresholds.tolist()
+
+def test_model_and_dict_bands_classify_the_same():
+    models = [SeverityBand.model_validate(band) for band in PHQ9_BANDS]
+    scores = list(range(28))
+    assert compile_severity(10, 27, models).classify_many(scores) == \
+        compile_severity(10, 27, PHQ9_BANDS).classify_many(scores)
+    assert compile_severity(10, 27, PHQ9_BANDS).classify_many([]) == []
+
+def test_classifier_recompiles_when_bands_change():
+    classifier = SeverityClassifier()
+    assessment = SimpleNamespace(id=uuid4(), cutoff=10, max_score=27, severity_bands=None)
+    assert classifier.classify(assessment, 12) == "mild"
+    assert classifier.get(assessment) is classifier.get(assessment)
+
+    assessment.severity_bands = PHQ9_BANDS
+    assert classifier.classify(assessment, 12) == "moderate"
+    assessment.cutoff = 12
+    assessment.severity_bands = None
+    assert classifier.classify_many(assessment, [11, 12, 17, 22]) == ["normal", "mild", "moderate", "severe"]
+
+@pytest.mark.anyio
+async def test_result_severity_level_uses_the_classifier(client, assessment, patient):
+    response = await client.post("/api/v1/results/", json={
+        "patient_id": patient["id"],
+        "assessment_id": assessment["id"],
+    })
+    result_id = response.json()["id"]
+    await client.post(f"/api/v1/results/{result_id}/start")
+    option = next(o for o in assessment["options"] if o["value"] == 2)
+    # 2点×9問 = 18点（27点の60%以上・80%未満）
+    await client.post(f"/api/v1/results/{result_id}/answers/batch", json={"answers": [
+        {"question_id": q["id"], "selected_option_id": option["id"], "value": 2}
+        for q in assessment["questions"]
+    ]})
+    await client.post(f"/api/v1/results/{result_id}/complete")
+
+    result = (await client.get(f"/api/v1/results/{result_id}")).json()
+    assert result["total_score"] == 18
+    assert result["severity_level"] == _baseline_severity(18, 10, 27) == "moderate"
@@ -0,0 +1,50 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+async def _complete_result(client, assessment, patient, value: int) -> dict:
+    """
+    検査結果の作成から全問回答・完了まで
+    """
+    response = await client.post("/api/v1/results/", json={
+        "patient_id": patient["id"],
+        "assessment_id": assessment["id"],
+    })
+    assert response.status_code == 201, response.text
+    result_id = response.json()["id"]
+    assert (await client.post(f"/api/v1/results/{result_id}/start")).status_code == 200
+    option = next(o for o in assessment["options"] if o["value"] == value)
+    response = await client.post(f"/api/v1/results/{result_id}/answers/batch", json={
+        "answers": [
+            {"question_id": q["id"], "selected_option_id": option["id"], "value": value}
+            for q in assessment["questions"]
+        ]
+    })
+    assert response.status_code == 201, response.text
+    response = await client.post(f"/api/v1/results/{result_id}/complete")
+    assert response.status_code == 200, response.text
+    return response.json()
+
+async def test_statistics_cache_counts_results_created_while_warm(client, assessment, patient):
+    await _complete_result(client, assessment, patient, 1)
+    url = f"/api/v1/assessments/{assessment['id']}/statistics"
+    first = (await client.get(url)).json()
+    assert first["total_attempts"] == 1
+    assert first["completion_rate"] == 100.0
+
+    # キャッシュ済みの状態で作成・完了した結果も差分更新で反映される
+    await _complete_result(client, assessment, patient, 3)
+    second = (await client.get(url)).json()
+    assert second["total_attempts"] == 2
+    assert second["completion_rate"] == 100.0
+    assert second["average_score"] == 18.0
+
+    # 未完了の結果は完了率のみに反映される
+    response = await client.post("/api/v1/results/", json={
+        "patient_id": patient["id"],
+        "assessment_id": assessment["id"],
+    })
+    assert response.status_code == 201
+    third = (await client.get(url)).json()
+    assert third["total_attempts"] == 2
+    assert third["completion_rate"] == pytest.approx(200 / 3)
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.crud.sync import sync as sync_crud
+
+pytestmark = pytest.mark.anyio
+
+async def _create_result(client, assessment, patient) -> str:
+    response = await client.post("/api/v1/results/", json={
+        "patient_id": patient["id"],
+        "assessment_id": assessment["id"],
+    })
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+def _operation(op_type: str, result_id: str, **fields) -> dict:
+    return {
+        "op_id": str(uuid4()),
+        "type": op_type,
+        "result_id": result_id,
+        "client_timestamp": datetime.now(timezone.utc).isoformat(),
+        **fields,
+    }
+
+def _answer(assessment, question_index: int, value: int, option_value: int = None) -> dict:
+    option_value = value if option_value is None else option_value
+    option = next(o for o in assessment["options"] if o["value"] == option_value)
+    return {
+        "question_id": assessment["questions"][question_index]["id"],
+        "selected_option_id": option["id"],
+        "value": value,
+    }
+
+async def test_sync_applies_queue_and_replay_is_duplicate(client, assessment, patient):
+    result_id = await _create_result(client, assessment, patient)
+    operations = [_operation("start", result_id)]
+    operations += [
+        _operation("answer", result_id, answers=[_answer(assessment, i, 2)])
+        for i in range(len(assessment["questions"]))
+    ]
+    operations.append(_operation("complete", result_id))
+    body = {"device_id": "ipad-1", "operations": operations}
+
+    first = (await client.post("/api/v1/sync", json=body)).json()
+    assert first["applied"] == len(operations)
+    result = (await client.get(f"/api/v1/results/{result_id}")).json()
+    assert result["status"] == "completed"
+    assert result["total_score"] == 2 * len(assessment["questions"])
+
+    replay = (await client.post("/api/v1/sync", json=body)).json()
+    assert replay["duplicates"] == len(operations)
+    assert replay["applied"] == 0
+
+async def test_sync_detects_duplicates_recorded_concurrently(client, assessment, patient, monkeypatch):
+    result_id = await _create_result(client, assessment, patient)
+    body = {"operations": [_operation("start", result_id)]}
+    assert (await client.post("/api/v1/sync", json=body)).json()["applied"] == 1
+
+    # 事前の確認の後に別のリクエストで記録された場合も一意制約で重複と判定する
+    async def no_applied_keys(db, keys):
+        return set()
+    monkeypatch.setattr(sync_crud, "get_applied_keys", no_applied_keys)
+    response = (await client.post("/api/v1/sync", json=body)).json()
+    assert response["results"][0]["status"] == "duplicate"
+
+async def test_sync_rejects_invalid_operations_individually(client, assessment, patient):
+    result_id = await _create_result(client, assessment, patient)
+    unknown_option = {**_answer(assessment, 0, 1), "selected_option_id": str(uuid4())}
+    operations = [
+        _operation("answer", result_id, answers=[_answer(assessment, 0, 1)]),
+        _operation("start", str(uuid4())),
+        _operation("start", result_id),
+        _operation("answer", result_id, answers=[unknown_option]),
+        _operation("answer", result_id, answers=[_answer(assessment, 1, 3)]),
+    ]
+    response = (await client.post("/api/v1/sync", json={"operations": operations})).json()
+    codes = [(r["status"], r["code"]) for r in response["results"]]
+    assert codes == [
+        ("rejected", 409),
+        ("rejected", 404),
+        ("applied", 200),
+        ("rejected", 400),
+        ("applied", 200),
+    ]
+    result = (await client.get(f"/api/v1/results/{result_id}")).json()
+    assert result["status"] == "in_progress"
+    assert [a["value"] for a in result["answer_details"]] == [3]
+
+async def test_sync_normalises_client_timestamps_to_utc(client, assessment, patient, server_timezone):
+    result_id = await _create_result(client, assessment, patient)
+    started = datetime(2026, 1, 5, 18, 30, tzinfo=timezone(timedelta(hours=9)))
+    answered = datetime(2026, 1, 5, 9, 40)  # タイムゾーン無しはUTCとみなす
+    future = datetime.now(timezone.utc) + timedelta(days=1)
+    operations = [
+        {**_operation("start", result_id), "client_timestamp": started.isoformat()},
+        {
+            **_operation("answer", result_id, answers=[_answer(assessment, 0, 1)]),
+            "client_timestamp": answered.isoformat(),
+        },
+        {**_operation("complete", result_id), "client_timestamp": future.isoformat()},
+    ]
+    response = (await client.post("/api/v1/sync", json={"operations": operations})).json()
+    assert response["applied"] == 3
+
+    result = (await client.get(f"/api/v1/results/{result_id}")).json()
+    assert result["started_at"].startswith("2026-01-05T09:30:00")
+    assert result["answer_details"][0]["answered_at"].startswith("2026-01-05T09:40:00")
+    # 未来の日時はサーバーの現在時刻（UTC）にする
+    completed_at = datetime.fromisoformat(result["completed_at"]).replace(tzinfo=timezone.utc)
+    assert abs(datetime.now(timezone.utc) - completed_at) < timedelta(minutes=1)
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+def _parse(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+async def test_result_timestamps_share_the_utc_clock(client, assessment, patient, server_timezone):
+    response = await client.post("/api/v1/results/", json={
+        "patient_id": patient["id"],
+        "assessment_id": assessment["id"],
+    })
+    result_id = response.json()["id"]
+    await client.post(f"/api/v1/results/{result_id}/start")
+    option = assessment["options"][1]
+    await client.post(f"/api/v1/results/{result_id}/answers/batch", json={"answers": [{
+        "question_id": assessment["questions"][0]["id"],
+        "selected_option_id": option["id"],
+        "value": option["value"],
+    }]})
+    await client.post(f"/api/v1/results/{result_id}/complete")
+
+    result = (await client.get(f"/api/v1/results/{result_id}")).json()
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    stamps = {
+        "started_at": result["started_at"],
+        "completed_at": result["completed_at"],
+        "answered_at": result["answer_details"][0]["answered_at"],
+    }
+    for name, value in stamps.items():
+        assert abs(now - _parse(value)) < timedelta(minutes=1), name
+    assert _parse(stamps["started_at"]) <= _parse(stamps["answered_at"]) <= _parse(stamps["completed_at"])
+    assert 0 <= result["completion_time"] < 1
+
+    # 完了日時の期間の絞り込みも同じ時計で行う（直近1日のトレンドに含まれる）
+    trends = (await client.get(
+        f"/api/v1/patients/{patient['id']}/trends",
+        params={"types": assessment["type"], "days": 1}
+    )).json()
+    assert len(trends[0]["data_points"]) == 1
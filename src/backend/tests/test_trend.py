@@ -0,0 +1,119 @@
+import math
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.services.trend import compute_trend, moving_average, regression_line, reliable_change
+
+def test_moving_average_averages_partial_leading_windows():
+    assert moving_average(np.array([1.0, 2.0, 3.0, 4.0]), 3).tolist() == [1.0, 1.5, 2.0, 3.0]
+    assert moving_average(np.array([4.0, 8.0]), 5).tolist() == [4.0, 6.0]
+    assert moving_average(np.array([]), 3).tolist() == []
+
+@pytest.mark.parametrize("window", [1, 0, -2])
+def test_moving_average_window_below_one_is_the_scores(window):
+    assert moving_average(np.array([3.0, 1.0, 2.0]), window).tolist() == [3.0, 1.0, 2.0]
+
+def test_regression_line_fits_slope_per_day():
+    days = np.array([0.0, 1.0, 3.0])
+    line, slope = regression_line(days, 2 * days + 5)
+    assert slope == pytest.approx(2.0)
+    assert line == pytest.approx([5.0, 7.0, 11.0])
+
+    # 最小二乗: (0,1), (1,3), (2,2) -> 傾き0.5・切片1.5
+    line, slope = regression_line(np.array([0.0, 1.0, 2.0]), np.array([1.0, 3.0, 2.0]))
+    assert slope == pytest.approx(0.5)
+    assert line == pytest.approx([1.5, 2.0, 2.5])
+
+@pytest.mark.parametrize("days,scores,expected", [
+    ([], [], []),
+    ([0.0], [7.0], [7.0]),
+    ([2.0, 2.0, 2.0], [1.0, 2.0, 6.0], [3.0, 3.0, 3.0]),  # 同一日時は傾きを求められない
+])
+def test_regression_line_without_spread_is_flat_mean(days, scores, expected):
+    line, slope = regression_line(np.array(days), np.array(scores))
+    assert line.tolist() == expected
+    assert slope == 0.0
+
+def test_reliable_change_index():
+    # SD=5・信頼性0.8 -> 差の標準誤差 = 5√0.4 ≈ 3.1623
+    improved = reliable_change(np.array([20.0, 15.0, 10.0]), 5.0, 0.8)
+    assert improved.baseline == 20 and improved.latest == 10 and improved.change == -10
+    assert improved.index == round(-10 / (5 * math.sqrt(0.4)), 4) == -3.1623
+    assert improved.significant and improved.direction == "improved"
+
+    deteriorated = reliable_change(np.array([5.0, 15.0]), 5.0, 0.8)
+    assert deteriorated.index == 3.1623
+    assert deteriorated.significant and deteriorated.direction == "deteriorated"
+
+    small = reliable_change(np.array([10.0, 14.0]), 5.0, 0.8)
+    assert small.index == 1.2649
+    assert not small.significant and small.direction == "no_reliable_change"
+
+def test_reliable_change_threshold_is_inclusive():
+    # 信頼性0.5 -> 差の標準誤差 = SD
+    assert reliable_change(np.array([0.0, 1.96]), 1.0, 0.5).significant
+    assert not reliable_change(np.array([0.0, 1.95]), 1.0, 0.5).significant
+    assert reliable_change(np.array([1.96, 0.0]), 1.0, 0.5).direction == "improved"
+
+@pytest.mark.parametrize("scores,sd,reliability", [
+    ([10.0], 5.0, 0.8),
+    ([10.0, 20.0], None, 0.8),
+    ([10.0, 20.0], 0.0, 0.8),
+    ([10.0, 20.0], 5.0, 1.0),
+])
+def test_reliable_change_requires_two_scores_and_spread(scores, sd, reliability):
+    assert reliable_change(np.array(scores), sd, reliability) is None
+
+def test_compute_trend_measures_days_from_the_first_date():
+    origin = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    dates = [origin, origin + timedelta(hours=12), origin + timedelta(days=2)]
+    graph = compute_trend("PHQ-9", dates, [20, None, 14], 10, reference_sd=5.0, window=2)
+
+    assert [point.value for point in graph.data_points] == [20.0, 0.0, 14.0]
+    # (0,20), (0.5,0), (2,14) -> 傾き -2/13・切片 447/39
+    assert graph.slope_per_day == round(-2 / 13, 6)
+    assert graph.trend_line == pytest.approx([447 / 39, 444 / 39, 435 / 39], abs=1e-4)
+    assert graph.average_line == pytest.approx(34 / 3)
+    assert graph.moving_average == [20.0, 10.0, 7.0]
+    assert graph.cutoff_line == 10
+    assert graph.reliable_change.change == -6
+    assert graph.reliable_change.direction == "no_reliable_change"
+
+def test_compute_trend_single_and_empty_series():
+    single = compute_trend("PHQ-9", [datetime(2024, 1, 1)], [8], 10, reference_sd=5.0)
+    assert single.trend_line == [8.0] and single.moving_average == [8.0]
+    assert single.slope_per_day is None and single.reliable_change is None
+
+    empty = compute_trend("PHQ-9", [], [], 10)
+    assert empty.data_points == [] and empty.trend_line == [] and empty.moving_average == []
+    assert empty.average_line == 0 and empty.slope_per_day is None
+
+@pytest.mark.anyio
+async def test_patient_trend_returns_computed_lines(client, assessment, patient):
+    for value in (3, 1):
+        response = await client.post("/api/v1/results/", json={
+            "patient_id": patient["id"],
+            "assessment_id": assessment["id"],
+        })
+        result_id = response.json()["id"]
+        await client.post(f"/api/v1/results/{result_id}/start")
+        option = next(o for o in assessment["options"] if o["value"] == value)
+        await client.post(f"/api/v1/results/{result_id}/answers/batch", json={"answers": [
+            {"question_id": q["id"], "selected_option_id": option["id"], "value": value}
+            for q in assessment["questions"]
+        ]})
+        await client.post(f"/api/v1/results/{result_id}/complete")
+
+    trends = (await client.get(
+        f"/api/v1/patients/{patient['id']}/trends",
+        params={"types": assessment["type"], "days": 30}
+    )).json()
+    graph = trends[0]
+    assert [point["value"] for point in graph["data_points"]] == [27, 9]
+    assert graph["average_line"] == 18
+    assert graph["moving_average"] == [27, 18]
+    assert graph["cutoff_line"] == assessment["cutoff"]
+    assert graph["slope_per_day"] < 0
+    assert graph["reliable_change"]["change"] == -18